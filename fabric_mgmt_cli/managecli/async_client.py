@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from typing import Any, List, Tuple
+
+DEFAULT_ASYNC_CONCURRENCY = 100
+
+
+class AsyncManagementClient:
+    """
+    asyncio facade over the management actors held by the Kafka processor.
+
+    Requests share the processor's single callback consumer, which correlates responses by message id.
+    The actor APIs are blocking, so each request is dispatched to a bounded pool where every worker
+    thread uses its own clone of the actor; up to concurrency requests are outstanding at a time and
+    the rest are queued. Requests can be given a timeout and cancelled; a cancelled request which has
+    not been dispatched yet is never sent. A request which has been sent stops waiting for its response,
+    releasing its worker, and the response is ignored when it arrives; the actor may still have acted on
+    it.
+
+        async with AsyncManagementClient(callback_topic=topic) as client:
+            results = await asyncio.gather(*[client.close_reservation(actor_name=am, rid=rid) for rid in rids])
+    """
+    def __init__(self, *, callback_topic: str, processor=None, concurrency: int = DEFAULT_ASYNC_CONCURRENCY,
+                 timeout: float = None):
+        """
+        @param callback_topic callback topic
+        @param processor Kafka processor; defaults to the started KafkaProcessorSingleton
+        @param concurrency maximum number of requests outstanding at a time
+        @param timeout default per request timeout in seconds; None to wait for the actor API timeout
+        """
+        self.callback_topic = callback_topic
+        self.processor = processor
+        self.timeout = timeout
+        self.executor = ThreadPoolExecutor(max_workers=max(1, int(concurrency)),
+                                           thread_name_prefix="managecli-async")
+
+    def __get_processor(self):
+        if self.processor is None:
+            from fabric_mgmt_cli.managecli.kafka_processor import KafkaProcessorSingleton
+            self.processor = KafkaProcessorSingleton.get()
+        return self.processor
+
+    def __message_processor(self):
+        message_processor = getattr(self.__get_processor(), 'message_processor', None)
+        return message_processor if hasattr(message_processor, 'track_requests') else None
+
+    def __invoke(self, actor_name: str, method: str, kwargs: dict, tag: object = None) -> Tuple[Any, Any]:
+        actor = self.__get_processor().get_mgmt_actor(name=actor_name)
+        if actor is None:
+            raise Exception("Invalid arguments actor {} not found".format(actor_name))
+        message_processor = self.__message_processor()
+        with message_processor.track_requests(tag=tag) if message_processor is not None and tag is not None \
+                else nullcontext():
+            actor.prepare(callback_topic=self.callback_topic)
+            result = getattr(actor, method)(**kwargs)
+        return result, actor.get_last_error()
+
+    async def call(self, *, actor_name: str, method: str, timeout: float = None, **kwargs) -> Tuple[Any, Any]:
+        """
+        Invoke a management actor API
+        @param actor_name actor name
+        @param method name of the KafkaActor/KafkaBroker method
+        @param timeout timeout in seconds, overrides the default timeout
+        @param kwargs arguments passed to the method
+        @return Tuple of the method result and the actor's last error
+        @raises asyncio.TimeoutError if the request does not complete in time
+        """
+        loop = asyncio.get_running_loop()
+        tag = object()
+        future = loop.run_in_executor(self.executor, functools.partial(self.__invoke, actor_name, method, kwargs,
+                                                                       tag))
+        timeout = timeout if timeout is not None else self.timeout
+        try:
+            if timeout is None:
+                return await future
+            return await asyncio.wait_for(future, timeout=timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            message_processor = self.__message_processor()
+            if message_processor is not None:
+                message_processor.cancel_requests(tag=tag)
+            raise
+
+    @staticmethod
+    def __id(value: str):
+        if value is None:
+            return None
+        from fabric_cf.actor.core.util.id import ID
+        return ID(uid=value)
+
+    async def get_slices(self, *, actor_name: str, slice_id: str = None, slice_name: str = None, email: str = None,
+                         states: List[int] = None, timeout: float = None, **kwargs):
+        return await self.call(actor_name=actor_name, method="get_slices", timeout=timeout,
+                               slice_id=self.__id(slice_id), slice_name=slice_name, email=email, states=states,
+                               **kwargs)
+
+    async def get_reservations(self, *, actor_name: str, slice_id: str = None, rid: str = None,
+                               states: List[int] = None, email: str = None, timeout: float = None, **kwargs):
+        return await self.call(actor_name=actor_name, method="get_reservations", timeout=timeout,
+                               slice_id=self.__id(slice_id), rid=self.__id(rid), states=states, email=email,
+                               **kwargs)
+
+    async def get_reservation_state_for_reservations(self, *, actor_name: str, rids: List[str],
+                                                     timeout: float = None):
+        return await self.call(actor_name=actor_name, method="get_reservation_state_for_reservations",
+                               timeout=timeout, reservation_list=rids)
+
+    async def get_delegations(self, *, actor_name: str, did: str = None, states: List[int] = None,
+                              timeout: float = None, **kwargs):
+        return await self.call(actor_name=actor_name, method="get_delegations", timeout=timeout,
+                               delegation_id=did, states=states, **kwargs)
+
+    async def close_slice(self, *, actor_name: str, slice_id: str, timeout: float = None):
+        return await self.call(actor_name=actor_name, method="close_reservations", timeout=timeout,
+                               slice_id=self.__id(slice_id))
+
+    async def remove_slice(self, *, actor_name: str, slice_id: str, timeout: float = None):
+        return await self.call(actor_name=actor_name, method="remove_slice", timeout=timeout,
+                               slice_id=self.__id(slice_id))
+
+    async def close_reservation(self, *, actor_name: str, rid: str, timeout: float = None):
+        return await self.call(actor_name=actor_name, method="close_reservation", timeout=timeout,
+                               rid=self.__id(rid))
+
+    async def remove_reservation(self, *, actor_name: str, rid: str, timeout: float = None):
+        return await self.call(actor_name=actor_name, method="remove_reservation", timeout=timeout,
+                               rid=self.__id(rid))
+
+    async def extend_reservation(self, *, actor_name: str, rid: str, new_end_time, timeout: float = None):
+        return await self.call(actor_name=actor_name, method="extend_reservation", timeout=timeout,
+                               reservation=self.__id(rid), new_end_time=new_end_time, sliver=None)
+
+    async def close_delegation(self, *, actor_name: str, did: str, timeout: float = None):
+        return await self.call(actor_name=actor_name, method="close_delegation", timeout=timeout, did=did)
+
+    async def remove_delegation(self, *, actor_name: str, did: str, timeout: float = None):
+        return await self.call(actor_name=actor_name, method="remove_delegation", timeout=timeout, did=did)
+
+    async def claim_delegations(self, *, broker: str, am_guid, did: str, timeout: float = None):
+        return await self.call(actor_name=broker, method="claim_delegations", timeout=timeout, broker=am_guid,
+                               did=did)
+
+    async def reclaim_delegations(self, *, broker: str, am_guid, did: str, timeout: float = None):
+        return await self.call(actor_name=broker, method="reclaim_delegations", timeout=timeout, broker=am_guid,
+                               did=did)
+
+    def close(self):
+        """
+        Cancel queued requests and release the worker threads
+        """
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.close()
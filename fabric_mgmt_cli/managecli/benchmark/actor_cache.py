@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+"""
+Actor cache micro-benchmark
+
+Measures the time to load the actor cache for a configuration with many peers and obtain the one
+management actor a typical command talks to, against materializing a management actor for every peer.
+
+    python -m fabric_mgmt_cli.managecli.benchmark.actor_cache [--peers N] [--repeat N]
+"""
+import argparse
+import logging
+import time
+
+from fabric_mgmt_cli.managecli.config_processor import ConfigProcessor
+from fabric_mgmt_cli.managecli.configuration import Configuration
+from fabric_mgmt_cli.managecli.kafka_processor import KafkaProcessor
+
+TYPES = ["authority", "broker", "orchestrator"]
+
+
+def make_config(*, peers: int) -> Configuration:
+    """
+    Build a configuration with the requested number of peers
+    @param peers number of peers
+    @return configuration
+    """
+    return Configuration({
+        'runtime': [{'kafka-topic': 'managecli-topic'}],
+        'logging': [{'log-directory': '.'}, {'log-file': 'manage.log'}, {'log-level': 'INFO'}],
+        'auth': [{'name': 'managecli'}, {'guid': 'managecli-guid'}],
+        'peers': [{'peer': [{'name': f"peer{i}-am"}, {'guid': f"peer{i}-am-guid"}, {'type': TYPES[i % len(TYPES)]},
+                            {'kafka-topic': f"peer{i}-am-topic"}]} for i in range(peers)]
+    })
+
+
+def make_processor(*, config: Configuration) -> KafkaProcessor:
+    """
+    Create a Kafka Processor for the configuration without connecting to Kafka
+    @param config configuration
+    @return Kafka Processor
+    """
+    processor = KafkaProcessor()
+    processor.config_processor = ConfigProcessor()
+    processor.config_processor.process(config=config)
+    processor.logger = logging.getLogger("actor_cache_benchmark")
+    # Management actors only create a producer of their own when none is passed in
+    processor.producer = object()
+    return processor
+
+
+def measure(*, peers: int, repeat: int = 5) -> dict:
+    """
+    Measure loading the actor cache
+    @param peers number of peers
+    @param repeat number of runs; the fastest is reported
+    @return lazy time for one actor and eager time for all actors in milliseconds
+    """
+    config = make_config(peers=peers)
+    names = [p.get_name() for p in config.get_peers()]
+    lazy = eager = None
+    for _ in range(repeat):
+        processor = make_processor(config=config)
+        begin = time.perf_counter()
+        processor.load_actor_cache()
+        processor.get_mgmt_actor(name=names[0])
+        elapsed = (time.perf_counter() - begin) * 1000
+        lazy = elapsed if lazy is None else min(lazy, elapsed)
+
+        processor = make_processor(config=config)
+        begin = time.perf_counter()
+        processor.load_actor_cache()
+        for name in names:
+            processor.get_mgmt_actor(name=name)
+        elapsed = (time.perf_counter() - begin) * 1000
+        eager = elapsed if eager is None else min(eager, elapsed)
+    return {'peers': peers, 'lazy_ms': round(lazy, 3), 'eager_ms': round(eager, 3)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure loading the actor cache")
+    parser.add_argument("--peers", default="10,40,100", help="Comma separated number of peers")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement; the fastest is reported")
+    options = parser.parse_args()
+
+    print(f"{'Peers':>6} {'Lazy(ms)':>10} {'Eager(ms)':>10}")
+    for peers in [int(p) for p in options.peers.split(",")]:
+        r = measure(peers=peers, repeat=options.repeat)
+        print(f"{r['peers']:>6} {r['lazy_ms']:>10} {r['eager_ms']:>10}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+"""
+In-process stand-in for the management actors (KafkaActor/KafkaBroker) serving synthetic
+slices, reservations and delegations, so that the CLI can be exercised and measured offline.
+"""
+import copy
+import random
+import threading
+import time
+from typing import Dict, List
+
+from fabric_cf.actor.core.apis.abc_delegation import DelegationState
+from fabric_cf.actor.core.kernel.reservation_states import ReservationStates, ReservationPendingStates
+from fabric_cf.actor.core.kernel.slice_state_machine import SliceState
+from fabric_cf.actor.core.manage.error import Error
+from fabric_cf.actor.core.util.id import ID
+from fabric_mb.message_bus.messages.delegation_avro import DelegationAvro
+from fabric_mb.message_bus.messages.reservation_mng import ReservationMng
+from fabric_mb.message_bus.messages.result_avro import ResultAvro
+from fabric_mb.message_bus.messages.slice_avro import SliceAvro
+from fim.slivers.capacities_labels import Capacities, Labels
+from fim.slivers.network_node import NodeSliver, NodeType
+
+SITES = ["RENC", "UKY", "LBNL", "STAR", "TACC"]
+
+SLICE_STATES = [SliceState.StableOK, SliceState.StableOK, SliceState.StableOK, SliceState.Closing, SliceState.Dead]
+
+RESERVATION_STATES = [ReservationStates.Active, ReservationStates.Active, ReservationStates.Active,
+                      ReservationStates.Ticketed, ReservationStates.Closed, ReservationStates.Failed]
+
+
+class SyntheticTestbed:
+    """
+    Synthetic slices, reservations and delegations shared by the fake actors
+    """
+    def __init__(self, *, reservations: int = 1000, reservations_per_slice: int = 10, delegations: int = 10,
+                 with_slivers: bool = True, broker: str = "broker", seed: int = 0):
+        """
+        @param reservations total number of reservations
+        @param reservations_per_slice number of reservations in each slice
+        @param delegations number of delegations per AM
+        @param with_slivers attach a NodeSliver to every reservation
+        @param broker name of the broker owning the delegations
+        @param seed random seed; the same seed produces the same testbed
+        """
+        rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.slices = {}
+        self.reservations = {}
+        self.delegations = []
+        self.removed = set()
+        self.broker_view = None
+
+        now = int(time.time() * 1000)
+        slice_count = max(1, reservations // max(1, reservations_per_slice))
+        for i in range(slice_count):
+            s = SliceAvro()
+            s.guid = str(ID())
+            s.slice_name = f"slice-{i}"
+            s.owner = None
+            s.state = rng.choice(SLICE_STATES).value
+            s.project_id = f"project-{i % 10}"
+            s.lease_end = None
+            self.slices[s.guid] = s
+
+        slice_ids = list(self.slices.keys())
+        for i in range(reservations):
+            site = SITES[i % len(SITES)]
+            r = ReservationMng()
+            r.reservation_id = str(ID())
+            r.slice_id = slice_ids[i % len(slice_ids)]
+            r.rtype = str(NodeType.VM)
+            r.units = 1
+            r.start = now - 86400000
+            r.end = now + 86400000
+            r.requested_end = r.end
+            r.state = rng.choice(RESERVATION_STATES).value
+            r.pending_state = ReservationPendingStates.None_.value
+            r.notices = "Reservation is in a stable state"
+            if with_slivers:
+                sliver = NodeSliver()
+                sliver.set_name(f"node-{i}")
+                sliver.set_type(NodeType.VM)
+                sliver.set_site(site)
+                sliver.set_capacities(cap=Capacities(core=2, ram=8, disk=10))
+                sliver.set_label_allocations(lab=Labels(instance_parent=f"{site.lower()}-w{i % 3 + 1}"
+                                                                        f".fabric-testbed.net"))
+                r.sliver = sliver
+            self.reservations[r.reservation_id] = r
+
+        for i in range(delegations):
+            d = DelegationAvro()
+            d.delegation_id = str(ID())
+            d.slice = SliceAvro()
+            d.slice.slice_name = broker
+            d.state = DelegationState.Delegated.value
+            self.delegations.append(d)
+
+    def view(self, *, broker: bool = False) -> Dict[str, ReservationMng]:
+        """
+        Reservations as seen by an actor; the broker holds tickets for the reservations active on the AMs
+        @param broker True for the broker view
+        @return reservations keyed by reservation id
+        """
+        if not broker:
+            return self.reservations
+        with self.lock:
+            if self.broker_view is None:
+                self.broker_view = {}
+                for rid, r in self.reservations.items():
+                    if r.state in [ReservationStates.Active.value, ReservationStates.ActiveTicketed.value]:
+                        r = copy.copy(r)
+                        r.state = ReservationStates.Ticketed.value
+                    self.broker_view[rid] = r
+            return self.broker_view
+
+    def remove(self, *, item_id: str):
+        with self.lock:
+            self.removed.add(item_id)
+
+    def is_removed(self, *, item_id: str) -> bool:
+        return item_id in self.removed
+
+
+class FakeActor:
+    """
+    Stand-in for KafkaActor/KafkaBroker; every call takes latency seconds to simulate the Kafka round trip
+    """
+    def __init__(self, *, name: str, testbed: SyntheticTestbed, latency: float = 0.0, broker: bool = False):
+        self.name = name
+        self.broker = broker
+        self.testbed = testbed
+        self.latency = latency
+        self.guid = ID(uid=f"{name}-guid")
+        self.last_status = ResultAvro()
+        self.calls = {}
+        self.lock = threading.Lock()
+
+    def __call(self, *, method: str):
+        with self.lock:
+            self.calls[method] = self.calls.get(method, 0) + 1
+        if self.latency > 0:
+            time.sleep(self.latency)
+
+    def prepare(self, *, callback_topic: str):
+        pass
+
+    def clone(self):
+        return self
+
+    def get_guid(self) -> ID:
+        return self.guid
+
+    def get_name(self) -> str:
+        return self.name
+
+    def get_last_error(self) -> Error:
+        return Error(status=self.last_status, e=None)
+
+    def get_slices(self, *, slice_id: ID = None, slice_name: str = None, email: str = None, project: str = None,
+                   states: List[int] = None, limit: int = None, offset: int = None, user_id: str = None,
+                   search: str = None, exact_match: bool = False) -> List[SliceAvro]:
+        # Like KafkaActor, project, limit and offset are accepted but never reach the actor
+        self.__call(method="get_slices")
+        result = []
+        for s in self.testbed.slices.values():
+            if self.testbed.is_removed(item_id=s.guid):
+                continue
+            if slice_id is not None and s.guid != str(slice_id):
+                continue
+            if slice_name is not None and s.slice_name != slice_name:
+                continue
+            if states is not None and s.state not in states:
+                continue
+            result.append(s)
+        return result
+
+    def get_reservations(self, *, slice_id: ID = None, rid: ID = None, states: List[int] = None,
+                         rid_list: List[str] = None, **kwargs) -> List[ReservationMng]:
+        self.__call(method="get_reservations")
+        reservations = self.testbed.view(broker=self.broker)
+        if rid is not None:
+            r = reservations.get(str(rid))
+            return [r] if r is not None and not self.testbed.is_removed(item_id=str(rid)) else []
+        result = []
+        wanted = set(rid_list) if rid_list is not None else None
+        for r in reservations.values():
+            if slice_id is not None and r.slice_id != str(slice_id):
+                continue
+            if states is not None and r.state not in states:
+                continue
+            if wanted is not None and r.reservation_id not in wanted:
+                continue
+            if self.testbed.is_removed(item_id=r.reservation_id):
+                continue
+            result.append(r)
+        return result
+
+    def get_reservation_state_for_reservations(self, *, reservation_list: List[str]) -> list:
+        self.__call(method="get_reservation_state_for_reservations")
+        reservations = self.testbed.view(broker=self.broker)
+        return [reservations[rid] for rid in reservation_list if rid in reservations]
+
+    def get_delegations(self, *, slice_id: ID = None, states: List[int] = None,
+                        delegation_id: str = None) -> List[DelegationAvro]:
+        self.__call(method="get_delegations")
+        return [d for d in self.testbed.delegations
+                if (delegation_id is None or d.delegation_id == delegation_id) and
+                (states is None or d.state in states)]
+
+    def __removal(self, *, method: str, item_id) -> bool:
+        self.__call(method=method)
+        self.testbed.remove(item_id=str(item_id))
+        return True
+
+    def remove_reservation(self, *, rid: ID) -> bool:
+        return self.__removal(method="remove_reservation", item_id=rid)
+
+    def close_reservation(self, *, rid: ID) -> bool:
+        return self.__removal(method="close_reservation", item_id=rid)
+
+    def remove_slice(self, *, slice_id: ID) -> bool:
+        return self.__removal(method="remove_slice", item_id=slice_id)
+
+    def close_reservations(self, *, slice_id: ID) -> bool:
+        return self.__removal(method="close_reservations", item_id=slice_id)
+
+    def close_delegation(self, *, did: str) -> bool:
+        self.__call(method="close_delegation")
+        return True
+
+    def remove_delegation(self, *, did: str) -> bool:
+        self.__call(method="remove_delegation")
+        return True
+
+    def extend_reservation(self, *, reservation: ID, new_end_time, sliver=None) -> bool:
+        self.__call(method="extend_reservation")
+        return True
+
+    def update_slice(self, *, slice_obj: SliceAvro, **kwargs) -> bool:
+        self.__call(method="update_slice")
+        return True
+
+    def claim_delegations(self, *, broker: ID, did: str) -> DelegationAvro:
+        self.__call(method="claim_delegations")
+        return next((d for d in self.testbed.delegations if d.delegation_id == did), None)
+
+    def reclaim_delegations(self, *, broker: ID, did: str) -> DelegationAvro:
+        self.__call(method="reclaim_delegations")
+        return next((d for d in self.testbed.delegations if d.delegation_id == did), None)
+
+
+class FakeActorRegistry:
+    """
+    Named fake actors sharing one synthetic testbed
+    """
+    def __init__(self, *, testbed: SyntheticTestbed, names: List[str], latency: float = 0.0, broker: str = "broker"):
+        self.actors: Dict[str, FakeActor] = {n: FakeActor(name=n, testbed=testbed, latency=latency, broker=n == broker)
+                                             for n in names}
+
+    def get(self, *, name: str) -> FakeActor or None:
+        return self.actors.get(name)
+
+    def get_mgmt_actor(self, *, name: str) -> FakeActor or None:
+        return self.get(name=name)
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+"""
+CLI startup benchmark
+
+Runs each command in a fresh interpreter with ``python -X importtime`` and reports the wall time,
+the time spent importing modules and whether the Kafka management modules were loaded.
+
+    python -m fabric_mgmt_cli.managecli.benchmark.startup [--repeat N] [--budget MS] [--json FILE]
+
+Exits non-zero if a command exceeds the import time budget or a command which does not talk to
+Kafka imports the Kafka management modules.
+"""
+import argparse
+import json
+import subprocess
+import sys
+import time
+from typing import List
+
+# Commands measured; the flag indicates whether the command is expected to load the Kafka modules
+COMMANDS = [
+    (["--help"], False),
+    (["slices", "--help"], False),
+    (["slivers", "query", "--help"], False),
+    (["delegations", "--help"], False),
+    (["maintenance", "--help"], False),
+    (["daemon", "--help"], False),
+    (["net", "--help"], False),
+    (["net", "show", "--help"], False),
+]
+
+KAFKA_MODULE = "fabric_cf.actor.core.manage.kafka"
+
+_RUNNER = """
+import sys
+from fabric_mgmt_cli.managecli.managecli import managecli
+try:
+    managecli(args=sys.argv[1:], obj={{}}, standalone_mode=False)
+except SystemExit:
+    pass
+print("KAFKA_LOADED=" + str(any(m.startswith("{module}") for m in sys.modules)), file=sys.stderr)
+""".format(module=KAFKA_MODULE)
+
+
+def parse_importtime(stderr: str) -> float:
+    """
+    Sum the cumulative import time of the top level imports reported by -X importtime
+    @param stderr stderr of the interpreter
+    @return import time in milliseconds
+    """
+    total = 0
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # nested imports are indented by two spaces per level
+        if not name.startswith("  ", 1):
+            total += int(cumulative)
+    return total / 1000
+
+
+def measure(*, args: List[str]) -> dict:
+    """
+    Run a command in a fresh interpreter
+    @param args command line arguments
+    @return measurement with wall time, import time and whether Kafka modules were loaded
+    """
+    begin = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", _RUNNER] + args,
+                          stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, universal_newlines=True)
+    wall = (time.perf_counter() - begin) * 1000
+    return {'command': " ".join(args), 'wall_ms': round(wall, 1),
+            'import_ms': round(parse_importtime(proc.stderr), 1),
+            'kafka_loaded': "KAFKA_LOADED=True" in proc.stderr}
+
+
+def run(*, repeat: int = 3, budget: float = None) -> List[dict]:
+    """
+    Measure every command, keeping the fastest of repeat runs
+    @param repeat number of runs per command
+    @param budget optional import time budget in milliseconds
+    @return list of measurements
+    """
+    results = []
+    for args, loads_kafka in COMMANDS:
+        best = min([measure(args=args) for _ in range(repeat)], key=lambda m: m['import_ms'])
+        failures = []
+        if best['kafka_loaded'] and not loads_kafka:
+            failures.append("imports Kafka modules")
+        if budget is not None and best['import_ms'] > budget:
+            failures.append(f"import time exceeds {budget}ms")
+        best['failures'] = failures
+        results.append(best)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure fabric-mgmt-cli startup time per command")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per command; the fastest is reported")
+    parser.add_argument("--budget", type=float, default=None, help="Import time budget per command in ms")
+    parser.add_argument("--json", default=None, help="Write the results to this file")
+    options = parser.parse_args()
+
+    results = run(repeat=options.repeat, budget=options.budget)
+    print(f"{'Command':<30} {'Wall(ms)':>10} {'Import(ms)':>11} {'Kafka':>6}")
+    for r in results:
+        print(f"{r['command']:<30} {r['wall_ms']:>10} {r['import_ms']:>11} {str(r['kafka_loaded']):>6} "
+              f"{', '.join(r['failures'])}")
+    if options.json is not None:
+        with open(options.json, 'w') as f:
+            json.dump(results, f, indent=4)
+    if any(len(r['failures']) > 0 for r in results):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+"""
+Benchmark suite running the CLI's query, output, audit and cleanup paths against in-process fake actors
+
+    python -m fabric_mgmt_cli.managecli.benchmark.suite [--scale 1000,10000,100000] [--only NAME,...]
+                                                        [--latency SECONDS] [--results FILE] [--baseline FILE]
+
+Every run can be appended to a results file (one JSON line per run) and compared with the previous run
+recorded in a baseline file; benchmarks slower than the baseline by more than --threshold are reported
+and make the run exit non-zero.
+"""
+import argparse
+import contextlib
+import json
+import logging
+import os
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List
+
+from fabric_cf.actor.core.common.constants import Constants
+
+from fabric_mgmt_cli.managecli.benchmark.fake_actor import FakeActorRegistry, SyntheticTestbed
+from fabric_mgmt_cli.managecli.manage_command import ManageCommand
+
+ACTORS = ["orchestrator", "broker", "renc-am"]
+
+
+class BenchCommand(ManageCommand):
+    """
+    ManageCommand bound to fake actors instead of the Kafka processor
+    """
+    def __init__(self, *, registry: FakeActorRegistry):
+        logger = logging.getLogger("managecli-benchmark")
+        logger.addHandler(logging.NullHandler())
+        logger.propagate = False
+        super().__init__(logger=logger)
+        self.registry = registry
+
+    def get_actor(self, *, actor_name: str):
+        return self.registry.get(name=actor_name)
+
+    def get_processor(self):
+        return self.registry
+
+    def get_actor_names(self, *, actor_type: str = None) -> List[str]:
+        return list(self.registry.actors.keys())
+
+
+def _reservations(command: BenchCommand, format: str, fields: str = None):
+    command.get_reservations(actor_name="renc-am", callback_topic="bench", slice_id=None, rid=None, states=None,
+                             id_token=None, email=None, site=None, type=None, format=format, fields=fields,
+                             include_ansible=False, host=None, ip_subnet=None)
+
+
+def _slices(command: BenchCommand, format: str):
+    command.get_slices(actor_name="orchestrator", callback_topic="bench", slice_id=None, slice_name=None,
+                       id_token=None, email=None, states=None, format=format)
+
+
+def _audit(command: BenchCommand):
+    command.do_audit(oc_name="orchestrator", br_name="broker", am_name="renc-am", site_name=None, slice_id=None,
+                     sliver_id=None, callback_topic="bench", sliver_type=None)
+
+
+def _delete_dead_slices(command: BenchCommand):
+    command.delete_dead_slices(actor_name="orchestrator", callback_topic="bench", id_token=None, email=None)
+
+
+def _renew(command: BenchCommand):
+    end_time = (datetime.now(timezone.utc) + timedelta(days=7)).strftime(Constants.LEASE_TIME_FORMAT)
+    command.renew_slice(slice_id=None, actor_name="orchestrator", callback_topic="bench", end_time=end_time)
+
+
+BENCHMARKS: Dict[str, Callable[[BenchCommand], None]] = {
+    'reservations_json': lambda c: _reservations(c, format='json'),
+    'reservations_json_fields': lambda c: _reservations(c, format='json', fields="state,slice_id"),
+    'reservations_ndjson': lambda c: _reservations(c, format='ndjson'),
+    'reservations_text': lambda c: _reservations(c, format='text'),
+    'slices_json': lambda c: _slices(c, format='json'),
+    'slices_text': lambda c: _slices(c, format='text'),
+    'audit': _audit,
+    'delete_dead_slices': _delete_dead_slices,
+    'renew': _renew,
+}
+
+
+def run_benchmark(*, name: str, scale: int, latency: float = 0.0, repeat: int = 1,
+                  with_slivers: bool = True) -> dict:
+    """
+    Run a benchmark against a freshly generated testbed, keeping the fastest of repeat runs
+    @param name benchmark name
+    @param scale number of reservations in the synthetic testbed
+    @param latency simulated round trip per actor call in seconds
+    @param repeat number of runs
+    @param with_slivers attach slivers to the reservations
+    @return result with the elapsed time and the number of actor calls
+    """
+    best = None
+    for _ in range(repeat):
+        testbed = SyntheticTestbed(reservations=scale, with_slivers=with_slivers)
+        registry = FakeActorRegistry(testbed=testbed, names=ACTORS, latency=latency)
+        command = BenchCommand(registry=registry)
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            begin = time.perf_counter()
+            BENCHMARKS[name](command)
+            elapsed = time.perf_counter() - begin
+        calls = sum(sum(a.calls.values()) for a in registry.actors.values())
+        if best is None or elapsed < best['elapsed_ms'] / 1000:
+            best = {'name': name, 'scale': scale, 'elapsed_ms': round(elapsed * 1000, 3), 'actor_calls': calls}
+    return best
+
+
+def _revision() -> str or None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], stdout=subprocess.PIPE,
+                              stderr=subprocess.DEVNULL, universal_newlines=True,
+                              cwd=os.path.dirname(__file__)).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def load_baseline(*, path: str) -> Dict[tuple, float]:
+    """
+    Load the most recent result of each benchmark and scale from a results file
+    @param path results file
+    @return elapsed time in ms keyed by benchmark name and scale
+    """
+    baseline = {}
+    if path is None or not os.path.exists(path):
+        return baseline
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line == "":
+                continue
+            for r in json.loads(line).get('results', []):
+                baseline[(r['name'], r['scale'])] = r['elapsed_ms']
+    return baseline
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark fabric-mgmt-cli against in-process fake actors")
+    parser.add_argument("--scale", default="1000,10000", help="Comma separated number of reservations")
+    parser.add_argument("--only", default=None, help=f"Comma separated benchmarks: {', '.join(BENCHMARKS)}")
+    parser.add_argument("--latency", type=float, default=0.0, help="Simulated round trip per actor call in seconds")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per benchmark; the fastest is reported")
+    parser.add_argument("--no-slivers", action="store_true", help="Do not attach slivers to the reservations")
+    parser.add_argument("--results", default=None, help="Append the results of this run to this file")
+    parser.add_argument("--baseline", default=None, help="Compare with the most recent results in this file")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Relative slowdown against the baseline reported as a regression")
+    options = parser.parse_args()
+
+    names = options.only.split(",") if options.only is not None else list(BENCHMARKS.keys())
+    unknown = [n for n in names if n not in BENCHMARKS]
+    if len(unknown) > 0:
+        parser.error(f"Unknown benchmark(s): {', '.join(unknown)}")
+    scales = [int(s) for s in options.scale.split(",")]
+    baseline = load_baseline(path=options.baseline)
+
+    results = []
+    regressions = []
+    print(f"{'Benchmark':<28} {'Scale':>8} {'Time(ms)':>11} {'Calls':>7} {'Baseline':>10} {'Change':>8}")
+    for scale in scales:
+        for name in names:
+            r = run_benchmark(name=name, scale=scale, latency=options.latency, repeat=options.repeat,
+                              with_slivers=not options.no_slivers)
+            results.append(r)
+            line = f"{name:<28} {scale:>8} {r['elapsed_ms']:>11.1f} {r['actor_calls']:>7}"
+            previous = baseline.get((name, scale))
+            if previous is not None and previous > 0:
+                change = (r['elapsed_ms'] - previous) / previous
+                line += f" {previous:>10.1f} {change:>+7.0%}"
+                if change > options.threshold:
+                    regressions.append(r)
+                    line += "  REGRESSION"
+            print(line, flush=True)
+
+    if options.results is not None:
+        with open(options.results, 'a') as f:
+            f.write(json.dumps({'timestamp': time.time(), 'revision': _revision(), 'latency': options.latency,
+                                'with_slivers': not options.no_slivers, 'results': results}) + '\n')
+    if len(regressions) > 0:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
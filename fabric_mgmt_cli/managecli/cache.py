@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import time
+import traceback
+from typing import Any, Callable, Dict, List
+
+DEFAULT_CACHE_TTL = 300
+
+
+class QueryCache:
+    """
+    On-disk snapshot cache for actor queries.
+
+    Snapshots are stored per actor and filter set. A query can be answered from any fresh snapshot whose filters are
+    broader than the query, provided the additional filters of the query can be evaluated locally via the matchers
+    passed to lookup. The results are pickled; the filters of each snapshot are kept in a JSON index file next to
+    it so that lookups only unpickle the snapshot which answers the query. Caching is best-effort, failures to
+    save a snapshot are logged and ignored.
+    """
+    # States filters are lists of state values; a snapshot for a superset of the states can answer the query
+    STATES = 'states'
+
+    def __init__(self, *, path: str = None, ttl: int = DEFAULT_CACHE_TTL, refresh: bool = False, logger=None):
+        """
+        @param path cache directory, defaults to ~/.fabric_mgmt_cli/cache
+        @param ttl time in seconds for which snapshots are considered fresh
+        @param refresh ignore existing snapshots; results of new queries are still stored
+        @param logger logger
+        """
+        if path is None:
+            path = os.path.join(os.path.expanduser("~"), ".fabric_mgmt_cli", "cache")
+        self.path = path
+        self.ttl = ttl
+        self.refresh = refresh
+        self.logger = logger
+        os.makedirs(self.path, mode=0o700, exist_ok=True)
+
+    @staticmethod
+    def create(*, ttl: int = None, refresh: bool = False, logger=None):
+        """
+        Create the cache if enabled via a TTL or refresh
+        @param ttl time in seconds for which snapshots are considered fresh
+        @param refresh ignore existing snapshots
+        @param logger logger
+        @return cache or None if caching is not enabled
+        """
+        if ttl is None and not refresh:
+            return None
+        return QueryCache(ttl=ttl if ttl is not None else DEFAULT_CACHE_TTL, refresh=refresh, logger=logger)
+
+    @staticmethod
+    def __normalize(*, filters: dict) -> dict:
+        result = {}
+        for k, v in filters.items():
+            if v is None:
+                continue
+            result[k] = sorted(v) if k == QueryCache.STATES else str(v)
+        return result
+
+    @staticmethod
+    def __prefix(*, kind: str, actor_name: str) -> str:
+        return hashlib.sha256(f"{kind}:{actor_name}".encode('utf-8')).hexdigest()[:16]
+
+    def __file_name(self, *, kind: str, actor_name: str, filters: dict) -> str:
+        """
+        @return path of the snapshot without extension; results are saved in .snapshot and filters in .filters
+        """
+        prefix = self.__prefix(kind=kind, actor_name=actor_name)
+        digest = hashlib.sha256(json.dumps(filters, sort_keys=True).encode('utf-8')).hexdigest()[:32]
+        return os.path.join(self.path, f"{prefix}-{digest}")
+
+    def __snapshots(self, *, kind: str, actor_name: str) -> List[str]:
+        prefix = self.__prefix(kind=kind, actor_name=actor_name)
+        try:
+            files = os.listdir(self.path)
+        except OSError:
+            return []
+        return [os.path.join(self.path, f[:-len('.filters')]) for f in files
+                if f.startswith(prefix) and f.endswith('.filters')]
+
+    @staticmethod
+    def __remove(*, file_name: str):
+        for ext in ['.filters', '.snapshot']:
+            try:
+                os.unlink(f"{file_name}{ext}")
+            except OSError:
+                pass
+
+    def __load_filters(self, *, file_name: str) -> dict or None:
+        try:
+            if time.time() - os.path.getmtime(f"{file_name}.snapshot") > self.ttl:
+                self.__remove(file_name=file_name)
+                return None
+            with open(f"{file_name}.filters") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def __load_result(*, file_name: str) -> List[Any] or None:
+        try:
+            with open(f"{file_name}.snapshot", 'rb') as f:
+                return pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+            return None
+
+    def __write(self, *, file_name: str, data: bytes):
+        fd, tmp = tempfile.mkstemp(dir=self.path, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, file_name)
+        except Exception:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+
+    @staticmethod
+    def __covers(*, snapshot_filters: dict, filters: dict, matchers: Dict[str, Callable[[Any, Any], bool]]) -> bool:
+        for k, v in snapshot_filters.items():
+            if k not in filters:
+                return False
+            if k == QueryCache.STATES:
+                if not set(filters[k]).issubset(set(v)):
+                    return False
+            elif filters[k] != v:
+                return False
+        for k in filters:
+            if k not in snapshot_filters and k not in matchers:
+                return False
+        return True
+
+    def lookup(self, *, kind: str, actor_name: str, filters: dict,
+               matchers: Dict[str, Callable[[Any, Any], bool]]) -> List[Any] or None:
+        """
+        Find the results for a query in the cache
+        @param kind kind of objects i.e. slices or reservations
+        @param actor_name actor name
+        @param filters query filters; None values are ignored
+        @param matchers functions evaluating a filter locally, invoked with an object and the filter value
+        @return cached results or None if the query cannot be answered from the cache
+        """
+        if self.refresh:
+            return None
+        filters = self.__normalize(filters=filters)
+        exact = self.__file_name(kind=kind, actor_name=actor_name, filters=filters)
+        candidates = [exact] + [f for f in self.__snapshots(kind=kind, actor_name=actor_name) if f != exact]
+        for file_name in candidates:
+            snapshot_filters = self.__load_filters(file_name=file_name)
+            if snapshot_filters is None or not self.__covers(snapshot_filters=snapshot_filters, filters=filters,
+                                                             matchers=matchers):
+                continue
+            result = self.__load_result(file_name=file_name)
+            if result is None:
+                continue
+            for k, v in filters.items():
+                if k == QueryCache.STATES and set(v) == set(snapshot_filters.get(k, ())):
+                    continue
+                if k in snapshot_filters and k != QueryCache.STATES:
+                    continue
+                match = matchers[k]
+                value = set(v) if k == QueryCache.STATES else v
+                result = [r for r in result if match(r, value)]
+            return result
+        return None
+
+    def store(self, *, kind: str, actor_name: str, filters: dict, result: List[Any]) -> bool:
+        """
+        Save the results of a query; failures are logged and ignored
+        @param kind kind of objects i.e. slices or reservations
+        @param actor_name actor name
+        @param filters query filters; None values are ignored
+        @param result query results
+        @return True if the results were saved
+        """
+        filters = self.__normalize(filters=filters)
+        file_name = self.__file_name(kind=kind, actor_name=actor_name, filters=filters)
+        try:
+            # The snapshot is written first; the filters make it visible to lookups
+            self.__write(file_name=f"{file_name}.snapshot", data=pickle.dumps(result))
+            self.__write(file_name=f"{file_name}.filters", data=json.dumps(filters).encode('utf-8'))
+            return True
+        except Exception as e:
+            if self.logger is not None:
+                self.logger.error(f"Failed to save {kind} of {actor_name} to the cache: {e}")
+                self.logger.error(traceback.format_exc())
+            return False
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import json
+import os
+import threading
+
+
+class Checkpoint:
+    """
+    Append only record of completed work items, allows long running bulk operations to be resumed.
+    Each line of the file is a JSON object {"kind": <kind>, "id": <id>}.
+    """
+    def __init__(self, *, path: str = None):
+        self.path = path
+        self.done = {}
+        self.lock = threading.Lock()
+        if self.path is not None and os.path.exists(self.path):
+            with open(self.path) as f:
+                for line in f:
+                    line = line.strip()
+                    if line == "":
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # Partially written last line from an interrupted run
+                        continue
+                    self.done.setdefault(entry.get('kind'), set()).add(entry.get('id'))
+
+    def is_done(self, *, kind: str, item_id: str) -> bool:
+        with self.lock:
+            return item_id in self.done.get(kind, ())
+
+    def count(self, *, kind: str) -> int:
+        with self.lock:
+            return len(self.done.get(kind, ()))
+
+    def mark_done(self, *, kind: str, item_id: str):
+        with self.lock:
+            self.done.setdefault(kind, set()).add(item_id)
+            if self.path is None:
+                return
+            with open(self.path, 'a') as f:
+                f.write(json.dumps({'kind': kind, 'id': item_id}) + '\n')
@@ -23,16 +23,28 @@
 #
 #
 # Author: Komal Thareja (kthare10@renci.org)
+import json
+import sys
+from typing import Iterable, List
+
 from fabric_cf.actor.core.manage.kafka.kafka_actor import KafkaActor
 from fabric_mb.message_bus.messages.result_avro import ResultAvro
 
+from fabric_mgmt_cli.managecli.cache import QueryCache
+from fabric_mgmt_cli.managecli.profiling import span
+
 
 class Command:
     """
     Base class for varios commands
     """
-    def __init__(self, *, logger):
+    def __init__(self, *, logger, cache: QueryCache = None):
+        """
+        @param logger logger
+        @param cache optional query cache; when set query results are served from and saved to the cache
+        """
         self.logger = logger
+        self.cache = cache
 
     @staticmethod
     def print_result(*, status: ResultAvro):
@@ -42,8 +54,55 @@ class Command:
         if status.details is not None:
             print("Details={}".format(status.details))
 
+    @staticmethod
+    def print_json_stream(*, records: Iterable[dict], format: str = 'json', out=None):
+        """
+        Print records one at a time as they are produced, flushing after each record,
+        so that memory use is independent of the number of records
+        @param records records to print
+        @param format ndjson for one compact JSON document per line, otherwise an indented JSON array
+        @param out output stream, defaults to stdout
+        """
+        out = out if out is not None else sys.stdout
+        with span("output.json", format=format):
+            if format == 'ndjson':
+                for r in records:
+                    out.write(json.dumps(r) + '\n')
+                    out.flush()
+                return
+
+            first = True
+            for r in records:
+                item = json.dumps(r, indent=4).replace('\n', '\n    ')
+                out.write(f"[\n    {item}" if first else f",\n    {item}")
+                out.flush()
+                first = False
+            out.write("[]\n" if first else "\n]\n")
+            out.flush()
+
+    @staticmethod
+    def get_actor_names(*, actor_type: str = None) -> List[str]:
+        from fabric_mgmt_cli.managecli.kafka_processor import KafkaProcessorSingleton
+        return KafkaProcessorSingleton.get().get_actor_names(actor_type=actor_type)
+
+    @staticmethod
+    def lean_reservations():
+        """
+        Context in which reservations are fetched as ReservationRecords, without decoding their slivers
+        """
+        from fabric_mgmt_cli.managecli.kafka_processor import KafkaProcessorSingleton
+        return KafkaProcessorSingleton.get().lean_reservations()
+
+    @staticmethod
+    def get_processor():
+        """
+        Kafka processor holding the management actors, see AsyncManagementClient
+        """
+        from fabric_mgmt_cli.managecli.kafka_processor import KafkaProcessorSingleton
+        return KafkaProcessorSingleton.get()
+
     @staticmethod
     def get_actor(*, actor_name: str) -> KafkaActor:
-        from fabric_mgmt_cli.managecli.managecli import KafkaProcessorSingleton
+        from fabric_mgmt_cli.managecli.kafka_processor import KafkaProcessorSingleton
         actor = KafkaProcessorSingleton.get().get_mgmt_actor(name=actor_name)
         return actor
@@ -24,17 +24,116 @@
 #
 # Author: Komal Thareja (kthare10@renci.org)
 
+import json
+import os
+import tempfile
+import threading
+import uuid
+
 import yaml
 from fabric_cf.actor.core.common.constants import Constants
 
-from fabric_mgmt_cli.managecli.configuration import Configuration
+from fabric_mgmt_cli.managecli.configuration import Configuration, RuntimeConfig
+from fabric_mgmt_cli.managecli.profiling import span
 from fabric_mb.message_bus.messages.auth_avro import AuthAvro
 
 
+class ConfigLoader:
+    """
+    Process wide configuration loader; parsed configuration is memoized by path and modification time,
+    so every ConfigProcessor in a process (Kafka, net commands) shares a single parse of the YAML.
+    Optionally, the parsed form is persisted as JSON next to the YAML to speed up cold starts.
+    """
+    PERSIST_ENV = 'FABRIC_MGMT_CLI_CONFIG_CACHE'
+    PERSIST_SUFFIX = '.cache.json'
+
+    lock = threading.Lock()
+    cache = {}
+
+    @staticmethod
+    def __signature(*, path: str) -> list:
+        st = os.stat(path)
+        return [st.st_mtime_ns, st.st_size]
+
+    @staticmethod
+    def __persist_enabled(persist: bool = None) -> bool:
+        if persist is not None:
+            return persist
+        return os.getenv(ConfigLoader.PERSIST_ENV, '').lower() in ['1', 'true', 'yes']
+
+    @staticmethod
+    def __read_yaml(*, path: str) -> dict:
+        loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+        with open(path) as f:
+            return yaml.load(f, Loader=loader)
+
+    @staticmethod
+    def __read_persisted(*, path: str, signature: list) -> dict or None:
+        try:
+            with open(path + ConfigLoader.PERSIST_SUFFIX) as f:
+                persisted = json.load(f)
+            if persisted.get('signature') == signature:
+                return persisted.get('config')
+        except Exception:
+            pass
+        return None
+
+    @staticmethod
+    def __write_persisted(*, path: str, signature: list, config_dict: dict):
+        target = path + ConfigLoader.PERSIST_SUFFIX
+        try:
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(target)), prefix='.config')
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    json.dump({'signature': signature, 'config': config_dict}, f)
+                os.replace(tmp, target)
+            except Exception:
+                os.unlink(tmp)
+                raise
+        except Exception:
+            # Persisting is best effort, e.g. directory not writable or values not representable in JSON
+            pass
+
+    @staticmethod
+    def load(*, path: str, persist: bool = None) -> Configuration:
+        """
+        Load the configuration, re-parsing only if the file has changed since it was last loaded
+        @param path path to the config file
+        @param persist persist the parsed configuration next to the YAML;
+                       defaults to the FABRIC_MGMT_CLI_CONFIG_CACHE environment variable
+        @return configuration
+        """
+        key = os.path.abspath(path)
+        signature = ConfigLoader.__signature(path=key)
+        with ConfigLoader.lock:
+            entry = ConfigLoader.cache.get(key)
+            if entry is not None and entry[0] == signature:
+                return entry[1]
+
+            with span("config.load"):
+                persist = ConfigLoader.__persist_enabled(persist)
+                config_dict = ConfigLoader.__read_persisted(path=key, signature=signature) if persist else None
+                if config_dict is None:
+                    config_dict = ConfigLoader.__read_yaml(path=key)
+                    if persist:
+                        ConfigLoader.__write_persisted(path=key, signature=signature, config_dict=config_dict)
+
+                config = Configuration(config_dict)
+            ConfigLoader.cache[key] = (signature, config)
+            return config
+
+    @staticmethod
+    def clear():
+        with ConfigLoader.lock:
+            ConfigLoader.cache.clear()
+
+
 class ConfigProcessor:
     """
     Configuration Processor to read and load config
     """
+    CONSUMER_MODE_ENV = 'FABRIC_MGMT_CLI_CONSUMER_MODE'
+
     def __init__(self, *, path: str = None):
         self.path = path
         self.config = None
@@ -53,10 +152,7 @@ class ConfigProcessor:
     def read_configuration(self) -> Configuration:
         if self.path is None:
             raise Exception("No data source has been specified")
-        config_dict = None
-        with open(self.path) as f:
-            config_dict = yaml.safe_load(f)
-        self.config = Configuration(config_dict)
+        self.config = ConfigLoader.load(path=self.path)
         return self.config
 
     def get_auth(self) -> AuthAvro:
@@ -174,6 +270,20 @@ class ConfigProcessor:
 
         return conf
 
+    def get_kafka_consumer_mode(self) -> str:
+        """
+        Get the mode of the callback consumer; the FABRIC_MGMT_CLI_CONSUMER_MODE environment variable
+        overrides kafka-consumer-mode from the runtime section
+        @return group to consume as a member of kafka-group-id or ephemeral to consume from directly
+                assigned partitions starting at the log end
+        """
+        mode = os.getenv(self.CONSUMER_MODE_ENV, None)
+        if mode:
+            return mode.lower()
+        if self.config is not None and self.config.get_runtime_config() is not None:
+            return self.config.get_runtime_config().get_consumer_mode()
+        return RuntimeConfig.CONSUMER_MODE_GROUP
+
     def get_kafka_config_consumer(self) -> dict:
         if self.config is None or self.config.get_runtime_config() is None:
             return None
@@ -182,6 +292,13 @@ class ConfigProcessor:
         conf['auto.offset.reset'] = 'earliest'
 
         group_id = self.get_group_id()
+        if self.get_kafka_consumer_mode() == RuntimeConfig.CONSUMER_MODE_EPHEMERAL:
+            # The client requires a group id, but partitions are assigned directly so the group is never joined;
+            # make it unique and never commit offsets so that no consumer group is created
+            group_id = f"{group_id}-{uuid.uuid4()}"
+            conf['enable.auto.commit'] = False
+            conf['enable.auto.offset.store'] = False
+            conf['auto.offset.reset'] = 'latest'
         conf[Constants.GROUP_ID] = group_id
 
         sasl_username = self.config.get_runtime_config().get_kafka_config().get(
@@ -213,6 +330,26 @@ class ConfigProcessor:
         if self.config is not None and self.config.get_net() is not None:
             return self.config.get_net().get_validate_certs()
 
+    def get_net_pool_size(self) -> int:
+        if self.config is not None and self.config.get_net() is not None:
+            return self.config.get_net().get_pool_size()
+
+    def get_net_connect_timeout(self) -> float:
+        if self.config is not None and self.config.get_net() is not None:
+            return self.config.get_net().get_connect_timeout()
+
+    def get_net_read_timeout(self) -> float:
+        if self.config is not None and self.config.get_net() is not None:
+            return self.config.get_net().get_read_timeout()
+
+    def get_net_retries(self) -> int:
+        if self.config is not None and self.config.get_net() is not None:
+            return self.config.get_net().get_retries()
+
+    def get_net_backoff(self) -> float:
+        if self.config is not None and self.config.get_net() is not None:
+            return self.config.get_net().get_backoff()
+
     def get_playbook_config(self) -> dict:
         if self.config is not None:
             return self.config.get_playbook_config()
\ No newline at end of file
@@ -26,14 +26,31 @@
 from fabric_cf.actor.core.common.constants import Constants
 
 
+def normalize(config: list or dict, *, lower: bool = False) -> dict:
+    """
+    Flatten a config section expressed as a list of single key dictionaries into a dictionary
+    @param config config section
+    @param lower lower case the keys
+    @return dictionary of the properties in the section; later entries override earlier ones
+    """
+    result = {}
+    if config is None:
+        return result
+    if isinstance(config, dict):
+        config = [config]
+    for prop in config:
+        for key, value in prop.items():
+            result[key.lower() if lower else key] = value
+    return result
+
+
 class RuntimeConfig:
+    CONSUMER_MODE = "kafka-consumer-mode"
+    CONSUMER_MODE_GROUP = "group"
+    CONSUMER_MODE_EPHEMERAL = "ephemeral"
 
     def __init__(self, *, config: list):
-        self.kafka_config = {}
-
-        for prop in config:
-            for key, value in prop.items():
-                self.kafka_config[key] = value
+        self.kafka_config = normalize(config)
 
     def get_kafka_config(self):
         return self.kafka_config
@@ -59,6 +76,10 @@ class RuntimeConfig:
     def get_group_id(self) -> str:
         return self.kafka_config.get(Constants.PROPERTY_CONF_KAFKA_GROUP_ID, None)
 
+    def get_consumer_mode(self) -> str:
+        mode = self.kafka_config.get(RuntimeConfig.CONSUMER_MODE, None)
+        return mode.lower() if mode else RuntimeConfig.CONSUMER_MODE_GROUP
+
     def get_ca_location(self) -> str:
         return self.kafka_config.get(Constants.PROPERTY_CONF_KAFKA_S_SL_CA_LOCATION, None)
 
@@ -81,20 +102,13 @@ class LogConfig:
         self.log_size = None
         self.log_name = None
 
-        for prop in config:
-            for key, value in prop.items():
-                if key.lower() == Constants.PROPERTY_CONF_LOG_DIRECTORY:
-                    self.log_dir = value
-                if key.lower() == Constants.PROPERTY_CONF_LOG_FILE:
-                    self.log_file = value
-                if key.lower() == Constants.PROPERTY_CONF_LOG_LEVEL:
-                    self.log_level = value
-                if key.lower() == Constants.PROPERTY_CONF_LOG_RETAIN:
-                    self.log_retain = value
-                if key.lower() == Constants.PROPERTY_CONF_LOG_SIZE:
-                    self.log_size = value
-                if key.lower() == Constants.PROPERTY_CONF_LOGGER:
-                    self.log_name = value
+        props = normalize(config, lower=True)
+        self.log_dir = props.get(Constants.PROPERTY_CONF_LOG_DIRECTORY, self.log_dir)
+        self.log_file = props.get(Constants.PROPERTY_CONF_LOG_FILE, self.log_file)
+        self.log_level = props.get(Constants.PROPERTY_CONF_LOG_LEVEL, self.log_level)
+        self.log_retain = props.get(Constants.PROPERTY_CONF_LOG_RETAIN, self.log_retain)
+        self.log_size = props.get(Constants.PROPERTY_CONF_LOG_SIZE, self.log_size)
+        self.log_name = props.get(Constants.PROPERTY_CONF_LOGGER, self.log_name)
 
     def get_log_dir(self) -> str:
         return self.log_dir
@@ -121,14 +135,10 @@ class AuthConfig:
         self.guid = None
         self.credmgr_host = None
 
-        for prop in config:
-            for key, value in prop.items():
-                if key.lower() == Constants.NAME:
-                    self.name = value
-                if key.lower() == Constants.GUID:
-                    self.guid = value
-                if key.lower() == Constants.CREDMGR_HOST:
-                    self.credmgr_host = value
+        props = normalize(config, lower=True)
+        self.name = props.get(Constants.NAME, self.name)
+        self.guid = props.get(Constants.GUID, self.guid)
+        self.credmgr_host = props.get(Constants.CREDMGR_HOST, self.credmgr_host)
 
     def get_name(self) -> str:
         return self.name
@@ -146,16 +156,11 @@ class Peer:
         self.type = None
         self.guid = None
         self.kafka_topic = None
-        for prop in config:
-            for key, value in prop.items():
-                if key == Constants.NAME:
-                    self.name = value
-                elif key == Constants.TYPE:
-                    self.type = value
-                elif key == Constants.GUID:
-                    self.guid = value
-                elif key == Constants.KAFKA_TOPIC:
-                    self.kafka_topic = value
+        props = normalize(config)
+        self.name = props.get(Constants.NAME, self.name)
+        self.type = props.get(Constants.TYPE, self.type)
+        self.guid = props.get(Constants.GUID, self.guid)
+        self.kafka_topic = props.get(Constants.KAFKA_TOPIC, self.kafka_topic)
 
     def get_name(self) -> str:
         return self.name
@@ -176,17 +181,21 @@ class NetConfig:
         self.username = None
         self.password = None
         self.validate_certs = None
-
-        for prop in config:
-            for key, value in prop.items():
-                if key == "url":
-                    self.url = value
-                elif key == "username":
-                    self.username = value
-                elif key == "password":
-                    self.password = value
-                elif key == "validate_certs":
-                    self.validate_certs = value
+        self.pool_size = None
+        self.connect_timeout = None
+        self.read_timeout = None
+        self.retries = None
+        self.backoff = None
+
+        props = normalize(config)
+        self.url = props.get("url", self.url)
+        self.username = props.get("username", self.username)
+        self.password = props.get("password", self.password)
+        self.validate_certs = props.get("validate_certs", self.validate_certs)
+        for key, convert in [("pool_size", int), ("connect_timeout", float), ("read_timeout", float),
+                             ("retries", int), ("backoff", float)]:
+            if key in props:
+                setattr(self, key, convert(props[key]))
 
     def get_url(self) -> str:
         return self.url
@@ -200,6 +209,21 @@ class NetConfig:
     def get_validate_certs(self) -> bool:
         return self.validate_certs
 
+    def get_pool_size(self) -> int:
+        return self.pool_size
+
+    def get_connect_timeout(self) -> float:
+        return self.connect_timeout
+
+    def get_read_timeout(self) -> float:
+        return self.read_timeout
+
+    def get_retries(self) -> int:
+        return self.retries
+
+    def get_backoff(self) -> float:
+        return self.backoff
+
 
 class Configuration:
     PLAYBOOK_SECTION = "playbooks"
@@ -211,7 +235,7 @@ class Configuration:
         self.runtime = RuntimeConfig(config=config[Constants.CONFIG_SECTION_RUNTIME])
         self.logging = LogConfig(config=config[Constants.CONFIG_LOGGING_SECTION])
         self.auth = AuthConfig(config=config['auth'])
-        self.net = NetConfig(config=config['net'])
+        self.net = NetConfig(config=config.get('net'))
         self.playbook_config = config.get(Configuration.PLAYBOOK_SECTION)
         self.peers = []
         if 'peers' in config:
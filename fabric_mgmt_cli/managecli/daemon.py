@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import io
+import json
+import os
+import socket
+import sys
+import traceback
+from contextlib import redirect_stdout
+from typing import List
+
+import click
+
+
+class DaemonException(Exception):
+    pass
+
+
+class _SocketWriter(io.TextIOBase):
+    """
+    Text stream which forwards everything written to it to the daemon client as output frames
+    """
+    def __init__(self, *, stream):
+        self.stream = stream
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, s: str) -> int:
+        if s:
+            self.stream.write(json.dumps({'out': s}) + '\n')
+        return len(s)
+
+    def flush(self):
+        self.stream.flush()
+
+
+class ManagementDaemon:
+    """
+    Long lived Management Shell; keeps the Kafka Processor running and serves CLI requests over a Unix socket
+    so that each CLI invocation does not pay for the Kafka bootstrap
+    """
+    # Environment passed through from the client for the duration of a request
+    FORWARDED_ENV = ['FABRIC_ID_TOKEN', 'FABRIC_REFRESH_TOKEN', 'FABRIC_MGMT_CLI_CACHE_TTL']
+    # Seconds a connection may stall on a read or write before it is dropped; requests are served one at a time
+    CONNECTION_TIMEOUT = 30
+
+    def __init__(self, *, socket_path: str = None, logger=None):
+        self.socket_path = socket_path if socket_path is not None else DaemonClient.get_socket_path()
+        self.server = None
+        self.running = False
+        self.logger = logger
+        self.config_path = None
+
+    def start(self):
+        """
+        Bind the socket, start the Kafka Processor and serve requests until shutdown is requested
+        """
+        from fabric_mgmt_cli.managecli.kafka_processor import KafkaProcessor, KafkaProcessorSingleton
+        self.check_socket_path()
+        self.bind()
+        try:
+            self.config_path = os.path.realpath(KafkaProcessor.PATH)
+            processor = KafkaProcessorSingleton.get()
+            processor.persistent = True
+            processor.start(ignore_tokens=True)
+            self.logger = processor.logger
+            self.logger.info(f"Management daemon listening on {self.socket_path}")
+            self.serve()
+        finally:
+            self.stop()
+
+    def check_socket_path(self):
+        """
+        Check that CLI invocations connect to the socket the daemon listens on
+        @raises DaemonException if the socket is not the one resolved by the clients
+        """
+        client_path = DaemonClient.get_socket_path()
+        if os.path.abspath(self.socket_path) != os.path.abspath(client_path):
+            raise DaemonException(f"CLI commands connect to {client_path}; export "
+                                  f"FABRIC_MGMT_CLI_DAEMON_SOCKET={self.socket_path} to use this socket")
+
+    def bind(self):
+        """
+        Bind the socket; the socket is only accessible by the user running the daemon
+        @raises DaemonException if a daemon is already running or the socket directory is accessible by others
+        """
+        if os.path.exists(self.socket_path):
+            if DaemonClient(socket_path=self.socket_path).is_running():
+                raise DaemonException(f"Management daemon is already running on {self.socket_path}")
+            os.unlink(self.socket_path)
+
+        directory = os.path.dirname(os.path.abspath(self.socket_path))
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        if os.stat(directory).st_mode & 0o077:
+            raise DaemonException(f"Socket directory {directory} must only be accessible by its owner (chmod 700)")
+
+        self.server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        umask = os.umask(0o077)
+        try:
+            self.server.bind(self.socket_path)
+        finally:
+            os.umask(umask)
+        self.server.listen(16)
+        self.running = True
+
+    def serve(self):
+        """
+        Serve requests one at a time until shutdown is requested
+        """
+        while self.running:
+            conn, _ = self.server.accept()
+            conn.settimeout(self.CONNECTION_TIMEOUT)
+            with conn:
+                self.handle_connection(conn=conn)
+
+    def unbind(self):
+        """
+        Close and remove the socket
+        """
+        self.running = False
+        if self.server is not None:
+            self.server.close()
+            self.server = None
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+    def stop(self):
+        """
+        Stop serving and tear down the Kafka Processor
+        """
+        from fabric_mgmt_cli.managecli.kafka_processor import KafkaProcessorSingleton
+        self.unbind()
+        processor = KafkaProcessorSingleton.get()
+        processor.persistent = False
+        processor.stop()
+
+    def handle_connection(self, *, conn: socket.socket):
+        stream = conn.makefile(mode='rw', encoding='utf-8')
+        try:
+            line = stream.readline()
+            if not line:
+                return
+            request = json.loads(line)
+            command = request.get('command', 'run')
+            if command == 'ping':
+                self.reply(stream=stream, msg={'exit_code': 0})
+            elif command == 'shutdown':
+                self.running = False
+                self.reply(stream=stream, msg={'exit_code': 0})
+            elif command == 'run':
+                if not self.is_same_config(config_path=request.get('config_path')):
+                    self.reply(stream=stream, msg={'error': 'config mismatch'})
+                    return
+                exit_code = self.run(argv=request.get('argv', []), env=request.get('env', {}),
+                                     cwd=request.get('cwd'), stream=stream)
+                self.reply(stream=stream, msg={'exit_code': exit_code})
+            else:
+                self.reply(stream=stream, msg={'error': f'unknown command {command}'})
+        except socket.timeout:
+            self.logger.warning("Dropping daemon connection which stalled")
+        except Exception as e:
+            self.logger.error(f"Failed to process daemon request: {e}")
+            self.logger.error(traceback.format_exc())
+            try:
+                self.reply(stream=stream, msg={'error': str(e)})
+            except Exception:
+                pass
+        finally:
+            stream.close()
+
+    @staticmethod
+    def reply(*, stream, msg: dict):
+        stream.write(json.dumps(msg) + '\n')
+        stream.flush()
+
+    def is_same_config(self, *, config_path: str) -> bool:
+        """
+        Check if the client uses the configuration the daemon was started with
+        @param config_path absolute path of the client configuration; None if the client has none
+        @return True if the client configuration is the daemon configuration
+        """
+        if config_path is None or self.config_path is None:
+            return False
+        return os.path.realpath(config_path) == self.config_path
+
+    def run(self, *, argv: List[str], env: dict, cwd: str, stream) -> int:
+        """
+        Run a CLI command in-process against the already running Kafka Processor. Requests are served one
+        at a time, so the client environment and working directory are applied to the process for the
+        duration of the command.
+        @param argv command line arguments
+        @param env client environment variables to apply for this request
+        @param cwd client working directory, relative paths in the arguments are resolved against it
+        @param stream client stream to which output is written
+        @return exit code
+        """
+        saved_env = {k: os.environ.get(k) for k in self.FORWARDED_ENV}
+        saved_cwd = os.getcwd()
+        try:
+            for k in self.FORWARDED_ENV:
+                if env.get(k) is not None:
+                    os.environ[k] = env[k]
+                else:
+                    os.environ.pop(k, None)
+            if cwd is not None:
+                os.chdir(cwd)
+            writer = _SocketWriter(stream=stream)
+            with redirect_stdout(writer):
+                exit_code = self.invoke(argv=argv, writer=writer)
+            writer.flush()
+        finally:
+            os.chdir(saved_cwd)
+            for k, v in saved_env.items():
+                if v is None:
+                    os.environ.pop(k, None)
+                else:
+                    os.environ[k] = v
+        return exit_code
+
+    @staticmethod
+    def invoke(*, argv: List[str], writer) -> int:
+        """
+        Invoke the CLI
+        @param argv command line arguments
+        @param writer stream to which errors are written
+        @return exit code
+        """
+        from fabric_mgmt_cli.managecli.managecli import managecli
+        try:
+            managecli.main(args=argv, prog_name='fabric-mgmt-cli', standalone_mode=False, obj={})
+        except click.exceptions.Abort:
+            return 1
+        except click.ClickException as e:
+            e.show(file=writer)
+            return e.exit_code
+        except SystemExit as e:
+            return e.code if isinstance(e.code, int) else 0
+        return 0
+
+
+class DaemonClient:
+    """
+    Client side of the Management daemon; forwards CLI invocations when the daemon is running
+    """
+    # Command groups which talk to Kafka and benefit from the daemon
+    FORWARDED_COMMANDS = ['slices', 'slivers', 'delegations', 'maintenance']
+
+    def __init__(self, *, socket_path: str = None):
+        self.socket_path = socket_path if socket_path is not None else self.get_socket_path()
+
+    @staticmethod
+    def get_socket_path() -> str:
+        path = os.getenv('FABRIC_MGMT_CLI_DAEMON_SOCKET')
+        if path is None or path == "":
+            path = os.path.join(os.path.expanduser("~"), ".fabric_mgmt_cli", "daemon", "daemon.sock")
+        return path
+
+    def connect(self) -> socket.socket or None:
+        if not os.path.exists(self.socket_path):
+            return None
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(self.socket_path)
+            return sock
+        except OSError:
+            sock.close()
+            return None
+
+    def send(self, *, request: dict, out=None) -> dict or None:
+        """
+        Send a request to the daemon, copy any output frames to out
+        @param request request
+        @param out stream to write the command output to
+        @return final response frame; None if daemon is not reachable
+        """
+        sock = self.connect()
+        if sock is None:
+            return None
+        with sock:
+            stream = sock.makefile(mode='rw', encoding='utf-8')
+            stream.write(json.dumps(request) + '\n')
+            stream.flush()
+            for line in stream:
+                msg = json.loads(line)
+                if 'out' in msg:
+                    if out is not None:
+                        out.write(msg['out'])
+                    continue
+                return msg
+        return None
+
+    def is_running(self) -> bool:
+        response = self.send(request={'command': 'ping'})
+        return response is not None and response.get('exit_code') == 0
+
+    def shutdown(self) -> bool:
+        response = self.send(request={'command': 'shutdown'})
+        return response is not None
+
+    def forward(self, *, argv: List[str]) -> int or None:
+        """
+        Forward a CLI invocation to the daemon
+        @param argv command line arguments
+        @return exit code; None if the command must be executed in-process
+        """
+        if os.getenv('FABRIC_MGMT_CLI_NO_DAEMON') is not None:
+            return None
+        commands = [a for a in argv if not a.startswith('-')]
+        if len(commands) == 0 or commands[0] not in self.FORWARDED_COMMANDS or '--help' in argv:
+            return None
+        # Long running commands would hold the daemon for their entire duration
+        if '--watch' in argv:
+            return None
+        # Timings must be taken in the process which executes the command
+        if any(a.startswith('--profile') for a in argv):
+            return None
+
+        config_path = os.getenv('FABRIC_MGMT_CLI_CONFIG_PATH')
+        request = {'command': 'run',
+                   'argv': argv,
+                   'cwd': os.getcwd(),
+                   'config_path': os.path.realpath(config_path) if config_path else None,
+                   'env': {k: os.getenv(k) for k in ManagementDaemon.FORWARDED_ENV}}
+        try:
+            response = self.send(request=request, out=sys.stdout)
+        except (OSError, ValueError):
+            return None
+        if response is None or response.get('error') == 'config mismatch':
+            return None
+        sys.stdout.flush()
+        if 'error' in response:
+            click.echo(f"Error occurred: {response.get('error')}")
+            return 1
+        return response.get('exit_code', 0)
@@ -27,22 +27,192 @@ import logging
 import os
 import threading
 import traceback
+from contextlib import contextmanager, nullcontext
 from logging.handlers import RotatingFileHandler
+from typing import List
 
+from confluent_kafka import TopicPartition
 from fabric_cf.actor.core.apis.abc_actor_mixin import ActorType
 from fabric_cf.actor.core.manage.kafka.kafka_actor import KafkaActor
-from fabric_cf.actor.core.manage.kafka.kafka_broker import KafkaBroker
 from fabric_cf.actor.core.manage.kafka.kafka_mgmt_message_processor import KafkaMgmtMessageProcessor
 from fabric_cf.actor.core.util.id import ID
-from fabric_cm.credmgr.credmgr_proxy import CredmgrProxy
 
 from fabric_mgmt_cli.managecli.config_processor import ConfigProcessor
+from fabric_mgmt_cli.managecli.configuration import RuntimeConfig
+from fabric_mgmt_cli.managecli.profiling import PROFILER, InstrumentedProxy, span
+from fabric_mgmt_cli.managecli.records import strip_reservations
+from fabric_mgmt_cli.managecli.token_cache import TokenCache
 
 
 class TokenException(Exception):
     pass
 
 
+class MgmtMessageProcessor(KafkaMgmtMessageProcessor):
+    """
+    Callback consumer for management responses; times the conversion of each response into message objects.
+
+    In ephemeral mode the consumer does not join a consumer group. The partitions of the callback topic are
+    assigned directly, starting at the current end of the log, so that start up only needs a metadata fetch and
+    any number of CLI processes can share the callback topic; each one ignores the responses to the others.
+
+    Requests sent by a thread inside lean_reservations get the reservations in their response as
+    ReservationRecord objects, skipping the decoding of slivers and properties.
+
+    Requests sent by a thread inside track_requests are recorded under a tag; cancel_requests drops the pending
+    requests of a tag and wakes up the threads waiting for their responses, which then fail with a timeout. A
+    request which is still being produced when it is cancelled waits for its response as usual.
+    """
+    METADATA_TIMEOUT = 10
+
+    def __init__(self, *, ephemeral: bool = False, **kwargs):
+        """
+        @param ephemeral assign the partitions directly instead of subscribing as a member of the consumer group
+        """
+        super().__init__(**kwargs)
+        self.ephemeral = ephemeral
+        self.projection = threading.local()
+        self.lean_lock = threading.Lock()
+        self.lean_messages = set()
+        self.records = {}
+        self.tagged = {}
+        self.cancelled = set()
+
+    @contextmanager
+    def lean_reservations(self):
+        """
+        Decode the reservations in the responses to requests sent by the calling thread as ReservationRecords
+        """
+        previous = getattr(self.projection, 'lean', False)
+        self.projection.lean = True
+        try:
+            yield
+        finally:
+            self.projection.lean = previous
+
+    @contextmanager
+    def track_requests(self, *, tag):
+        """
+        Record the requests sent by the calling thread under a tag so that they can be cancelled
+        @param tag tag
+        """
+        previous = getattr(self.projection, 'tag', None)
+        self.projection.tag = tag
+        with self.lean_lock:
+            self.tagged[tag] = set()
+        try:
+            yield
+        finally:
+            self.projection.tag = previous
+            with self.lean_lock:
+                self.tagged.pop(tag, None)
+
+    def cancel_requests(self, *, tag):
+        """
+        Stop waiting for the responses to the requests recorded under a tag; responses arriving later are ignored
+        @param tag tag
+        """
+        with self.lean_lock:
+            msg_ids = list(self.tagged.get(tag, ()))
+            self.cancelled.update(msg_ids)
+        for msg_id in msg_ids:
+            wrapper = self.remove_message(msg_id=msg_id)
+            if wrapper is not None:
+                with wrapper.condition:
+                    wrapper.condition.notify_all()
+
+    def add_message(self, *, message):
+        with self.lean_lock:
+            if getattr(self.projection, 'lean', False):
+                self.lean_messages.add(message.get_message_id())
+            tag = getattr(self.projection, 'tag', None)
+            if tag is not None and tag in self.tagged:
+                self.tagged[tag].add(message.get_message_id())
+        return super().add_message(message=message)
+
+    def remove_message(self, *, msg_id: str):
+        with self.lean_lock:
+            self.lean_messages.discard(msg_id)
+        return super().remove_message(msg_id=msg_id)
+
+    def assign_log_end(self):
+        """
+        Assign all partitions of the topics at their current end offsets; the offsets are resolved before
+        returning so that no response to a request sent afterwards can be missed
+        """
+        partitions = []
+        for topic in self.topics:
+            metadata = self.consumer.list_topics(topic=topic, timeout=self.METADATA_TIMEOUT)
+            if metadata.topics[topic].error is not None:
+                raise Exception(f"Failed to get metadata for topic {topic}: {metadata.topics[topic].error}")
+            for partition in metadata.topics[topic].partitions:
+                _, high = self.consumer.get_watermark_offsets(TopicPartition(topic, partition),
+                                                                timeout=self.METADATA_TIMEOUT)
+                partitions.append(TopicPartition(topic, partition, high))
+        self.consumer.assign(partitions)
+        self.logger.debug(f"Assigned partitions {partitions}")
+
+    def start(self):
+        if self.ephemeral:
+            with span("kafka.assign"):
+                self.assign_log_end()
+        super().start()
+
+    def consume(self):
+        if not self.ephemeral:
+            super().consume()
+            return
+
+        while self.running:
+            try:
+                msg = self.consumer.poll(timeout=self.poll_timeout)
+                if msg is None:
+                    continue
+                if msg.error():
+                    self.logger.error(f"KAFKA: Consumer error: {msg.error()}")
+                    continue
+                self.process_message(msg.topic(), msg.key(), msg.value())
+            except KeyboardInterrupt:
+                break
+            except Exception as e:
+                self.logger.error(f"KAFKA: consumer error: {e}")
+                self.logger.error(traceback.format_exc())
+        self.consumer.close()
+        self.logger.info("KAFKA: Consumer Shutting down complete..")
+
+    def handle_message(self, message):
+        records = self.records.pop(message.get_message_id(), None)
+        if records is not None:
+            message.reservations = records
+        with self.lean_lock:
+            cancelled = message.get_message_id() in self.cancelled
+            self.cancelled.discard(message.get_message_id())
+        if cancelled:
+            self.logger.debug(f"Ignoring response to a cancelled request: {message.get_message_id()}")
+            return
+        if self.ephemeral:
+            with self.thread_lock:
+                pending = message.get_message_id() in self.messages
+            if not pending:
+                self.logger.debug(f"Ignoring response to a request from another client: {message.get_message_id()}")
+                return
+        super().handle_message(message)
+
+    def process_message(self, topic: str, key: dict, value: dict):
+        with span("kafka.decode", message=value.get('name') if value is not None else None):
+            message_id = value.get('message_id') if value is not None else None
+            with self.lean_lock:
+                lean = message_id in self.lean_messages
+            if lean:
+                value, records = strip_reservations(value=value)
+                if records is not None:
+                    self.records[message_id] = records
+            try:
+                super().process_message(topic, key, value)
+            finally:
+                self.records.pop(message_id, None)
+
+
 class KafkaProcessor:
     PATH = os.environ.get('FABRIC_MGMT_CLI_CONFIG_PATH', './config.yml')
 
@@ -50,12 +220,17 @@ class KafkaProcessor:
         self.config_processor = ConfigProcessor(path=self.PATH)
         self.message_processor = None
         self.actor_cache = {}
+        self.peers = {}
         self.lock = threading.Lock()
+        self.thread_local = threading.local()
         self.auth = None
         self.logger = None
         self.key_schema = None
         self.val_schema = None
         self.producer = None
+        self.started = False
+        # Set by the Management daemon to keep Kafka running across commands
+        self.persistent = False
 
     def setup_kafka(self):
         """
@@ -72,10 +247,11 @@ class KafkaProcessor:
         consumer_conf = self.config_processor.get_kafka_config_consumer()
         topics = [self.config_processor.get_kafka_topic()]
 
-        self.message_processor = KafkaMgmtMessageProcessor(consumer_conf=consumer_conf,
-                                                           key_schema_location=self.key_schema,
-                                                           value_schema_location=self.val_schema, topics=topics,
-                                                           logger=self.logger)
+        ephemeral = self.config_processor.get_kafka_consumer_mode() == RuntimeConfig.CONSUMER_MODE_EPHEMERAL
+        self.message_processor = MgmtMessageProcessor(ephemeral=ephemeral, consumer_conf=consumer_conf,
+                                                      key_schema_location=self.key_schema,
+                                                      value_schema_location=self.val_schema, topics=topics,
+                                                      logger=self.logger)
 
     def initialize(self):
         """
@@ -91,49 +267,87 @@ class KafkaProcessor:
 
     def load_actor_cache(self):
         """
-        Load the Actor Cache
+        Load the Actor Cache; only the peer descriptors are indexed here,
+        management actors are created on first use by get_mgmt_actor
         """
         peers = self.config_processor.get_peers()
-        if peers is not None:
-            for p in peers:
-                mgmt_actor = None
-                if p.get_type().lower() == ActorType.Broker.name.lower():
-                    mgmt_actor = KafkaBroker(guid=ID(uid=p.get_guid()), kafka_topic=p.get_kafka_topic(),
-                                             auth=self.config_processor.get_auth(),
-                                             logger=self.logger, message_processor=self.message_processor,
-                                             producer=self.producer)
-                elif p.get_type().lower() in [ActorType.Broker.name.lower(), ActorType.Orchestrator.name.lower()]:
-                    mgmt_actor = KafkaBroker(guid=ID(uid=p.get_guid()), kafka_topic=p.get_kafka_topic(),
-                                             auth=self.config_processor.get_auth(),
-                                             logger=self.logger, message_processor=self.message_processor,
-                                             producer=self.producer)
-                else:
-                    mgmt_actor = KafkaActor(guid=ID(uid=p.get_guid()), kafka_topic=p.get_kafka_topic(),
-                                            auth=self.config_processor.get_auth(),
-                                            logger=self.logger, message_processor=self.message_processor,
-                                            producer=self.producer)
-                try:
-                    self.lock.acquire()
-                    self.logger.debug("Added actor {} to cache".format(p.get_name()))
-                    self.actor_cache[p.get_name()] = mgmt_actor
-                finally:
-                    self.lock.release()
-        else:
+        try:
+            self.lock.acquire()
+            self.actor_cache.clear()
+            self.peers = {p.get_name(): p for p in peers} if peers is not None else {}
+        finally:
+            self.lock.release()
+        if len(self.peers) == 0:
             self.logger.debug("No peers available")
 
+    def __create_mgmt_actor(self, *, peer) -> KafkaActor:
+        """
+        Create the Management Actor for a peer
+        @param peer peer descriptor
+        @return Management Actor
+        """
+        if peer.get_type().lower() in [ActorType.Broker.name.lower(), ActorType.Orchestrator.name.lower()]:
+            from fabric_cf.actor.core.manage.kafka.kafka_broker import KafkaBroker
+            actor_class = KafkaBroker
+        else:
+            actor_class = KafkaActor
+        mgmt_actor = actor_class(guid=ID(uid=peer.get_guid()), kafka_topic=peer.get_kafka_topic(),
+                                 auth=self.config_processor.get_auth(), logger=self.logger,
+                                 message_processor=self.message_processor, producer=self.producer)
+        self.logger.debug("Added actor {} to cache".format(peer.get_name()))
+        return mgmt_actor
+
+    def lean_reservations(self):
+        """
+        Context in which reservations fetched by the calling thread are returned as ReservationRecords
+        without their slivers
+        """
+        if isinstance(self.message_processor, MgmtMessageProcessor):
+            return self.message_processor.lean_reservations()
+        return nullcontext()
+
+    def get_actor_names(self, *, actor_type: str = None) -> List[str]:
+        """
+        Get the names of the configured actors
+        @param actor_type actor type i.e. orchestrator, broker or authority; all actors if None
+        @return list of actor names
+        """
+        peers = self.peers.values() if len(self.peers) > 0 else self.config_processor.get_peers()
+        if peers is None:
+            return []
+        return [p.get_name() for p in peers if actor_type is None or p.get_type().lower() == actor_type.lower()]
+
     def get_mgmt_actor(self, *, name: str) -> KafkaActor:
         """
-        Get Management Actor from Cache
+        Get Management Actor from Cache, creating it on first use
         @param name actor name
         @return Management Actor
         """
 
         try:
             self.lock.acquire()
-            return self.actor_cache.get(name, None)
+            actor = self.actor_cache.get(name, None)
+            if actor is None and name in self.peers:
+                actor = self.__create_mgmt_actor(peer=self.peers[name])
+                self.actor_cache[name] = actor
         finally:
             self.lock.release()
 
+        # Management actors record the status of the last call on the instance;
+        # hand each worker thread its own handle so that concurrent calls do not clobber each other
+        if actor is not None and threading.current_thread() is not threading.main_thread():
+            handles = getattr(self.thread_local, 'actors', None)
+            if handles is None:
+                handles = {}
+                self.thread_local.actors = handles
+            if name not in handles:
+                handles[name] = actor.clone()
+            actor = handles[name]
+
+        if actor is not None and PROFILER.enabled:
+            return InstrumentedProxy(target=actor, prefix="actor", profiler=PROFILER, actor=name)
+        return actor
+
     def make_logger(self):
         """
         Detects the path and level for the log file from the actor config and sets
@@ -197,9 +411,21 @@ class KafkaProcessor:
 
         if refresh_token is not None:
             try:
-                proxy = CredmgrProxy(credmgr_host=self.config_processor.get_credmgr_host())
-                tokens = proxy.refresh(project_id=None, scope="all", refresh_token=refresh_token)
-                id_token = tokens.get('id_token', None)
+                credmgr_host = self.config_processor.get_credmgr_host()
+
+                def refresh(token: str) -> dict:
+                    from fabric_cm.credmgr.credmgr_proxy import CredmgrProxy
+                    proxy = CredmgrProxy(credmgr_host=credmgr_host)
+                    with span("kafka.tokens"):
+                        return proxy.refresh(project_id=None, scope="all", refresh_token=token)
+
+                token_cache = TokenCache.create(logger=self.logger)
+                if token_cache is not None:
+                    id_token = token_cache.get(credmgr_host=credmgr_host, refresh_token=refresh_token,
+                                               refresh=refresh)
+                else:
+                    tokens = refresh(refresh_token)
+                    id_token = tokens.get('id_token', None)
             except Exception as e:
                 raise TokenException('Not a valid refresh_token! Error: {}'.format(e))
 
@@ -219,11 +445,16 @@ class KafkaProcessor:
         @return token if ignore_tokens is False; None otherwise
         """
         try:
-            self.initialize()
+            if not self.started:
+                with span("kafka.initialize"):
+                    self.initialize()
             ret_val = None
             if not ignore_tokens:
                 ret_val = self.get_tokens(id_token=id_token, refresh_token=refresh_token)
-            self.message_processor.start()
+            if not self.started:
+                with span("kafka.start"):
+                    self.message_processor.start()
+                self.started = True
             return ret_val
         except TokenException as e:
             self.logger.debug(f"Failed to start Management Shell: {e}")
@@ -236,10 +467,14 @@ class KafkaProcessor:
 
     def stop(self):
         """
-        Stop the Synchronous Kafka Processor
+        Stop the Synchronous Kafka Processor; no-op while the processor is held by the Management daemon
         """
+        if self.persistent or not self.started:
+            return
         try:
-            self.message_processor.stop()
+            self.started = False
+            with span("kafka.stop"):
+                self.message_processor.stop()
         except Exception as e:
             self.logger.debug(f"Failed to stop Management Shell: {e}")
             self.logger.error(traceback.format_exc())
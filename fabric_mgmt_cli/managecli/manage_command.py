@@ -23,9 +23,14 @@
 #
 #
 # Author: Komal Thareja (kthare10@renci.org)
+import asyncio
+import json
+import queue
+import threading
+import time
 import traceback
 from datetime import datetime, timezone, timedelta
-from typing import Tuple, Dict, List, Optional
+from typing import Callable, Tuple, Dict, List, Optional
 
 from fabric_cf.actor.core.apis.abc_delegation import DelegationState
 from fabric_cf.actor.core.common.constants import Constants
@@ -43,10 +48,35 @@ from fim.slivers.maintenance_mode import MaintenanceInfo, MaintenanceEntry, Main
 from fim.slivers.network_node import NodeType
 from fim.slivers.network_service import ServiceType
 
+from fabric_mgmt_cli.managecli.async_client import AsyncManagementClient
+from fabric_mgmt_cli.managecli.checkpoint import Checkpoint
+from fabric_mgmt_cli.managecli.net.index import ServiceIndex, build_index, extract_guid, services_for_types
+from fabric_mgmt_cli.managecli.parallel import run_concurrently, split_names, DEFAULT_CONCURRENCY
+from fabric_mgmt_cli.managecli.reconcile import reconcile, AuditHistory, ReconcileResult, SliverAudit
 from fabric_mgmt_cli.managecli.show_command import ShowCommand
 
 
 class ManageCommand(ShowCommand):
+    # Sliver states considered consistent on each actor
+    AUDIT_ALLOWED_STATES = {
+        'oc': [str(ReservationStates.Active), str(ReservationStates.ActiveTicketed)],
+        'broker': [str(ReservationStates.Ticketed)],
+        'am': [str(ReservationStates.Active), str(ReservationStates.ActiveTicketed)]
+    }
+
+    # Name of the infrastructure (NSO) source in audit_infra results
+    INFRA_SOURCE = "nso"
+
+    # Reservation states fetched when renewing slices in bulk
+    RENEWABLE_STATES = "Nascent,Ticketed,Active,ActiveTicketed"
+
+    # Slice states renewed in bulk when no states are specified
+    RENEWABLE_SLICE_STATES = "Configuring,StableOK,StableError,ModifyOK,ModifyError,AllocatedOK,AllocatedError"
+
+    # Longest lease accepted on renew; renamed to DEFAULT_MAX_DURATION_IN_WEEKS in newer fabric-cf releases
+    MAX_LEASE_DURATION = getattr(Constants, "DEFAULT_MAX_DURATION", None) or \
+        getattr(Constants, "DEFAULT_MAX_DURATION_IN_WEEKS", timedelta(weeks=2))
+
     def do_close_reservation(self, *, rid: str, actor_name: str, callback_topic: str,
                              id_token: str) -> Tuple[bool, Error]:
         """
@@ -124,8 +154,44 @@ class ManageCommand(ShowCommand):
             self.logger.error(f"Exception occurred e: {e}")
             self.logger.error(traceback.format_exc())
 
+    def close_slices_bulk(self, *, actor_name: str, callback_topic: str, id_token: str, slice_ids: List[str],
+                          concurrency: int = DEFAULT_CONCURRENCY) -> Tuple[List[str], List[str]]:
+        """
+        Close several slices concurrently, reporting progress as each slice completes
+        @param actor_name actor name
+        @param callback_topic callback topic
+        @param id_token identity token
+        @param slice_ids list of slice ids
+        @param concurrency maximum number of slices closed in parallel
+        @return Tuple[List[str], List[str]] slice ids closed successfully and slice ids which failed to close
+        """
+        def close(slice_id: str):
+            return self.do_close_slice(slice_id=ID(uid=slice_id), actor_name=actor_name,
+                                       callback_topic=callback_topic, id_token=id_token)
+
+        def progress(r, completed: int, total: int):
+            if r.succeeded() and r.result[0]:
+                print(f"[{completed}/{total}] Slice {r.key} closed")
+            else:
+                error = r.error if not r.succeeded() else r.result[1].get_status()
+                print(f"[{completed}/{total}] Slice {r.key} failed to close: {error}")
+
+        results = run_concurrently(items=slice_ids, task=close, concurrency=concurrency, on_complete=progress)
+
+        succeeded = []
+        failed = []
+        for r in results:
+            if r.succeeded() and r.result[0]:
+                succeeded.append(r.key)
+            else:
+                failed.append(r.key)
+        print(f"Closed {len(succeeded)} of {len(results)} slices; {len(failed)} failed")
+        for sid in failed:
+            print(f"Failed to close slice: {sid}")
+        return succeeded, failed
+
     def close_slice(self, *, actor_name: str, callback_topic: str, id_token: str, slice_id: str = None,
-                    projectid: str = None):
+                    projectid: str = None, concurrency: int = DEFAULT_CONCURRENCY):
         """
         Close slice
         @param slice_id slice id
@@ -133,6 +199,7 @@ class ManageCommand(ShowCommand):
         @param projectid project id
         @param callback_topic callback topic
         @param id_token identity token
+        @param concurrency maximum number of slices closed in parallel when closing by project
         """
         try:
             if not slice_id and not projectid:
@@ -149,10 +216,11 @@ class ManageCommand(ShowCommand):
             if slices is None:
                 print(f"No slices to close. Error: {error}")
             else:
-                for s in slices:
-                    print(f"Attempting to close slice: {s.get_slice_id()}")
-                    self._close_single_slice(actor_name=actor_name, callback_topic=callback_topic, id_token=id_token,
-                                             slice_id=s.get_slice_id())
+                # KafkaActor does not send the project to the actor, filter here
+                slices = [s for s in slices if s.get_project_id() == projectid]
+                print(f"Attempting to close {len(slices)} slices for project: {projectid}")
+                self.close_slices_bulk(actor_name=actor_name, callback_topic=callback_topic, id_token=id_token,
+                                       slice_ids=[s.get_slice_id() for s in slices], concurrency=concurrency)
 
         except Exception as e:
             self.logger.error(f"Exception occurred e: {e}")
@@ -182,7 +250,8 @@ class ManageCommand(ShowCommand):
         return False, actor.get_last_error()
 
     def remove_reservation(self, *, rid: Optional[str] = None, actor_name: str, callback_topic: str,
-                           id_token: str, states: Optional[str] = None) -> None:
+                           id_token: str, states: Optional[str] = None, concurrency: int = DEFAULT_CONCURRENCY,
+                           timeout: Optional[float] = None) -> None:
         """
         Remove reservation
 
@@ -191,12 +260,15 @@ class ManageCommand(ShowCommand):
         :param callback_topic: Callback topic
         :param id_token: Identity token
         :param states: Comma-separated list of states
+        :param concurrency: Maximum number of removals outstanding at a time when removing by states
+        :param timeout: Time in seconds to wait for each removal when removing by states
         """
         try:
             if rid:
                 self._remove_single_reservation(rid, actor_name, callback_topic, id_token)
             elif states:
-                self._remove_reservations_by_states(actor_name, callback_topic, id_token, states)
+                self._remove_reservations_by_states(actor_name, callback_topic, id_token, states,
+                                                    concurrency=concurrency, timeout=timeout)
         except Exception as e:
             self.logger.error(f"Exception occurred: {e}")
             self.logger.error(traceback.format_exc())
@@ -208,17 +280,47 @@ class ManageCommand(ShowCommand):
         if not result:
             self.print_result(status=error.get_status())
 
-    def _remove_reservations_by_states(self, actor_name: str, callback_topic: str, id_token: str, states: str) -> None:
+    def _remove_reservations_by_states(self, actor_name: str, callback_topic: str, id_token: str, states: str,
+                                       concurrency: int = DEFAULT_CONCURRENCY,
+                                       timeout: Optional[float] = None) -> Tuple[List[str], List[str]]:
+        """
+        Remove the reservations in the given states; up to concurrency removals are outstanding at a time
+        and each one is abandoned after timeout seconds
+        :return: reservation ids removed and reservation ids which failed to be removed
+        """
         reservations, error = self.do_get_reservations(actor_name=actor_name, callback_topic=callback_topic,
                                                        id_token=id_token, states=states)
         if reservations is None:
             print(f"No reservations to remove. Error: {error}")
-        else:
-            for reservation in reservations:
-                print(f"Attempting to remove reservation: {reservation.get_reservation_id()}")
-                self._remove_single_reservation(rid=reservation.get_reservation_id(),
-                                                actor_name=actor_name, callback_topic=callback_topic,
-                                                id_token=id_token)
+            return [], []
+
+        rids = [r.get_reservation_id() for r in reservations]
+
+        async def remove_all() -> List[bool]:
+            async with AsyncManagementClient(callback_topic=callback_topic, processor=self.get_processor(),
+                                             concurrency=concurrency, timeout=timeout) as client:
+                async def remove(rid: str) -> bool:
+                    print(f"Attempting to remove reservation: {rid}")
+                    try:
+                        result, error = await client.remove_reservation(actor_name=actor_name, rid=rid)
+                    except asyncio.TimeoutError:
+                        print(f"Timed out removing reservation: {rid}")
+                        return False
+                    except Exception as e:
+                        print(f"Failed to remove reservation: {rid} error: {e}")
+                        return False
+                    if not result:
+                        print(f"Failed to remove reservation: {rid}")
+                        self.print_result(status=error.get_status())
+                    return bool(result)
+
+                return await asyncio.gather(*[remove(rid) for rid in rids])
+
+        results = asyncio.run(remove_all())
+        removed = [rid for rid, result in zip(rids, results) if result]
+        failed = [rid for rid, result in zip(rids, results) if not result]
+        print(f"Removed {len(removed)} of {len(rids)} reservations; {len(failed)} failed")
+        return removed, failed
 
     def do_remove_slice(self, *, slice_id: str, actor_name: str, callback_topic: str,
                         id_token: str) -> Tuple[bool, Error]:
@@ -434,11 +536,120 @@ class ManageCommand(ShowCommand):
             self.logger.error(f"Exception occurred e: {e}")
             self.logger.error(traceback.format_exc())
 
-    def toggle_maintenance_mode(self, *, actor_name: str, callback_topic: str, state: str, projects: str = None,
-                                users: str = None, site_name: str = None, workers: str = None, deadline: str = None,
-                                expected_end: str = None, id_token: str = None):
+    def __am_delegations(self, *, broker: str, am: str, callback_topic: str, did: str = None,
+                         id_token: str = None) -> List[DelegationAvro]:
         """
-        Toggle Maintenance Mode
+        Get the delegations of an AM which belong to the broker and are neither failed nor closed
+        """
+        if did is not None:
+            dd = DelegationAvro()
+            dd.slice = SliceAvro()
+            dd.slice.slice_name = broker
+            dd.delegation_id = did
+            dd.state = DelegationState.Delegated.value
+            return [dd]
+
+        delegations, error = self.do_get_delegations(actor_name=am, callback_topic=callback_topic, did=did,
+                                                     id_token=id_token)
+        if delegations is None:
+            raise Exception(f"Error occurred while getting delegations: {error.get_status() if error else ''}")
+        return [d for d in delegations
+                if d.get_state() not in [DelegationState.Failed.value, DelegationState.Closed.value] and
+                d.get_slice_object().get_slice_name() == broker]
+
+    def do_transfer_am_delegations(self, *, broker: str, am: str, callback_topic: str, reclaim: bool,
+                                   did: str = None, id_token: str = None) -> dict:
+        """
+        Claim delegations from an AM to the Broker, or reclaim them from the Broker to the AM.
+        Reclaimed delegations are subsequently closed and removed on the Broker.
+        @param broker broker name
+        @param am am name
+        @param callback_topic callback topic
+        @param reclaim True to reclaim, False to claim
+        @param did delegation id
+        @param id_token id token
+        @return summary with the delegations found, transferred, closed and removed and any errors
+        """
+        summary = {'am': am, 'found': 0, 'transferred': [], 'closed': [], 'removed': [], 'errors': []}
+        am_actor = self.get_actor(actor_name=am)
+        if am_actor is None or self.get_actor(actor_name=broker) is None:
+            raise Exception(f"Invalid arguments am {am} or broker {broker} not found")
+
+        delegations = self.__am_delegations(broker=broker, am=am, callback_topic=callback_topic, did=did,
+                                            id_token=id_token)
+        summary['found'] = len(delegations)
+        for d in delegations:
+            dlg_id = d.get_delegation_id()
+            if reclaim:
+                delegation, error = self.do_reclaim_delegations(broker=broker, am_guid=am_actor.get_guid(),
+                                                                did=dlg_id, callback_topic=callback_topic,
+                                                                id_token=id_token)
+            else:
+                delegation, error = self.do_claim_delegations(broker=broker, am_guid=am_actor.get_guid(),
+                                                              did=dlg_id, callback_topic=callback_topic,
+                                                              id_token=id_token)
+            if delegation is None:
+                summary['errors'].append(f"{dlg_id}: {error.get_status() if error else 'failed'}")
+                continue
+            summary['transferred'].append(dlg_id)
+            if not reclaim:
+                continue
+
+            for key, op in [('closed', self.do_close_delegation), ('removed', self.do_remove_delegation)]:
+                status, error = op(actor_name=broker, did=dlg_id, callback_topic=callback_topic, id_token=id_token)
+                if not status:
+                    summary['errors'].append(f"{dlg_id}: {key[:-1]} failed "
+                                             f"{error.get_status() if error else ''}")
+                    break
+                summary[key].append(dlg_id)
+        return summary
+
+    def transfer_delegations_bulk(self, *, broker: str, ams: str, callback_topic: str, reclaim: bool,
+                                  did: str = None, id_token: str = None, concurrency: int = DEFAULT_CONCURRENCY):
+        """
+        Claim or reclaim delegations for several AMs concurrently and print a summary table
+        @param broker broker name
+        @param ams comma separated list of AM names or all for every AM in the configuration
+        @param callback_topic callback topic
+        @param reclaim True to reclaim, False to claim
+        @param did delegation id
+        @param id_token id token
+        @param concurrency maximum number of AMs processed in parallel
+        """
+        if ams.strip().lower() == "all":
+            am_names = self.get_actor_names(actor_type="authority")
+        else:
+            am_names = split_names(ams)
+
+        def transfer(am: str) -> dict:
+            return self.do_transfer_am_delegations(broker=broker, am=am, callback_topic=callback_topic,
+                                                   reclaim=reclaim, did=did, id_token=id_token)
+
+        results = run_concurrently(items=am_names, task=transfer, concurrency=concurrency)
+
+        action = "Reclaimed" if reclaim else "Claimed"
+        header = f"{'AM':<30} {'Found':>6} {action:>10}"
+        if reclaim:
+            header += f" {'Closed':>7} {'Removed':>8}"
+        print(f"{header} {'Errors':>7} {'Time':>8}")
+        failures = []
+        for r in results:
+            summary = r.result if r.succeeded() else {'am': r.key, 'found': 0, 'transferred': [], 'closed': [],
+                                                      'removed': [], 'errors': [str(r.error)]}
+            line = f"{r.key:<30} {summary['found']:>6} {len(summary['transferred']):>10}"
+            if reclaim:
+                line += f" {len(summary['closed']):>7} {len(summary['removed']):>8}"
+            print(f"{line} {len(summary['errors']):>7} {r.elapsed:>7.2f}s")
+            failures.extend([f"{r.key}: {e}" for e in summary['errors']])
+        for f in failures:
+            print(f"Error: {f}")
+
+    def do_toggle_maintenance_mode(self, *, actor_name: str, callback_topic: str, state: str, projects: str = None,
+                                   users: str = None, site_name: str = None, workers: str = None,
+                                   deadline: str = None, expected_end: str = None,
+                                   id_token: str = None) -> Tuple[bool, str]:
+        """
+        Toggle Maintenance Mode by invoking Management Actor Maintenance API
         @param actor_name actor name
         @param callback_topic callback topic
         @param state Maintenance State
@@ -449,6 +660,7 @@ class ManageCommand(ShowCommand):
         @param deadline start time for the Maintenance
         @param expected_end Expected End time for the Maintenance
         @param id_token id token
+        @return Tuple[bool, str] indicating success or failure status and error containing failure details
         """
         status = False
         error = ""
@@ -511,11 +723,82 @@ class ManageCommand(ShowCommand):
             self.logger.error(traceback.format_exc())
             error = str(e)
 
+        return status, error
+
+    def toggle_maintenance_mode(self, *, actor_name: str, callback_topic: str, state: str, projects: str = None,
+                                users: str = None, site_name: str = None, workers: str = None, deadline: str = None,
+                                expected_end: str = None, id_token: str = None):
+        """
+        Toggle Maintenance Mode
+        @param actor_name actor name
+        @param callback_topic callback topic
+        @param state Maintenance State
+        @param projects comma separated list of project_ids allowed in maintenance
+        @param users comma separated list of email address of the users allowed in maintenance
+        @param site_name site name
+        @param workers comma separated list of specific workers on a site which are in maintenance
+        @param deadline start time for the Maintenance
+        @param expected_end Expected End time for the Maintenance
+        @param id_token id token
+        """
+        status, error = self.do_toggle_maintenance_mode(actor_name=actor_name, callback_topic=callback_topic,
+                                                        state=state, projects=projects, users=users,
+                                                        site_name=site_name, workers=workers, deadline=deadline,
+                                                        expected_end=expected_end, id_token=id_token)
         if status:
             print(f"Maintenance mode successfully set to {state} on {actor_name}")
         else:
             print(f"Failure to set maintenance mode: [{state}]; Error: [{error}]")
 
+    def toggle_maintenance_mode_bulk(self, *, actor_names: str, callback_topic: str, state: str,
+                                     projects: str = None, users: str = None, site_name: str = None,
+                                     workers: str = None, deadline: str = None, expected_end: str = None,
+                                     id_token: str = None, concurrency: int = DEFAULT_CONCURRENCY,
+                                     format: str = 'text'):
+        """
+        Toggle Maintenance Mode on several actors concurrently and print an aggregated report
+        @param actor_names comma separated list of actor names
+        @param callback_topic callback topic
+        @param state Maintenance State
+        @param projects comma separated list of project_ids allowed in maintenance
+        @param users comma separated list of email address of the users allowed in maintenance
+        @param site_name site name
+        @param workers comma separated list of specific workers on a site which are in maintenance
+        @param deadline start time for the Maintenance
+        @param expected_end Expected End time for the Maintenance
+        @param id_token id token
+        @param concurrency maximum number of actors updated in parallel
+        @param format output format text or json
+        """
+        def toggle(actor_name: str):
+            return self.do_toggle_maintenance_mode(actor_name=actor_name, callback_topic=callback_topic,
+                                                   state=state, projects=projects, users=users,
+                                                   site_name=site_name, workers=workers, deadline=deadline,
+                                                   expected_end=expected_end, id_token=id_token)
+
+        results = run_concurrently(items=split_names(actor_names), task=toggle, concurrency=concurrency)
+
+        report = []
+        for r in results:
+            status, error = r.result if r.succeeded() else (False, str(r.error))
+            report.append({'actor': r.key, 'status': status, 'error': None if status else str(error),
+                           'elapsed': round(r.elapsed, 3)})
+
+        if format == 'text':
+            for r in report:
+                if r['status']:
+                    print(f"Maintenance mode successfully set to {state} on {r['actor']}")
+                else:
+                    print(f"Failure to set maintenance mode: [{state}] on {r['actor']}; Error: [{r['error']}]")
+        else:
+            succeeded = len([r for r in report if r['status']])
+            summary = {'mode': state,
+                       'site': site_name,
+                       'succeeded': succeeded,
+                       'failed': len(report) - succeeded,
+                       'actors': report}
+            print(json.dumps(summary, indent=4))
+
     def create_slice(self, *, actor_name: str, callback_topic: str, slice_id: str, slice_name: str):
         try:
             slices, error = self.do_get_slices(actor_name=actor_name, callback_topic=callback_topic, id_token=None,
@@ -541,36 +824,130 @@ class ManageCommand(ShowCommand):
             self.logger.error(f"Exception occurred e: {e}")
             self.logger.error(traceback.format_exc())
 
-    def delete_dead_slices(self, *, actor_name: str, callback_topic: str, id_token: str, email: str, slice_id: str = None):
+    def __fetch_dead_slice_reservations(self, *, slices: List[SliceAvro], actor_name: str, callback_topic: str,
+                                        id_token: str, work_queue: queue.Queue, stop: threading.Event,
+                                        checkpoint: Checkpoint):
+        """
+        Producer for delete_dead_slices; fetches reservations for each slice ahead of the removals
+        and hands them over via the work queue. A None item marks the end of the work.
+        """
+        try:
+            for s in slices:
+                if stop.is_set():
+                    break
+                state = SliceState(s.get_state())
+                if state not in [SliceState.Closing, SliceState.Dead]:
+                    continue
+                if checkpoint.is_done(kind='slice', item_id=s.get_slice_id()):
+                    continue
+                reservations, error = self.do_get_reservations(actor_name=actor_name, callback_topic=callback_topic,
+                                                               id_token=id_token, slice_id=s.get_slice_id())
+                item = (s, state, reservations)
+                while not stop.is_set():
+                    try:
+                        work_queue.put(item, timeout=1)
+                        break
+                    except queue.Full:
+                        continue
+        except Exception as e:
+            self.logger.error(f"Exception occurred while fetching reservations e: {e}")
+            self.logger.error(traceback.format_exc())
+        finally:
+            while not stop.is_set():
+                try:
+                    work_queue.put(None, timeout=1)
+                    break
+                except queue.Full:
+                    continue
+
+    def delete_dead_slices(self, *, actor_name: str, callback_topic: str, id_token: str, email: str, slice_id: str = None,
+                           concurrency: int = DEFAULT_CONCURRENCY, prefetch: int = 2, checkpoint: str = None):
+        """
+        Remove Closing/Dead slices along with their reservations.
+        Reservations for upcoming slices are fetched while reservations of the current slice are being removed,
+        removals are issued concurrently.
+        @param actor_name actor name
+        @param callback_topic callback topic
+        @param id_token identity token
+        @param email user email
+        @param slice_id slice id
+        @param concurrency maximum number of reservations removed in parallel
+        @param prefetch number of slices for which reservations are fetched ahead
+        @param checkpoint path to checkpoint file; completed slices/reservations recorded there are skipped
+        """
         try:
-            states = [SliceState.Closing.name, SliceState.Dead.name]
+            states = f"{SliceState.Closing.name}, {SliceState.Dead.name}"
             if slice_id is not None:
                 states = None
             slices, error = self.do_get_slices(actor_name=actor_name, callback_topic=callback_topic, id_token=id_token,
                                                email=email, slice_name=None, slice_id=slice_id, states=states)
 
-            if slices is not None:
-                for s in slices:
-                    state = SliceState(s.get_state())
-                    if state not in [SliceState.Closing, SliceState.Dead]:
-                        continue
+            if slices is None:
+                print("No Dead/closing slices to remove")
+                return
+
+            progress = Checkpoint(path=checkpoint)
+            if progress.count(kind='slice') > 0:
+                print(f"Resuming; skipping {progress.count(kind='slice')} slices already removed")
+
+            work_queue = queue.Queue(maxsize=max(1, prefetch))
+            stop = threading.Event()
+            producer = threading.Thread(target=self.__fetch_dead_slice_reservations, name="DeadSliceFetcher",
+                                        daemon=True,
+                                        kwargs={'slices': slices, 'actor_name': actor_name,
+                                                'callback_topic': callback_topic, 'id_token': id_token,
+                                                'work_queue': work_queue, 'stop': stop, 'checkpoint': progress})
+            producer.start()
+
+            def remove(rid: str):
+                result, error = self.do_remove_reservation(rid=rid, actor_name=actor_name,
+                                                           callback_topic=callback_topic, id_token=id_token)
+                if result:
+                    progress.mark_done(kind='reservation', item_id=rid)
+                return result, error
+
+            begin = time.time()
+            removed_slices = 0
+            removed_reservations = 0
+            failed_reservations = 0
+            try:
+                while True:
+                    item = work_queue.get()
+                    if item is None:
+                        break
+                    s, state, reservations = item
                     print(f"Attempting to remove reservations for slice {s.get_slice_id()} in state {state}")
-                    reservations, error = self.do_get_reservations(actor_name=actor_name, callback_topic=callback_topic,
-                                                                   id_token=id_token, slice_id=s.get_slice_id())
 
                     if reservations is None:
                         print(f"No reservations to remove for slice {s.get_slice_id()}")
                     else:
-                        for r in reservations:
-                            print(f"Attempting to remove reservation: {r.get_reservation_id()}")
-                            self.do_remove_reservation(rid=r.get_reservation_id(), actor_name=actor_name,
-                                                       callback_topic=callback_topic, id_token=id_token)
+                        rids = [r.get_reservation_id() for r in reservations
+                                if not progress.is_done(kind='reservation', item_id=r.get_reservation_id())]
+                        results = run_concurrently(items=rids, task=remove, concurrency=concurrency)
+                        for r in results:
+                            if r.succeeded() and r.result[0]:
+                                removed_reservations += 1
+                            else:
+                                failed_reservations += 1
+                                print(f"Failed to remove reservation: {r.key}")
 
                     print(f"Attempting to remove slice: {s.get_slice_id()}")
-                    self.remove_slice(slice_id=s.get_slice_id(), actor_name=actor_name,
-                                      callback_topic=callback_topic, id_token=id_token)
-            else:
-                print("No Dead/closing slices to remove")
+                    result, error = self.do_remove_slice(slice_id=s.get_slice_id(), actor_name=actor_name,
+                                                         callback_topic=callback_topic, id_token=id_token)
+                    print(result)
+                    if result:
+                        removed_slices += 1
+                        progress.mark_done(kind='slice', item_id=s.get_slice_id())
+                    else:
+                        self.print_result(status=error.get_status())
+
+                    elapsed = max(time.time() - begin, 0.001)
+                    print(f"Progress: removed {removed_slices} slices and {removed_reservations} reservations "
+                          f"({failed_reservations} failed) in {elapsed:.1f}s; "
+                          f"{removed_reservations / elapsed:.1f} reservations/s")
+            finally:
+                stop.set()
+                producer.join()
         except Exception as e:
             self.logger.error(f"Exception occurred e: {e}")
             self.logger.error(traceback.format_exc())
@@ -656,39 +1033,11 @@ class ManageCommand(ShowCommand):
             self.logger.error(f"Exception occurred e: {e}")
             self.logger.error(traceback.format_exc())
 
-    def __identify_inconsitent_sliver(self, first: Dict[str, ReservationMng], second: Dict[str, ReservationMng],
-                                      third: Dict[str, ReservationMng], first_allowed_states: list,
-                                      second_allowed_states: list, third_allowed_states: list,
-                                      first_name: str, second_name: str, third_name: str):
-        flag = False
-        for sid, sliver in first.items():
-            second_state = ReservationStates.Closed.value
-            third_state = ReservationStates.Closed.value
-            if sid in second:
-                second_state = second[sid].get_state()
-            if sid in third:
-                third_state = third[sid].get_state()
-
-            if sliver.get_state() in first_allowed_states and second_state in second_allowed_states and \
-                    third_state in third_allowed_states:
-                continue
-            else:
-                print(f"Sliver: {sliver.get_reservation_id()} Slice: {sliver.get_slice_id()} of "
-                      f"type: {sliver.get_resource_type()} is inconsistent "
-                      f"States: {ReservationStates(sliver.get_state())}/{first_name} "
-                      f"{ReservationStates(second_state)}/{second_name} {ReservationStates(third_state)}/{third_name}")
-                      #f" with Start: {self.time_string(milliseconds=sliver.get_start())} "
-                      #f"End: {self.time_string(milliseconds=sliver.get_end())} "
-                      #f"Requested End: {self.time_string(milliseconds=sliver.get_requested_end())}")
-                flag = True
-        if not flag:
-            print(f"No inconsistencies found between {first} {second} {third}!")
-
-    def do_audit(self, *, oc_name: str, br_name: str, am_name: str, site_name: str, slice_id: str,
-                 sliver_id: str, callback_topic: str, sliver_type: str):
-        if oc_name is None and br_name is None and am_name is None:
-            raise Exception(f"Invalid arguments; must specify at least two actors")
-
+    @staticmethod
+    def __audit_defaults(*, am_name: str, site_name: str, sliver_type: str) -> Tuple[str, str]:
+        """
+        Determine the site and sliver types to audit for an AM when not specified
+        """
         if site_name is None and "net" not in am_name and "al2s" not in am_name:
             site_name = am_name.split("-")[0].upper()
 
@@ -701,216 +1050,315 @@ class ManageCommand(ShowCommand):
                     sliver_type.removesuffix(",")
             else:
                 sliver_type = f"{NodeType.VM}"
+        return site_name, sliver_type
+
+    def __audit_fetch(self, *, actor_name: str, site_name: str, slice_id: str, sliver_id: str, callback_topic: str,
+                      sliver_type: str, states: str) -> List[ReservationMng]:
+        slivers, error = self.do_get_reservations(actor_name=actor_name, site=site_name,
+                                                  slice_id=slice_id, rid=sliver_id,
+                                                  callback_topic=callback_topic,
+                                                  type=sliver_type, states=states)
+        if slivers is None:
+            slivers = []
+            if error.get_status().get_code() != 0:
+                print("Status: {}".format(error.get_status()))
+        return slivers
+
+    def do_reconcile_audit(self, *, oc_name: str, br_name: str, am_name: str, site_name: str, slice_id: str,
+                           sliver_id: str, callback_topic: str, sliver_type: str,
+                           concurrency: int = DEFAULT_CONCURRENCY) -> Tuple[Dict[str, ReconcileResult], List[dict]]:
+        """
+        Fetch slivers from Orchestrator, Broker and AM(s) concurrently and reconcile them
+        @param oc_name orchestrator name
+        @param br_name broker name
+        @param am_name AM name; comma separated list of AM names to audit several sites
+        @param site_name site name; derived from the AM name if not specified
+        @param slice_id slice id
+        @param sliver_id sliver id
+        @param callback_topic callback topic
+        @param sliver_type sliver type(s)
+        @param concurrency maximum number of concurrent queries
+        @return reconcile result per AM, and details of each query
+        """
+        if oc_name is None and br_name is None and am_name is None:
+            raise Exception(f"Invalid arguments; must specify at least two actors")
+
+        am_names = split_names(am_name)
+        if len(am_names) > 1 and site_name is not None:
+            raise Exception(f"Invalid arguments; site can not be specified when auditing multiple AMs")
 
-        oc_slivers = []
-        br_slivers = []
-        am_slivers = []
         states = "ticketed, activeticketed, active, failed"
 
-        if oc_name is not None:
-            oc_slivers, error = self.do_get_reservations(actor_name=oc_name, site=site_name,
-                                                         slice_id=slice_id, rid=sliver_id,
-                                                         callback_topic=callback_topic,
-                                                         type=sliver_type, states=states)
-            if oc_slivers is None:
-                oc_slivers = []
-                if error.get_status().get_code() != 0:
-                    print("Status: {}".format(error.get_status()))
-
-        if br_name is not None:
-            br_slivers, error = self.do_get_reservations(actor_name=br_name, site=site_name,
-                                                         slice_id=slice_id, rid=sliver_id,
-                                                         callback_topic=callback_topic,
-                                                         type=sliver_type, states=states)
-            if br_slivers is None:
-                br_slivers = []
-                if error.get_status().get_code() != 0:
-                    print("Status: {}".format(error.get_status()))
-
-        if am_name is not None:
-            am_slivers, error = self.do_get_reservations(actor_name=am_name, site=site_name,
-                                                         slice_id=slice_id, rid=sliver_id,
-                                                         callback_topic=callback_topic,
-                                                         type=sliver_type, states=states)
-            if am_slivers is None:
-                am_slivers = []
-                if error.get_status().get_code() != 0:
-                    print("Status: {}".format(error.get_status()))
-
-        no_oc_slivers = len(oc_slivers)
-        no_br_slivers = len(br_slivers)
-        no_am_slivers = len(am_slivers)
-
-        oc_slivers_dict = {s.get_reservation_id(): s for s in oc_slivers}
-        br_slivers_dict = {s.get_reservation_id(): s for s in br_slivers}
-        am_slivers_dict = {s.get_reservation_id(): s for s in am_slivers}
-
-        if no_oc_slivers > 0 and no_oc_slivers >= no_br_slivers and no_oc_slivers >= no_am_slivers:
-            self.__identify_inconsitent_sliver(first=oc_slivers_dict, second=br_slivers_dict, third=am_slivers_dict,
-                                               first_allowed_states=[ReservationStates.Active.value,
-                                                                     ReservationStates.ActiveTicketed.value],
-                                               second_allowed_states=[ReservationStates.Ticketed.value],
-                                               third_allowed_states=[ReservationStates.Active.value,
-                                                                     ReservationStates.ActiveTicketed.value],
-                                               first_name=oc_name, second_name=br_name, third_name=am_name)
-
-        elif no_br_slivers > 0 and no_br_slivers >= no_oc_slivers and no_br_slivers >= no_am_slivers:
-            self.__identify_inconsitent_sliver(first=br_slivers_dict, second=oc_slivers_dict, third=am_slivers_dict,
-                                               first_allowed_states=[ReservationStates.Ticketed.value],
-                                               second_allowed_states=[ReservationStates.Active.value,
-                                                                      ReservationStates.ActiveTicketed.value],
-                                               third_allowed_states=[ReservationStates.Active.value,
-                                                                     ReservationStates.ActiveTicketed.value],
-                                               first_name=br_name, second_name=oc_name, third_name=am_name)
-
-        elif no_am_slivers > 0 and no_am_slivers >= no_oc_slivers and no_am_slivers >= no_br_slivers:
-            self.__identify_inconsitent_sliver(first=am_slivers_dict, second=br_slivers_dict, third=oc_slivers_dict,
-                                               first_allowed_states=[ReservationStates.Active.value,
-                                                                     ReservationStates.ActiveTicketed.value],
-                                               second_allowed_states=[ReservationStates.Ticketed.value],
-                                               third_allowed_states=[ReservationStates.Active.value,
-                                                                     ReservationStates.ActiveTicketed.value],
-                                               first_name=am_name, second_name=br_name, third_name=oc_name)
+        # One query per actor per site; OC and Broker queries are filtered by the AM's site
+        queries = []
+        for am in am_names:
+            am_site, am_type = self.__audit_defaults(am_name=am, site_name=site_name, sliver_type=sliver_type)
+            for role, actor_name in [('oc', oc_name), ('broker', br_name), ('am', am)]:
+                if actor_name is not None:
+                    queries.append((am, role, actor_name, am_site, am_type))
+
+        def fetch(query: tuple) -> List[ReservationMng]:
+            _, _, actor_name, q_site, q_type = query
+            return self.__audit_fetch(actor_name=actor_name, site_name=q_site, slice_id=slice_id,
+                                      sliver_id=sliver_id, callback_topic=callback_topic, sliver_type=q_type,
+                                      states=states)
+
+        slivers = {}
+        fetched = []
+        for r in run_concurrently(items=queries, task=fetch, concurrency=concurrency):
+            am, role, actor_name, q_site, _ = r.key
+            slivers[(am, role)] = r.result if r.succeeded() else []
+            fetched.append({'actor': actor_name, 'site': q_site, 'slivers': len(slivers[(am, role)]),
+                            'elapsed': round(r.elapsed, 3), 'error': str(r.error) if r.error is not None else None})
+
+        results = {}
+        for am in am_names:
+            sources = {}
+            allowed = []
+            for role, actor_name in [('oc', oc_name), ('broker', br_name), ('am', am)]:
+                if actor_name is not None:
+                    sources[actor_name] = {x.get_reservation_id(): x for x in slivers.get((am, role), [])}
+                    allowed.append(self.AUDIT_ALLOWED_STATES[role])
+
+            results[am] = reconcile(sources=sources,
+                                    state_of=lambda source, x: str(ReservationStates(x.get_state())),
+                                    is_consistent=lambda st: all(v in allowed[i] for i, v in enumerate(st)))
+        return results, fetched
+
+    def do_audit(self, *, oc_name: str, br_name: str, am_name: str, site_name: str, slice_id: str,
+                 sliver_id: str, callback_topic: str, sliver_type: str, concurrency: int = DEFAULT_CONCURRENCY,
+                 format: str = 'text'):
+        """
+        Audit sliver state across Orchestrator, Broker and AM(s)
+        Slivers are fetched from all the actors concurrently
+        @param oc_name orchestrator name
+        @param br_name broker name
+        @param am_name AM name; comma separated list of AM names to audit several sites
+        @param site_name site name; derived from the AM name if not specified
+        @param slice_id slice id
+        @param sliver_id sliver id
+        @param callback_topic callback topic
+        @param sliver_type sliver type(s)
+        @param concurrency maximum number of concurrent queries
+        @param format output format: text or json
+        """
+        results, fetched = self.do_reconcile_audit(oc_name=oc_name, br_name=br_name, am_name=am_name,
+                                                   site_name=site_name, slice_id=slice_id, sliver_id=sliver_id,
+                                                   callback_topic=callback_topic, sliver_type=sliver_type,
+                                                   concurrency=concurrency)
+        if format == 'json':
+            audits = []
+            for am, result in results.items():
+                audit = result.to_dict(describe=self.__describe_reservation)
+                audit['am'] = am
+                audits.append(audit)
+            print(json.dumps({'fetched': fetched, 'audits': audits}, indent=4))
+            return
+
+        for f in fetched:
+            if f['error'] is None:
+                print(f"Fetched {f['slivers']} slivers from {f['actor']} (site: {f['site']}) in {f['elapsed']:.2f}s")
+            else:
+                print(f"Failed to fetch slivers from {f['actor']} (site: {f['site']}) in {f['elapsed']:.2f}s: "
+                      f"{f['error']}")
+        for am, result in results.items():
+            if len(results) > 1:
+                print(f"Audit results for {am}:")
+            self.__print_audit(result=result)
+
+    def watch_audit(self, *, audit: Callable[[], Dict[str, ReconcileResult]], history: AuditHistory,
+                    interval: int = None, format: str = 'text', cycles: int = None):
+        """
+        Run an audit repeatedly, reporting only the inconsistencies which appeared or were resolved since the
+        previous audit; the audit results are persisted in the history after every cycle
+        @param audit callable performing a single audit, returning the reconcile result per audit key
+        @param history results of the previous audit
+        @param interval seconds between audits; None to audit once
+        @param format output format: text or json (one JSON document per line per audit)
+        @param cycles maximum number of audits; None to run until interrupted
+        """
+        cycle = 0
+        try:
+            while True:
+                begin = time.time()
+                results = audit()
+                now = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S %z")
+                for key, result in results.items():
+                    inconsistent = result.to_dict(describe=self.__describe_reservation)['inconsistent']
+                    appeared, resolved = history.update(key=key, inconsistent=inconsistent)
+                    if format == 'json':
+                        print(json.dumps({'time': now, 'audit': key, 'total': result.total,
+                                          'inconsistent': len(inconsistent), 'appeared': appeared,
+                                          'resolved': resolved}), flush=True)
+                        continue
+                    for x in appeared:
+                        print(f"{now} {key} NEW: {self.__audit_entry_str(entry=x)}")
+                    for x in resolved:
+                        print(f"{now} {key} RESOLVED: {self.__audit_entry_str(entry=x)}")
+                    print(f"{now} {key}: {len(appeared)} new, {len(resolved)} resolved, "
+                          f"{len(inconsistent)} of {result.total} slivers inconsistent", flush=True)
+                history.save()
+                cycle += 1
+                if interval is None or (cycles is not None and cycle >= cycles):
+                    break
+                time.sleep(max(0.0, interval - (time.time() - begin)))
+        except KeyboardInterrupt:
+            pass
+
+    @staticmethod
+    def __audit_entry_str(*, entry: dict) -> str:
+        states = " ".join(f"{st if st is not None else 'Absent'}/{source}" for source, st in entry['states'].items())
+        return f"Sliver: {entry['sliver_id']} Slice: {entry.get('slice_id')} of type: {entry.get('type')} " \
+               f"name: {entry.get('name')} States: {states}"
+
+    @staticmethod
+    def __describe_reservation(audit: SliverAudit) -> dict:
+        sliver = audit.first()
+        if isinstance(sliver, ReservationMng):
+            name = sliver.get_sliver().get_name() if sliver.get_sliver() is not None else None
+            return {'slice_id': sliver.get_slice_id(), 'type': str(sliver.get_resource_type()), 'name': name}
+        # Service reported only by the infrastructure
+        return {'slice_id': None, 'type': sliver.service_type, 'name': sliver.name}
+
+    def __print_audit(self, *, result: ReconcileResult):
+        for a in result.inconsistent:
+            sliver = a.first()
+            states = " ".join(f"{st if st is not None else ReservationStates.Closed}/{result.sources[i]}"
+                              for i, st in enumerate(a.states))
+            print(f"Sliver: {sliver.get_reservation_id()} Slice: {sliver.get_slice_id()} of "
+                  f"type: {sliver.get_resource_type()} is inconsistent States: {states}")
+        if result.is_consistent():
+            print(f"No inconsistencies found between {' '.join(result.sources)}!")
         else:
-            print(f"No inconsistencies found between {oc_name} {br_name} {am_name}!")
+            print(f"{len(result.inconsistent)} of {result.total} slivers are inconsistent")
 
     @staticmethod
     def extract_guid(*, string):
-        import re
-        uuid_regex = r"[0-9a-f]{8}-([0-9a-f]{4}-){3}[0-9a-f]{12}"
-        match = re.search(uuid_regex, string)
-        if match:
-            return str(match.group(0))
-        else:
-            return string
+        return extract_guid(string)
 
-    def do_get_net_services(self):
+    def do_get_net_services(self, *, sliver_type: str = None) -> ServiceIndex or None:
+        """
+        Fetch the services provisioned on NSO
+        @param sliver_type comma separated sliver types; only the NSO service packages provisioning these types are
+                           fetched (concurrently); all services are fetched if None
+        @return services indexed by reservation GUID and service type; None in case of failure
+        """
         from fabric_mgmt_cli.managecli.net.commands import NetCommand
         net_cmd = NetCommand()
-        net_cmd.get_services(None, None)
-        if net_cmd._res is not None:
-            new = dict()
-            for k, v in net_cmd._res.items():
-                if isinstance(v, dict):
-                    for l, w in v.items():
-                        if not isinstance(w, list):
-                            continue
-                        for d in w:
-                            if isinstance(d, dict) and "name" in d:
-                                guid = self.extract_guid(string=str(d['name']))
-                                new[guid] = d
-                                d['opts'] = l
-                elif isinstance(v, list):
-                    for d in v:
-                        if isinstance(d, dict) and "name" in d:
-                            guid = self.extract_guid(string=str(d['name']))
-                            new[guid] = d
-            return new
-        else:
-            self.logger.error(f"Error occurred while getting services: {net_cmd._code}")
-        return None
-
-    def do_audit_infra(self, *, am_name: str, site_name: str, slice_id: str, sliver_id: str, callback_topic: str,
-                       sliver_type: str):
+        try:
+            index = build_index(net_cmd.nso, services=services_for_types(sliver_type))
+        except Exception as e:
+            self.logger.error(f"Error occurred while getting services: {e}")
+            return None
+        finally:
+            net_cmd.nso.close()
+        if index is None:
+            self.logger.error(f"Error occurred while getting services")
+        return index
+
+    def do_reconcile_audit_infra(self, *, am_name: str, site_name: str, slice_id: str, sliver_id: str,
+                                 callback_topic: str, sliver_type: str) -> Tuple[ReconcileResult, Dict[str, dict]]:
+        """
+        Fetch AM slivers and the services provisioned on the infrastructure concurrently and reconcile them
+        @param am_name AM name
+        @param site_name site name; derived from the AM name if not specified
+        @param slice_id slice id
+        @param sliver_id sliver id
+        @param callback_topic callback topic
+        @param sliver_type sliver type(s)
+        @return reconcile result, and slivers from each source
+        """
         if am_name is None:
             raise Exception(f"Invalid arguments; must specify at least two actors")
 
-        if site_name is None and "net" not in am_name and "al2s" not in am_name:
-            site_name = am_name.split("-")[0].upper()
-
-        if sliver_type is None:
-            if "net" in am_name:
-                sliver_type = ""
-                for x in ServiceType:
-                    sliver_type += f"{x},"
-                if sliver_type != "":
-                    sliver_type.removesuffix(",")
-            else:
-                sliver_type = f"{NodeType.VM}"
-
-        am_slivers = []
-        if_slivers = {}
+        site_name, sliver_type = self.__audit_defaults(am_name=am_name, site_name=site_name, sliver_type=sliver_type)
         states = "ticketed, activeticketed, active, failed"
 
-        if am_name is not None:
-            am_slivers, error = self.do_get_reservations(actor_name=am_name, site=site_name,
-                                                         slice_id=slice_id, rid=sliver_id,
-                                                         callback_topic=callback_topic,
-                                                         type=sliver_type, states=states)
-            if am_slivers is None:
-                am_slivers = []
-                if error.get_status().get_code() != 0:
-                    print("Status: {}".format(error.get_status()))
-
-        if "net" in am_name:
-            if_slivers = self.do_get_net_services()
-            if if_slivers is None:
-                if_slivers = {}
-
-        am_slivers_dict = {s.get_reservation_id(): s for s in am_slivers}
-        print(f"# of slivers reported by Infrastructure: {len(if_slivers)}")
-        print(f"# of slivers reported by AM: {len(am_slivers_dict)}")
-
-        cf_only_slivers = set(am_slivers_dict.keys()) - set(if_slivers.keys())
-        if len(am_slivers_dict) == len(if_slivers):
-            for sid, sliver in am_slivers_dict.items():
-                sliver_state = ReservationStates(sliver.get_state())
-                sliver_pending_state = ReservationPendingStates(sliver.get_pending_state())
-                if isinstance(sliver, ReservationMng):
-                    if sliver.get_sliver() is not None:
-                        sliver_name = sliver.get_sliver().get_name()
-                else:
-                    sliver_name = sliver.get_name()
-
-                msg = f"--service {str(sliver.get_resource_type()).lower()}  --name " \
-                      f"{sliver_name}-{sliver.get_reservation_id()} of Slice: {sliver.get_slice_id()} "\
-                      f" is inconsistent (cf_state/if_state): ({sliver_state}-{sliver_pending_state}/"
-                if sliver_state == ReservationStates.Active and \
-                        sliver_pending_state != ReservationPendingStates.Closing and \
-                        sid in if_slivers:
-                    continue
-                else:
-                    if sid in if_slivers:
-                            msg += f"Provisioned)"
-                    else:
-                        if sliver_pending_state == ReservationPendingStates.Closing:
-                            continue
-                        msg += f"Not Provisioned)"
-                    print(msg)
+        def fetch(source: str):
+            if source == self.INFRA_SOURCE:
+                if_slivers = self.do_get_net_services(sliver_type=sliver_type)
+                return if_slivers.by_guid if if_slivers is not None else {}
+            am_slivers = self.__audit_fetch(actor_name=am_name, site_name=site_name, slice_id=slice_id,
+                                            sliver_id=sliver_id, callback_topic=callback_topic,
+                                            sliver_type=sliver_type, states=states)
+            return {x.get_reservation_id(): x for x in am_slivers}
+
+        names = [am_name, self.INFRA_SOURCE] if "net" in am_name else [am_name]
+        sources = {}
+        for r in run_concurrently(items=names, task=fetch, concurrency=len(names)):
+            if not r.succeeded():
+                raise r.error
+            sources[r.key] = r.result
+        sources.setdefault(self.INFRA_SOURCE, {})
+
+        result = reconcile(sources=sources, state_of=self.__infra_state, is_consistent=self.__infra_consistent)
+        return result, sources
+
+    def do_audit_infra(self, *, am_name: str, site_name: str, slice_id: str, sliver_id: str, callback_topic: str,
+                       sliver_type: str, format: str = 'text'):
+        """
+        Audit AM sliver state against the services provisioned on the infrastructure
+        @param am_name AM name
+        @param site_name site name; derived from the AM name if not specified
+        @param slice_id slice id
+        @param sliver_id sliver id
+        @param callback_topic callback topic
+        @param sliver_type sliver type(s)
+        @param format output format: text or json
+        """
+        result, sources = self.do_reconcile_audit_infra(am_name=am_name, site_name=site_name, slice_id=slice_id,
+                                                        sliver_id=sliver_id, callback_topic=callback_topic,
+                                                        sliver_type=sliver_type)
+        if format == 'json':
+            print(json.dumps(result.to_dict(describe=self.__describe_reservation), indent=4))
             return
-        else:
-            for name, if_sliver in if_slivers.items():
-                if if_sliver.get('opts'):
-                    if_sliver_type = if_sliver['opts'].split(":")[0].upper()
-                else:
-                    if_sliver_type = ""
-                msg = f"--service {if_sliver_type.lower()} --name {if_sliver['name']} " \
-                      f"is inconsistent (if_state/cf_state): (Provisioned/"
-                if name in am_slivers_dict and am_slivers_dict[name].get_state() == ReservationStates.Active.value:
-                    continue
-                else:
-                    if name in am_slivers_dict:
-                        msg += f"{ReservationStates(am_slivers_dict[name].get_state())})"
-                    else:
-                        msg += f"Closed)"
-                    print(msg)
-        for sid in cf_only_slivers:
-            sliver = am_slivers_dict.get(sid)
-            sliver_state = ReservationStates(sliver.get_state())
-            sliver_pending_state = ReservationPendingStates(sliver.get_pending_state())
-            if sliver_pending_state == ReservationPendingStates.Closing:
-                continue
-            print(f"Sliver state inconsistencies between CF DB and NSO - These are not leaks and no action is needed!")
-            if isinstance(sliver, ReservationMng):
-                if sliver.get_sliver() is not None:
-                    sliver_name = sliver.get_sliver().get_name()
+
+        print(f"# of slivers reported by Infrastructure: {len(sources[self.INFRA_SOURCE])}")
+        print(f"# of slivers reported by AM: {len(sources[am_name])}")
+
+        cf_only = []
+        for a in result.inconsistent:
+            am_state, if_state = a.states
+            am_sliver, if_sliver = a.objects
+            if am_sliver is None:
+                print(f"--service {if_sliver.service_type} --name {if_sliver.name} "
+                      f"is inconsistent (if_state/cf_state): (Provisioned/{ReservationStates.Closed})")
+            elif if_sliver is None:
+                cf_only.append(a)
             else:
-                sliver_name = sliver.get_name()
+                print(self.__infra_message(sliver=am_sliver, am_state=am_state, if_state=if_state))
+
+        if len(cf_only) > 0:
+            print(f"Sliver state inconsistencies between CF DB and NSO - These are not leaks and no action is needed!")
+        for a in cf_only:
+            print(self.__infra_message(sliver=a.objects[0], am_state=a.states[0], if_state="Not Provisioned"))
+
+    def __infra_state(self, source: str, sliver) -> str:
+        if source == self.INFRA_SOURCE:
+            return "Provisioned"
+        state = str(ReservationStates(sliver.get_state()))
+        pending_state = ReservationPendingStates(sliver.get_pending_state())
+        if pending_state != ReservationPendingStates.None_:
+            state += f"-{pending_state}"
+        return state
+
+    @staticmethod
+    def __infra_consistent(states: Tuple[str or None, str or None]) -> bool:
+        am_state, if_state = states
+        if am_state is None:
+            return False
+        closing = am_state.endswith(f"-{ReservationPendingStates.Closing}")
+        if if_state is None:
+            # Slivers being closed are expected to be gone from the infrastructure
+            return closing
+        return am_state.split("-")[0] == str(ReservationStates.Active) and not closing
 
-            msg = f"--service {str(sliver.get_resource_type()).lower()}  --name " \
-                  f"{sliver_name}-{sliver.get_reservation_id()} of Slice: {sliver.get_slice_id()} " \
-                  f" is inconsistent (cf_state/if_state): ({sliver_state}/Not Provisioned)"
-            print(msg)
+    @staticmethod
+    def __infra_message(*, sliver: ReservationMng, am_state: str, if_state: str) -> str:
+        sliver_name = sliver.get_sliver().get_name() if sliver.get_sliver() is not None else None
+        return f"--service {str(sliver.get_resource_type()).lower()}  --name " \
+               f"{sliver_name}-{sliver.get_reservation_id()} of Slice: {sliver.get_slice_id()} " \
+               f" is inconsistent (cf_state/if_state): ({am_state}/{if_state})"
 
     def __validate_lease_end_time(self, lease_end_time: str) -> datetime:
         """
@@ -932,21 +1380,73 @@ class ManageCommand(ShowCommand):
         if new_end_time <= now:
             raise Exception(f"New term end time {new_end_time} is in the past! ")
 
-        if (new_end_time - now) > Constants.DEFAULT_MAX_DURATION:
+        if (new_end_time - now) > self.MAX_LEASE_DURATION:
             self.logger.info(f"New term end time {new_end_time} exceeds system default "
-                             f"{Constants.DEFAULT_MAX_DURATION}, setting to system default: ")
+                             f"{self.MAX_LEASE_DURATION}, setting to system default: ")
 
-            new_end_time = now + Constants.DEFAULT_MAX_DURATION
+            new_end_time = now + self.MAX_LEASE_DURATION
 
         return new_end_time
 
-    def do_renew_slice(self, *, slice_id: str, actor_name: str, callback_topic: str, end_time: str) -> bool:
+    @staticmethod
+    def __renewable(*, reservation: ReservationMng) -> bool:
+        res_state = ReservationStates(reservation.get_state())
+        return res_state not in [ReservationStates.Closed, ReservationStates.Failed, ReservationStates.CloseWait]
+
+    @staticmethod
+    def __check_end_time(*, reservations: List[ReservationMng], new_end_time: datetime):
+        for r in reservations:
+            current_end_time = ActorClock.from_milliseconds(milli_seconds=r.get_end())
+            if new_end_time < current_end_time:
+                raise Exception(f"Attempted new term end time is shorter than current slice end time")
+
+    def __extend_reservations(self, *, actor_name: str, callback_topic: str, reservations: List[ReservationMng],
+                              new_end_time: datetime, concurrency: int) -> Dict[str, str]:
+        """
+        Extend reservations concurrently
+        @param actor_name actor name
+        @param callback_topic callback topic
+        @param reservations reservations to extend
+        @param new_end_time new end time
+        @param concurrency maximum number of extend requests in flight
+        @return reservation ids which failed to extend mapped to the error
+        """
+        def extend(r: ReservationMng) -> bool:
+            actor = self.get_actor(actor_name=actor_name)
+            actor.prepare(callback_topic=callback_topic)
+            self.logger.debug(f"Extending reservation with reservation# {r.get_reservation_id()}")
+            if not actor.extend_reservation(reservation=ID(uid=r.get_reservation_id()), new_end_time=new_end_time,
+                                            sliver=None):
+                raise Exception(actor.get_last_error())
+            return True
+
+        failed = {}
+        for r in run_concurrently(items=reservations, task=extend, concurrency=concurrency):
+            if not r.succeeded():
+                self.logger.error(f"Error: {r.error}")
+                failed[r.key.get_reservation_id()] = str(r.error)
+        return failed
+
+    def __update_lease_end(self, *, actor_name: str, callback_topic: str, slice_object: SliceAvro,
+                           new_end_time: datetime) -> bool:
+        actor = self.get_actor(actor_name=actor_name)
+        actor.prepare(callback_topic=callback_topic)
+        slice_object.set_lease_end(lease_end=new_end_time)
+        if not actor.update_slice(slice_obj=slice_object):
+            self.logger.error(f"Failed to update lease end time: {new_end_time} in Slice: {slice_object}")
+            self.logger.error(actor.get_last_error())
+            return False
+        return True
+
+    def do_renew_slice(self, *, slice_id: str, actor_name: str, callback_topic: str, end_time: str,
+                       concurrency: int = DEFAULT_CONCURRENCY) -> bool:
         """
         Renew slice by invoking Management Actor Renew reservations API
         @param slice_id slice id
         @param actor_name actor name
         @param callback_topic callback topic
         @param end_time end time
+        @param concurrency maximum number of reservations extended in parallel
         @return Tuple[bool, Error] indicating success or failure status and error containing failure details
         """
         actor = self.get_actor(actor_name=actor_name)
@@ -968,50 +1468,123 @@ class ManageCommand(ShowCommand):
         if slivers is None:
             raise Exception(f"Slivers for slice {slice_id} Not Found")
 
-        failed_to_extend_rid_list = []
-
-        actor.prepare(callback_topic=callback_topic)
-        for r in slivers:
-            res_state = ReservationStates(r.get_state())
-            if res_state == ReservationStates.Closed or res_state == ReservationStates.Failed or \
-                    res_state == ReservationStates.CloseWait:
-                continue
-
-            current_end_time = ActorClock.from_milliseconds(milli_seconds=r.get_end())
-
-            if new_end_time < current_end_time:
-                raise Exception(f"Attempted new term end time is shorter than current slice end time")
+        slivers = [r for r in slivers if self.__renewable(reservation=r)]
+        self.__check_end_time(reservations=slivers, new_end_time=new_end_time)
 
-            self.logger.debug(f"Extending reservation with reservation# {r.get_reservation_id()}")
-            result = actor.extend_reservation(reservation=ID(uid=r.get_reservation_id()),
-                                              new_end_time=new_end_time,
-                                              sliver=None)
-            if not result:
-                self.logger.error(f"Error: {actor.get_last_error()}")
-                failed_to_extend_rid_list.append(r.get_reservation_id())
+        failed_to_extend_rid_list = self.__extend_reservations(actor_name=actor_name, callback_topic=callback_topic,
+                                                               reservations=slivers, new_end_time=new_end_time,
+                                                               concurrency=concurrency)
 
         if len(failed_to_extend_rid_list) == 0:
-            slice_object.set_lease_end(lease_end=new_end_time)
-            if not actor.update_slice(slice_obj=slice_object):
-                self.logger.error(f"Failed to update lease end time: {new_end_time} in Slice: {slice_object}")
-                self.logger.error(actor.get_last_error())
+            self.__update_lease_end(actor_name=actor_name, callback_topic=callback_topic, slice_object=slice_object,
+                                    new_end_time=new_end_time)
 
         if len(failed_to_extend_rid_list) > 0:
-            raise Exception(f"Failed to extend reservation# {failed_to_extend_rid_list}")
+            raise Exception(f"Failed to extend reservation# {list(failed_to_extend_rid_list.keys())}")
 
         return True
 
-    def renew_slice(self, *, slice_id: str, actor_name: str, callback_topic: str, end_time: str):
+    def do_renew_slices_bulk(self, *, actor_name: str, callback_topic: str, end_time: str, projectid: str = None,
+                             email: str = None, states: str = None,
+                             concurrency: int = DEFAULT_CONCURRENCY) -> Dict[str, List[str]]:
         """
-        Close slice
+        Renew all slices matching the filters. Slices and reservations are each fetched in a single query and
+        the reservations of all the slices are extended concurrently.
+        @param actor_name actor name
+        @param callback_topic callback topic
+        @param end_time end time
+        @param projectid project id
+        @param email user email
+        @param states comma separated list of slice states; defaults to RENEWABLE_SLICE_STATES
+        @param concurrency maximum number of reservations extended in parallel
+        @return slice ids mapped to the errors encountered while renewing them; empty list for renewed slices;
+                slices without renewable reservations are skipped
+        """
+        new_end_time = self.__validate_lease_end_time(lease_end_time=end_time)
+
+        slices, error = self.do_get_slices(actor_name=actor_name, callback_topic=callback_topic, email=email,
+                                           states=states if states is not None else self.RENEWABLE_SLICE_STATES,
+                                           projectid=projectid)
+        if slices is None:
+            raise Exception(f"Failed to get slices: {error.get_status() if error else ''}")
+
+        # KafkaActor does not send the project to the actor, filter here
+        if projectid is not None:
+            slices = [s for s in slices if s.get_project_id() == projectid]
+
+        reservations, error = self.do_get_reservations(actor_name=actor_name, callback_topic=callback_topic,
+                                                       email=email, states=self.RENEWABLE_STATES)
+        if reservations is None:
+            reservations = []
+
+        slice_objects = {s.get_slice_id(): s for s in slices}
+        by_slice = {}
+        for r in reservations:
+            if r.get_slice_id() in slice_objects and self.__renewable(reservation=r):
+                by_slice.setdefault(r.get_slice_id(), []).append(r)
+
+        result = {}
+        to_extend = []
+        for sid, slivers in by_slice.items():
+            try:
+                self.__check_end_time(reservations=slivers, new_end_time=new_end_time)
+                result[sid] = []
+                to_extend.extend(slivers)
+            except Exception as e:
+                result[sid] = [str(e)]
+
+        print(f"Extending {len(to_extend)} reservations across {len(result)} slices")
+        failed = self.__extend_reservations(actor_name=actor_name, callback_topic=callback_topic,
+                                            reservations=to_extend, new_end_time=new_end_time,
+                                            concurrency=concurrency)
+        for r in to_extend:
+            if r.get_reservation_id() in failed:
+                result[r.get_slice_id()].append(f"Failed to extend reservation# {r.get_reservation_id()}: "
+                                                f"{failed[r.get_reservation_id()]}")
+
+        def update(sid: str) -> bool:
+            return self.__update_lease_end(actor_name=actor_name, callback_topic=callback_topic,
+                                           slice_object=slice_objects[sid], new_end_time=new_end_time)
+
+        extended = [sid for sid, errors in result.items() if len(errors) == 0]
+        for r in run_concurrently(items=extended, task=update, concurrency=concurrency):
+            if not r.succeeded() or not r.result:
+                result[r.key].append(f"Failed to update lease end time {r.error if r.error else ''}")
+        return result
+
+    def renew_slice(self, *, slice_id: str, actor_name: str, callback_topic: str, end_time: str,
+                    projectid: str = None, email: str = None, states: str = None,
+                    concurrency: int = DEFAULT_CONCURRENCY):
+        """
+        Renew slice or all slices matching the project, email or states
         @param slice_id slice id
         @param actor_name actor name
         @param callback_topic callback topic
         @param end_time end time
+        @param projectid project id
+        @param email user email
+        @param states comma separated list of slice states
+        @param concurrency maximum number of reservations extended in parallel
         """
+        if slice_id is None:
+            try:
+                result = self.do_renew_slices_bulk(actor_name=actor_name, callback_topic=callback_topic,
+                                                   end_time=end_time, projectid=projectid, email=email,
+                                                   states=states, concurrency=concurrency)
+                failed = {sid: errors for sid, errors in result.items() if len(errors) > 0}
+                print(f"Renewed {len(result) - len(failed)} of {len(result)} slices; {len(failed)} failed")
+                for sid, errors in failed.items():
+                    for e in errors:
+                        print(f"Failed to renew slice: {sid} error: {e}")
+            except Exception as e:
+                self.logger.error(f"Exception occurred e: {e}")
+                self.logger.error(traceback.format_exc())
+                print(f"Failed to renew slices error: {e}")
+            return
+
         try:
             self.do_renew_slice(slice_id=slice_id, actor_name=actor_name, callback_topic=callback_topic,
-                                end_time=end_time)
+                                end_time=end_time, concurrency=concurrency)
             print(f"Slice {slice_id} renewed successfully!")
         except Exception as e:
             self.logger.error(f"Exception occurred e: {e}")
@@ -25,20 +25,41 @@
 # Author: Komal Thareja (kthare10@renci.org)
 
 import os
+import sys
+
 import click
 
-from fabric_mgmt_cli.managecli.kafka_processor import KafkaProcessorSingleton
-from fabric_mgmt_cli.managecli.manage_command import ManageCommand
-from fabric_mgmt_cli.managecli.show_command import ShowCommand
+from fabric_mgmt_cli.managecli.cache import QueryCache
+from fabric_mgmt_cli.managecli.daemon import ManagementDaemon, DaemonClient
+from fabric_mgmt_cli.managecli.parallel import DEFAULT_CONCURRENCY
+from fabric_mgmt_cli.managecli.profiling import PROFILER
+from fabric_mgmt_cli.managecli.reconcile import AuditHistory
 from fabric_mgmt_cli.managecli.net import commands as netcommands
 import traceback
 
+# Kafka, FIM and Avro modules take most of a second to import; they are imported by the
+# commands which need them so that --help, net and daemon commands start quickly
+
 @click.group()
 @click.option('-v', '--verbose', is_flag=True)
+@click.option('--profile', is_flag=True, default=False, help='Print a timing breakdown to stderr when done')
+@click.option('--profile-json', 'profile_json', default=None,
+              help='Append the timing breakdown of this run as a JSON line to this file')
 @click.pass_context
-def managecli(ctx, verbose):
+def managecli(ctx, verbose, profile, profile_json):
     ctx.ensure_object(dict)
     ctx.obj['VERBOSE'] = verbose
+    if profile or profile_json is not None:
+        PROFILER.enable()
+        command = " ".join(sys.argv[1:])
+
+        def finish():
+            PROFILER.disable()
+            if profile:
+                PROFILER.report()
+            if profile_json is not None:
+                PROFILER.export(path=profile_json, command=command)
+        ctx.call_on_close(finish)
 
 
 @click.group()
@@ -59,15 +80,20 @@ def slices(ctx):
 @click.option('--projectid', help='Project Id', required=False, default=None)
 @click.option('--idtoken', default=None, help='Fabric Identity Token', required=False)
 @click.option('--refreshtoken', default=None, help='Fabric Refresh Token', required=False)
+@click.option('--concurrency', default=DEFAULT_CONCURRENCY, type=int,
+              help='Maximum number of slices closed in parallel when closing by project', required=False)
 @click.pass_context
-def close(ctx, actor, sliceid, idtoken, refreshtoken, projectid):
+def close(ctx, actor, sliceid, idtoken, refreshtoken, projectid, concurrency):
     """ Closes slice for an actor
     """
+    from fabric_mgmt_cli.managecli.kafka_processor import KafkaProcessorSingleton
+    from fabric_mgmt_cli.managecli.manage_command import ManageCommand
     try:
         idtoken = KafkaProcessorSingleton.get().start(id_token=idtoken, refresh_token=refreshtoken, ignore_tokens=True)
         mgmt_command = ManageCommand(logger=KafkaProcessorSingleton.get().logger)
         mgmt_command.close_slice(slice_id=sliceid, actor_name=actor, projectid=projectid,
-                                 callback_topic=KafkaProcessorSingleton.get().get_callback_topic(), id_token=idtoken)
+                                 callback_topic=KafkaProcessorSingleton.get().get_callback_topic(), id_token=idtoken,
+                                 concurrency=concurrency)
         KafkaProcessorSingleton.get().stop()
     except Exception as e:
         # traceback.print_exc()
@@ -75,14 +101,25 @@ def close(ctx, actor, sliceid, idtoken, refreshtoken, projectid):
 
 
 @slices.command()
-@click.option('--sliceid', help='Slice Id', required=True)
+@click.option('--sliceid', help='Slice Id', required=False, default=None)
 @click.option('--actor', help='Actor Name', required=True)
 @click.option('--endtime', help='Number of Days to renew', required=True)
+@click.option('--projectid', help='Project Id; renews all matching slices', required=False, default=None)
+@click.option('--email', help='User Email; renews all matching slices', required=False, default=None)
+@click.option('--states', help='Comma separated list of slice states; renews all matching slices '
+                                '(default: active slice states)', required=False, default=None)
+@click.option('--concurrency', default=DEFAULT_CONCURRENCY, type=int,
+              help='Maximum number of reservations extended in parallel', required=False)
 @click.pass_context
-def renew(ctx, sliceid, actor, endtime):
+def renew(ctx, sliceid, actor, endtime, projectid, email, states, concurrency):
     """ Renews slice for an actor
     """
+    from fabric_mgmt_cli.managecli.kafka_processor import KafkaProcessorSingleton
+    from fabric_mgmt_cli.managecli.manage_command import ManageCommand
     try:
+        if sliceid is None and projectid is None and email is None and states is None:
+            raise Exception("Must specify either sliceid or one of projectid, email or states")
+
         from datetime import datetime
         from datetime import timezone
         from datetime import timedelta
@@ -93,7 +130,8 @@ def renew(ctx, sliceid, actor, endtime):
         KafkaProcessorSingleton.get().start(ignore_tokens=True)
         mgmt_command = ManageCommand(logger=KafkaProcessorSingleton.get().logger)
         mgmt_command.renew_slice(slice_id=sliceid, actor_name=actor, end_time=end_date,
-                                 callback_topic=KafkaProcessorSingleton.get().get_callback_topic())
+                                 callback_topic=KafkaProcessorSingleton.get().get_callback_topic(),
+                                 projectid=projectid, email=email, states=states, concurrency=concurrency)
         KafkaProcessorSingleton.get().stop()
     except Exception as e:
         # traceback.print_exc()
@@ -109,6 +147,8 @@ def renew(ctx, sliceid, actor, endtime):
 def remove(ctx, sliceid, actor, idtoken, refreshtoken):
     """ Removes slice for an actor
     """
+    from fabric_mgmt_cli.managecli.kafka_processor import KafkaProcessorSingleton
+    from fabric_mgmt_cli.managecli.manage_command import ManageCommand
     try:
         idtoken = KafkaProcessorSingleton.get().start(id_token=idtoken, refresh_token=refreshtoken, ignore_tokens=True)
         mgmt_command = ManageCommand(logger=KafkaProcessorSingleton.get().logger)
@@ -124,15 +164,25 @@ def remove(ctx, sliceid, actor, idtoken, refreshtoken):
 @click.option('--email', help='User Email', required=True)
 @click.option('--actor', help='Actor Name', required=True)
 @click.option('--sliceid', help='Slice Id', required=False)
+@click.option('--concurrency', default=DEFAULT_CONCURRENCY, type=int,
+              help='Maximum number of reservations removed in parallel', required=False)
+@click.option('--prefetch', default=2, type=int,
+              help='Number of slices for which reservations are fetched ahead of removal', required=False)
+@click.option('--checkpoint', default=None,
+              help='Checkpoint file; removed slices/reservations are recorded and skipped when re-run',
+              required=False)
 @click.pass_context
-def removealldead(ctx, email, actor, sliceid):
+def removealldead(ctx, email, actor, sliceid, concurrency, prefetch, checkpoint):
     """ Removes slice for an actor
     """
+    from fabric_mgmt_cli.managecli.kafka_processor import KafkaProcessorSingleton
+    from fabric_mgmt_cli.managecli.manage_command import ManageCommand
     try:
         idtoken = KafkaProcessorSingleton.get().start(ignore_tokens=True)
         mgmt_command = ManageCommand(logger=KafkaProcessorSingleton.get().logger)
         mgmt_command.delete_dead_slices(email=email, actor_name=actor, id_token=idtoken, slice_id=sliceid,
-                                        callback_topic=KafkaProcessorSingleton.get().get_callback_topic())
+                                        callback_topic=KafkaProcessorSingleton.get().get_callback_topic(),
+                                        concurrency=concurrency, prefetch=prefetch, checkpoint=checkpoint)
         KafkaProcessorSingleton.get().stop()
     except Exception as e:
         # traceback.print_exc()
@@ -149,17 +199,31 @@ def removealldead(ctx, email, actor, sliceid):
 @click.option('--states', help="Comma separated list of the states, possible values: "
                                "[nascent, configuring, stableok, stableerror, modifyok, modifyerror, closing, dead]",
               default=None, required=False)
-@click.option('--format', default='text', help='Output Format Type: text or json', required=False)
+@click.option('--format', default='text', help='Output Format Type: text, json or ndjson', required=False)
+@click.option('--offset', default=None, type=int, required=False,
+              help='Number of results to skip; applied locally after all results are fetched')
+@click.option('--limit', default=None, type=int, required=False,
+              help='Maximum number of results to print; applied locally after all results are fetched')
+@click.option('--cachettl', default=None, type=int, envvar='FABRIC_MGMT_CLI_CACHE_TTL',
+              help='Cache query results on disk for the given number of seconds and answer repeated or narrower '
+                   'queries from the cache', required=False)
+@click.option('--refresh', is_flag=True, default=False, help='Ignore cached results and query the actor',
+              required=False)
 @click.pass_context
-def query(ctx, actor, sliceid, slicename, idtoken, refreshtoken, email, states, format):
+def query(ctx, actor, sliceid, slicename, idtoken, refreshtoken, email, states, format, offset, limit, cachettl,
+          refresh):
     """ Get slice(s) from an actor
     """
+    from fabric_mgmt_cli.managecli.kafka_processor import KafkaProcessorSingleton
+    from fabric_mgmt_cli.managecli.show_command import ShowCommand
     try:
         idtoken = KafkaProcessorSingleton.get().start(id_token=idtoken, refresh_token=refreshtoken, ignore_tokens=True)
-        mgmt_command = ShowCommand(logger=KafkaProcessorSingleton.get().logger)
+        mgmt_command = ShowCommand(logger=KafkaProcessorSingleton.get().logger,
+                                   cache=QueryCache.create(ttl=cachettl, refresh=refresh,
+                                                           logger=KafkaProcessorSingleton.get().logger))
         mgmt_command.get_slices(actor_name=actor, callback_topic=KafkaProcessorSingleton.get().get_callback_topic(),
                                 slice_id=sliceid, slice_name=slicename, id_token=idtoken, email=email, states=states,
-                                format=format)
+                                format=format, offset=offset, limit=limit)
         KafkaProcessorSingleton.get().stop()
     except Exception as e:
         # traceback.print_exc()
@@ -174,6 +238,8 @@ def query(ctx, actor, sliceid, slicename, idtoken, refreshtoken, email, states,
 def create(ctx, actor, sliceid, slicename):
     """ Get slice(s) from an actor
     """
+    from fabric_mgmt_cli.managecli.kafka_processor import KafkaProcessorSingleton
+    from fabric_mgmt_cli.managecli.manage_command import ManageCommand
     try:
         idtoken = KafkaProcessorSingleton.get().start(ignore_tokens=True)
         mgmt_command = ManageCommand(logger=KafkaProcessorSingleton.get().logger)
@@ -207,6 +273,8 @@ def slivers(ctx):
 def close(ctx, sliverid, actor, idtoken, refreshtoken):
     """ Closes sliver for an actor
     """
+    from fabric_mgmt_cli.managecli.kafka_processor import KafkaProcessorSingleton
+    from fabric_mgmt_cli.managecli.manage_command import ManageCommand
     try:
         idtoken = KafkaProcessorSingleton.get().start(id_token=idtoken, refresh_token=refreshtoken, ignore_tokens=True)
         mgmt_command = ManageCommand(logger=KafkaProcessorSingleton.get().logger)
@@ -226,16 +294,23 @@ def close(ctx, sliverid, actor, idtoken, refreshtoken):
 @click.option('--states', default=None, help='Sliver State, Comma separated list of states, possible values: '
                                              '[nascent, ticketed, active, activeticketed, closed, closewait, '
                                              'failed, unknown, all]', required=False)
+@click.option('--concurrency', default=DEFAULT_CONCURRENCY, type=int,
+              help='Maximum number of slivers removed in parallel when removing by states', required=False)
+@click.option('--timeout', default=None, type=float, required=False,
+              help='Seconds to wait for each removal when removing by states; by default the actor API timeout')
 @click.pass_context
-def remove(ctx, sliverid, actor, idtoken, refreshtoken, states):
+def remove(ctx, sliverid, actor, idtoken, refreshtoken, states, concurrency, timeout):
     """ Removes sliver for an actor
     """
+    from fabric_mgmt_cli.managecli.kafka_processor import KafkaProcessorSingleton
+    from fabric_mgmt_cli.managecli.manage_command import ManageCommand
     try:
         idtoken = KafkaProcessorSingleton.get().start(id_token=idtoken, refresh_token=refreshtoken, ignore_tokens=True)
         mgmt_command = ManageCommand(logger=KafkaProcessorSingleton.get().logger)
         mgmt_command.remove_reservation(rid=sliverid, actor_name=actor,
                                         callback_topic=KafkaProcessorSingleton.get().get_callback_topic(),
-                                        id_token=idtoken, states=states)
+                                        id_token=idtoken, states=states, concurrency=concurrency,
+                                        timeout=timeout)
         KafkaProcessorSingleton.get().stop()
     except Exception as e:
         # traceback.print_exc()
@@ -260,22 +335,38 @@ def remove(ctx, sliverid, actor, idtoken, refreshtoken, states):
                    '[VM, L2Bridge, L2STS, L2PTP, FABNetv4, FABNetv6, FABNetv4Ext, FABNetv6Ext, PortMirror, Facility, '
                    'L3VPN]',
               required=False)
-@click.option('--format', default='text', help='Output Format Type: text or json', required=False)
-@click.option('--fields', default=None, help='Comma separated list of fields to be displayed', required=False)
+@click.option('--format', default='text', help='Output Format Type: text, json or ndjson (one JSON document per line)',
+              required=False)
+@click.option('--fields', default=None, required=False,
+              help='Comma separated list of fields to be displayed; slivers are only decoded if sliver is listed')
 @click.option('--include_ansible', default=None, help='Print ansible commands to attach components', required=False)
+@click.option('--offset', default=None, type=int, required=False,
+              help='Number of results to skip; applied locally after all results are fetched')
+@click.option('--limit', default=None, type=int, required=False,
+              help='Maximum number of results to print; applied locally after all results are fetched')
+@click.option('--cachettl', default=None, type=int, envvar='FABRIC_MGMT_CLI_CACHE_TTL',
+              help='Cache query results on disk for the given number of seconds and answer repeated or narrower '
+                   'queries from the cache', required=False)
+@click.option('--refresh', is_flag=True, default=False, help='Ignore cached results and query the actor',
+              required=False)
 @click.pass_context
 def query(ctx, actor, sliceid, sliverid, states, idtoken, refreshtoken, email, site, host, ip_subnet,
-          type, format, fields, include_ansible):
+          type, format, fields, include_ansible, offset, limit, cachettl, refresh):
     """ Get sliver(s) from an actor
     """
+    from fabric_mgmt_cli.managecli.kafka_processor import KafkaProcessorSingleton
+    from fabric_mgmt_cli.managecli.show_command import ShowCommand
     try:
         idtoken = KafkaProcessorSingleton.get().start(id_token=idtoken, refresh_token=refreshtoken, ignore_tokens=True)
-        mgmt_command = ShowCommand(logger=KafkaProcessorSingleton.get().logger)
+        mgmt_command = ShowCommand(logger=KafkaProcessorSingleton.get().logger,
+                                   cache=QueryCache.create(ttl=cachettl, refresh=refresh,
+                                                           logger=KafkaProcessorSingleton.get().logger))
         mgmt_command.get_reservations(actor_name=actor,
                                       callback_topic=KafkaProcessorSingleton.get().get_callback_topic(),
                                       slice_id=sliceid, rid=sliverid, states=states, id_token=idtoken, email=email,
                                       site=site, type=type, format=format, fields=fields,
-                                      include_ansible=include_ansible, host=host, ip_subnet=ip_subnet)
+                                      include_ansible=include_ansible, host=host, ip_subnet=ip_subnet,
+                                      offset=offset, limit=limit)
         KafkaProcessorSingleton.get().stop()
     except Exception as e:
         # traceback.print_exc()
@@ -296,20 +387,30 @@ def delegations(ctx):
 
 @delegations.command()
 @click.option('--broker', help='Broker Name', required=True)
-@click.option('--am', help='AM Name', required=True)
+@click.option('--am', help='AM Name, comma separated list of AM Names or all', required=True)
 @click.option('--did', default=None, help='Delegation Id', required=False)
+@click.option('--concurrency', default=DEFAULT_CONCURRENCY, type=int,
+              help='Maximum number of AMs processed in parallel', required=False)
 @click.option('--idtoken', default=None, help='Fabric Identity Token', required=False)
 @click.option('--refreshtoken', default=None, help='Fabric Refresh Token', required=False)
 @click.pass_context
-def claim(ctx, broker: str, am: str, did: str, idtoken, refreshtoken):
+def claim(ctx, broker: str, am: str, did: str, concurrency: int, idtoken, refreshtoken):
     """ Claim delegation(s) from AM to Broker
     """
+    from fabric_mgmt_cli.managecli.kafka_processor import KafkaProcessorSingleton
+    from fabric_mgmt_cli.managecli.manage_command import ManageCommand
     try:
         idtoken = KafkaProcessorSingleton.get().start(id_token=idtoken, refresh_token=refreshtoken, ignore_tokens=True)
         mgmt_command = ManageCommand(logger=KafkaProcessorSingleton.get().logger)
-        mgmt_command.claim_delegations(broker=broker, am=am,
-                                       callback_topic=KafkaProcessorSingleton.get().get_callback_topic(),
-                                       did=did, id_token=idtoken)
+        if am.strip().lower() == "all" or "," in am:
+            mgmt_command.transfer_delegations_bulk(broker=broker, ams=am,
+                                                   callback_topic=KafkaProcessorSingleton.get().get_callback_topic(),
+                                                   reclaim=False, did=did, id_token=idtoken,
+                                                   concurrency=concurrency)
+        else:
+            mgmt_command.claim_delegations(broker=broker, am=am,
+                                           callback_topic=KafkaProcessorSingleton.get().get_callback_topic(),
+                                           did=did, id_token=idtoken)
         KafkaProcessorSingleton.get().stop()
     except Exception as e:
         # traceback.print_exc()
@@ -318,20 +419,30 @@ def claim(ctx, broker: str, am: str, did: str, idtoken, refreshtoken):
 
 @delegations.command()
 @click.option('--broker', help='Broker Name', required=True)
-@click.option('--am', help='AM Name', required=True)
+@click.option('--am', help='AM Name, comma separated list of AM Names or all', required=True)
 @click.option('--did', default=None, help='Delegation Id', required=False)
+@click.option('--concurrency', default=DEFAULT_CONCURRENCY, type=int,
+              help='Maximum number of AMs processed in parallel', required=False)
 @click.option('--idtoken', default=None, help='Fabric Identity Token', required=False)
 @click.option('--refreshtoken', default=None, help='Fabric Refresh Token', required=False)
 @click.pass_context
-def reclaim(ctx, broker: str, am: str, did: str, idtoken, refreshtoken):
+def reclaim(ctx, broker: str, am: str, did: str, concurrency: int, idtoken, refreshtoken):
     """ Reclaim delegation(s) from Broker to AM
     """
+    from fabric_mgmt_cli.managecli.kafka_processor import KafkaProcessorSingleton
+    from fabric_mgmt_cli.managecli.manage_command import ManageCommand
     try:
         idtoken = KafkaProcessorSingleton.get().start(id_token=idtoken, refresh_token=refreshtoken, ignore_tokens=True)
         mgmt_command = ManageCommand(logger=KafkaProcessorSingleton.get().logger)
-        mgmt_command.reclaim_delegations(broker=broker, am=am,
-                                         callback_topic=KafkaProcessorSingleton.get().get_callback_topic(),
-                                         did=did, id_token=idtoken)
+        if am.strip().lower() == "all" or "," in am:
+            mgmt_command.transfer_delegations_bulk(broker=broker, ams=am,
+                                                   callback_topic=KafkaProcessorSingleton.get().get_callback_topic(),
+                                                   reclaim=True, did=did, id_token=idtoken,
+                                                   concurrency=concurrency)
+        else:
+            mgmt_command.reclaim_delegations(broker=broker, am=am,
+                                             callback_topic=KafkaProcessorSingleton.get().get_callback_topic(),
+                                             did=did, id_token=idtoken)
         KafkaProcessorSingleton.get().stop()
     except Exception as e:
         # traceback.print_exc()
@@ -353,6 +464,8 @@ def reclaim(ctx, broker: str, am: str, did: str, idtoken, refreshtoken):
 def query(ctx, actor, sliceid, did, states, idtoken, refreshtoken, format):
     """ Get delegation(s) from an actor
     """
+    from fabric_mgmt_cli.managecli.kafka_processor import KafkaProcessorSingleton
+    from fabric_mgmt_cli.managecli.show_command import ShowCommand
     try:
         idtoken = KafkaProcessorSingleton.get().start(id_token=idtoken, refresh_token=refreshtoken, ignore_tokens=True)
         mgmt_command = ShowCommand(logger=KafkaProcessorSingleton.get().logger)
@@ -374,6 +487,8 @@ def query(ctx, actor, sliceid, did, states, idtoken, refreshtoken, format):
 def close(ctx, did, actor, idtoken, refreshtoken):
     """ Closes delegation for an actor
     """
+    from fabric_mgmt_cli.managecli.kafka_processor import KafkaProcessorSingleton
+    from fabric_mgmt_cli.managecli.manage_command import ManageCommand
     try:
         idtoken = KafkaProcessorSingleton.get().start(id_token=idtoken, refresh_token=refreshtoken, ignore_tokens=True)
         mgmt_command = ManageCommand(logger=KafkaProcessorSingleton.get().logger)
@@ -395,6 +510,8 @@ def close(ctx, did, actor, idtoken, refreshtoken):
 def remove(ctx, did, actor, idtoken, refreshtoken):
     """ Removes delegations for an actor
     """
+    from fabric_mgmt_cli.managecli.kafka_processor import KafkaProcessorSingleton
+    from fabric_mgmt_cli.managecli.manage_command import ManageCommand
     try:
         idtoken = KafkaProcessorSingleton.get().start(id_token=idtoken, refresh_token=refreshtoken, ignore_tokens=True)
         mgmt_command = ManageCommand(logger=KafkaProcessorSingleton.get().logger)
@@ -435,22 +552,24 @@ def maintenance(ctx):
               required=False, default=None)
 @click.option('--idtoken', default=None, help='Fabric Identity Token', required=False)
 @click.option('--refreshtoken', default=None, help='Fabric Refresh Token', required=False)
+@click.option('--concurrency', default=DEFAULT_CONCURRENCY, type=int,
+              help='Maximum number of actors updated in parallel', required=False)
+@click.option('--format', default='text', help='Output Format Type: text or json', required=False)
 @click.pass_context
 def testbed(ctx, actors: str, mode: str, projects: str, users: str, deadline: str, end: str, idtoken: str,
-            refreshtoken: str):
+            refreshtoken: str, concurrency: int, format: str):
     """ Change Maintenance modes (PreMaint, Maint, Active) for the Testbed
     """
+    from fabric_mgmt_cli.managecli.kafka_processor import KafkaProcessorSingleton
+    from fabric_mgmt_cli.managecli.manage_command import ManageCommand
     try:
         idtoken = KafkaProcessorSingleton.get().start(id_token=idtoken, refresh_token=refreshtoken, ignore_tokens=True)
         mgmt_command = ManageCommand(logger=KafkaProcessorSingleton.get().logger)
-        actors = actors.strip()
-        actor_list = actors.split(",")
-        for actor in actor_list:
-            actor = actor.strip()
-            mgmt_command.toggle_maintenance_mode(actor_name=actor,
-                                                 callback_topic=KafkaProcessorSingleton.get().get_callback_topic(),
-                                                 state=mode, projects=projects, users=users, id_token=idtoken,
-                                                 deadline=deadline, expected_end=end)
+        mgmt_command.toggle_maintenance_mode_bulk(actor_names=actors,
+                                                  callback_topic=KafkaProcessorSingleton.get().get_callback_topic(),
+                                                  state=mode, projects=projects, users=users, id_token=idtoken,
+                                                  deadline=deadline, expected_end=end, concurrency=concurrency,
+                                                  format=format)
         KafkaProcessorSingleton.get().stop()
     except Exception as e:
         # traceback.print_exc()
@@ -476,22 +595,24 @@ def testbed(ctx, actors: str, mode: str, projects: str, users: str, deadline: st
               required=False, default=None)
 @click.option('--idtoken', default=None, help='Fabric Identity Token', required=False)
 @click.option('--refreshtoken', default=None, help='Fabric Refresh Token', required=False)
+@click.option('--concurrency', default=DEFAULT_CONCURRENCY, type=int,
+              help='Maximum number of actors updated in parallel', required=False)
+@click.option('--format', default='text', help='Output Format Type: text or json', required=False)
 @click.pass_context
 def site(ctx, actors: str, name: str, mode: str, projects, users, workers: str, deadline: str, end: str,
-         idtoken: str, refreshtoken: str):
+         idtoken: str, refreshtoken: str, concurrency: int, format: str):
     """ Change Maintenance modes (PreMaint, Maint, Active) for a specific Site or a specific worker
     """
+    from fabric_mgmt_cli.managecli.kafka_processor import KafkaProcessorSingleton
+    from fabric_mgmt_cli.managecli.manage_command import ManageCommand
     try:
         idtoken = KafkaProcessorSingleton.get().start(id_token=idtoken, refresh_token=refreshtoken, ignore_tokens=True)
         mgmt_command = ManageCommand(logger=KafkaProcessorSingleton.get().logger)
-        actors = actors.strip()
-        actor_list = actors.split(",")
-        for actor in actor_list:
-            actor = actor.strip()
-            mgmt_command.toggle_maintenance_mode(actor_name=actor,
-                                                 callback_topic=KafkaProcessorSingleton.get().get_callback_topic(),
-                                                 state=mode, projects=projects, users=users, expected_end=end,
-                                                 site_name=name, workers=workers, deadline=deadline, id_token=idtoken)
+        mgmt_command.toggle_maintenance_mode_bulk(actor_names=actors,
+                                                  callback_topic=KafkaProcessorSingleton.get().get_callback_topic(),
+                                                  state=mode, projects=projects, users=users, expected_end=end,
+                                                  site_name=name, workers=workers, deadline=deadline,
+                                                  id_token=idtoken, concurrency=concurrency, format=format)
 
         KafkaProcessorSingleton.get().stop()
     except Exception as e:
@@ -503,20 +624,20 @@ def site(ctx, actors: str, name: str, mode: str, projects, users, workers: str,
 @click.option('--actors', help='Comma separated list of Actor names', required=True)
 @click.option('--sites', help='Site Names, Comma separated list of the site names or ALL for entire testbed', required=False)
 @click.option('--format', default='text', help='Output Format Type: text or json', required=False)
+@click.option('--concurrency', default=DEFAULT_CONCURRENCY, type=int,
+              help='Maximum number of actors queried in parallel', required=False)
 @click.pass_context
-def query(ctx, actors: str, sites: str, format:str):
+def query(ctx, actors: str, sites: str, format: str, concurrency: int):
     """ Query Maintenance Status for Testbed/Site
     """
+    from fabric_mgmt_cli.managecli.kafka_processor import KafkaProcessorSingleton
+    from fabric_mgmt_cli.managecli.show_command import ShowCommand
     try:
         idtoken = KafkaProcessorSingleton.get().start(ignore_tokens=True)
         mgmt_command = ShowCommand(logger=KafkaProcessorSingleton.get().logger)
-        actors = actors.strip()
-        actor_list = actors.split(",")
-        for actor in actor_list:
-            actor = actor.strip()
-            mgmt_command.get_sites(actor_name=actor,
-                                   callback_topic=KafkaProcessorSingleton.get().get_callback_topic(),
-                                   sites=sites, format=format)
+        mgmt_command.get_sites_bulk(actor_names=actors,
+                                    callback_topic=KafkaProcessorSingleton.get().get_callback_topic(),
+                                    sites=sites, format=format, concurrency=concurrency)
 
         KafkaProcessorSingleton.get().stop()
     except Exception as e:
@@ -527,7 +648,7 @@ def query(ctx, actors: str, sites: str, format:str):
 @maintenance.command()
 @click.option('--oc', help='Orchestrator Name', required=True)
 @click.option('--broker', help='Broker Name', required=True)
-@click.option('--am', help='Am Name', required=True)
+@click.option('--am', help='Am Name; comma separated list of AM names to audit several sites', required=True)
 @click.option('--sliceid', help='Slice Id', required=False)
 @click.option('--sliverid', help='Sliver Id', required=False)
 @click.option('--site', help='Site Name', required=False)
@@ -536,16 +657,44 @@ def query(ctx, actors: str, sites: str, format:str):
                    '[VM, L2Bridge, L2STS, L2PTP, FABNetv4, FABNetv6, FABNetv4Ext, '
                    'FABNetv6Ext, PortMirror, Facility, L3VPN]',
               required=False)
+@click.option('--concurrency', default=DEFAULT_CONCURRENCY, type=int,
+              help='Maximum number of actor queries in flight', required=False)
+@click.option('--format', default='text', help='Output Format Type: text or json', required=False)
+@click.option('--watch', is_flag=True, default=False,
+              help='Audit repeatedly, reporting only newly appeared or resolved inconsistencies', required=False)
+@click.option('--interval', default=900, type=int, help='Seconds between audits in watch mode', required=False)
+@click.option('--statefile', default=None,
+              help='File persisting the previous audit results, defaults to ~/.fabric_mgmt_cli/audit_history.json; '
+                   'when specified without --watch, a single audit reports the changes since the previous run',
+              required=False)
 @click.pass_context
-def audit(ctx, oc: str, broker: str, am: str, sliceid: str, sliverid: str, site: str, type: str):
+def audit(ctx, oc: str, broker: str, am: str, sliceid: str, sliverid: str, site: str, type: str, concurrency: int,
+          format: str, watch: bool, interval: int, statefile: str):
     """ Audit Sliver state across various Control Framework actors, report discrepancies found.
     """
+    from fabric_mgmt_cli.managecli.kafka_processor import KafkaProcessorSingleton
+    from fabric_mgmt_cli.managecli.manage_command import ManageCommand
     try:
         KafkaProcessorSingleton.get().start(ignore_tokens=True)
         mgmt_command = ManageCommand(logger=KafkaProcessorSingleton.get().logger)
-        mgmt_command.do_audit(oc_name=oc, br_name=broker, am_name=am, slice_id=sliceid,
-                              sliver_id=sliverid, site_name=site, sliver_type=type,
-                              callback_topic=KafkaProcessorSingleton.get().get_callback_topic())
+        callback_topic = KafkaProcessorSingleton.get().get_callback_topic()
+        if watch or statefile is not None:
+            prefix = f"audit:{oc}:{broker}:{site}:{sliceid}:{sliverid}:{type}"
+
+            def run_audit():
+                results, fetched = mgmt_command.do_reconcile_audit(oc_name=oc, br_name=broker, am_name=am,
+                                                                   slice_id=sliceid, sliver_id=sliverid,
+                                                                   site_name=site, sliver_type=type,
+                                                                   callback_topic=callback_topic,
+                                                                   concurrency=concurrency)
+                return {f"{prefix}:{k}": v for k, v in results.items()}
+
+            mgmt_command.watch_audit(audit=run_audit, history=AuditHistory(path=statefile),
+                                     interval=interval if watch else None, format=format)
+        else:
+            mgmt_command.do_audit(oc_name=oc, br_name=broker, am_name=am, slice_id=sliceid,
+                                  sliver_id=sliverid, site_name=site, sliver_type=type,
+                                  callback_topic=callback_topic, concurrency=concurrency, format=format)
         KafkaProcessorSingleton.get().stop()
     except Exception as e:
         traceback.print_exc()
@@ -562,24 +711,114 @@ def audit(ctx, oc: str, broker: str, am: str, sliceid: str, sliverid: str, site:
                    '[VM, L2Bridge, L2STS, L2PTP, FABNetv4, FABNetv6, FABNetv4Ext, '
                    'FABNetv6Ext, PortMirror, Facility, L3VPN]',
               required=False)
+@click.option('--format', default='text', help='Output Format Type: text or json', required=False)
+@click.option('--watch', is_flag=True, default=False,
+              help='Audit repeatedly, reporting only newly appeared or resolved inconsistencies', required=False)
+@click.option('--interval', default=900, type=int, help='Seconds between audits in watch mode', required=False)
+@click.option('--statefile', default=None,
+              help='File persisting the previous audit results, defaults to ~/.fabric_mgmt_cli/audit_history.json; '
+                   'when specified without --watch, a single audit reports the changes since the previous run',
+              required=False)
 @click.pass_context
-def audit_infra(ctx, am: str, sliceid: str, sliverid: str, site: str, type: str):
+def audit_infra(ctx, am: str, sliceid: str, sliverid: str, site: str, type: str, format: str, watch: bool,
+                interval: int, statefile: str):
     """ Audit AM Sliver state against the underlying infrastructure, report discrepancies found.
     """
+    from fabric_mgmt_cli.managecli.kafka_processor import KafkaProcessorSingleton
+    from fabric_mgmt_cli.managecli.manage_command import ManageCommand
     try:
         KafkaProcessorSingleton.get().start(ignore_tokens=True)
         mgmt_command = ManageCommand(logger=KafkaProcessorSingleton.get().logger)
-        mgmt_command.do_audit_infra(am_name=am, slice_id=sliceid,
-                                    sliver_id=sliverid, site_name=site, sliver_type=type,
-                                    callback_topic=KafkaProcessorSingleton.get().get_callback_topic())
+        callback_topic = KafkaProcessorSingleton.get().get_callback_topic()
+        if watch or statefile is not None:
+            key = f"audit_infra:{am}:{site}:{sliceid}:{sliverid}:{type}"
+
+            def run_audit():
+                result, sources = mgmt_command.do_reconcile_audit_infra(am_name=am, slice_id=sliceid,
+                                                                        sliver_id=sliverid, site_name=site,
+                                                                        sliver_type=type,
+                                                                        callback_topic=callback_topic)
+                return {key: result}
+
+            mgmt_command.watch_audit(audit=run_audit, history=AuditHistory(path=statefile),
+                                     interval=interval if watch else None, format=format)
+        else:
+            mgmt_command.do_audit_infra(am_name=am, slice_id=sliceid,
+                                        sliver_id=sliverid, site_name=site, sliver_type=type,
+                                        callback_topic=callback_topic, format=format)
         KafkaProcessorSingleton.get().stop()
     except Exception as e:
         traceback.print_exc()
         click.echo('Error occurred: {}'.format(e))
 
 
+@click.group()
+@click.option('--socket', default=None, help='Unix socket path, defaults to FABRIC_MGMT_CLI_DAEMON_SOCKET or '
+                                             '~/.fabric_mgmt_cli/daemon/daemon.sock; CLI commands only use the '
+                                             'daemon on that socket, so start refuses any other path',
+              required=False)
+@click.pass_context
+def daemon(ctx, socket):
+    """ Persistent Management Shell serving CLI commands over a local socket
+    """
+    ctx.ensure_object(dict)
+    ctx.obj['SOCKET'] = socket
+    return
+
+
+@daemon.command()
+@click.pass_context
+def start(ctx):
+    """ Start the Management daemon in the foreground
+    """
+    config = os.getenv('FABRIC_MGMT_CLI_CONFIG_PATH')
+    if config is None or config == "":
+        ctx.fail('FABRIC_MGMT_CLI_CONFIG_PATH is not set')
+    try:
+        ManagementDaemon(socket_path=ctx.obj['SOCKET']).start()
+    except KeyboardInterrupt:
+        pass
+    except Exception as e:
+        click.echo('Error occurred: {}'.format(e))
+
+
+@daemon.command()
+@click.pass_context
+def stop(ctx):
+    """ Stop the Management daemon
+    """
+    if DaemonClient(socket_path=ctx.obj['SOCKET']).shutdown():
+        click.echo('Management daemon stopped')
+    else:
+        click.echo('Management daemon is not running')
+
+
+@daemon.command()
+@click.pass_context
+def status(ctx):
+    """ Check if the Management daemon is running
+    """
+    client = DaemonClient(socket_path=ctx.obj['SOCKET'])
+    if client.is_running():
+        click.echo(f'Management daemon is running on {client.socket_path}')
+    else:
+        click.echo('Management daemon is not running')
+
+
 managecli.add_command(slices)
 managecli.add_command(slivers)
 managecli.add_command(delegations)
 managecli.add_command(maintenance)
+managecli.add_command(daemon)
 managecli.add_command(netcommands.net)
+
+
+def main():
+    """
+    Console entry point; forwards the command to the Management daemon if one is running,
+    otherwise executes it in-process
+    """
+    exit_code = DaemonClient().forward(argv=sys.argv[1:])
+    if exit_code is not None:
+        sys.exit(exit_code)
+    managecli(obj={})
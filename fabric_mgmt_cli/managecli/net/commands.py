@@ -28,21 +28,32 @@ import os
 import click
 import json
 
-from fabric_mgmt_cli.managecli.config_processor import ConfigProcessor
 from fabric_mgmt_cli.managecli.net import services as NSOServices
-from .nso import NSOClient
-from .services import idipa, IDIPA_SERVICES
-from .resources import Inventory
+from .services import idipa, combine, IDIPA_SERVICES
+from .resources import Inventory, Manifest
+
+def _ok(code):
+    return code is not None and 200 <= code < 300
 
 class NetCommand:
     PATH = os.environ.get('FABRIC_MGMT_CLI_CONFIG_PATH', './config.yml')
 
     def __init__(self, dry_run=False):
+        # deferred so that loading the net commands does not pull in the
+        # configuration (fabric_cf/FIM) and HTTP client modules
+        from fabric_mgmt_cli.managecli.config_processor import ConfigProcessor
+        from .nso import NSOClient
         self.cfg = ConfigProcessor(path=self.PATH)
         self.cfg.process()
         self.nso = NSOClient(self.cfg.get_net_url(),
                              self.cfg.get_net_username(),
-                             self.cfg.get_net_password())
+                             self.cfg.get_net_password(),
+                             verify=self.cfg.get_net_validate_certs(),
+                             pool_size=self.cfg.get_net_pool_size(),
+                             connect_timeout=self.cfg.get_net_connect_timeout(),
+                             read_timeout=self.cfg.get_net_read_timeout(),
+                             retries=self.cfg.get_net_retries(),
+                             backoff=self.cfg.get_net_backoff())
         self._res = None
         self._code = None
         self._dry_run = dry_run
@@ -89,6 +100,35 @@ class NetCommand:
     def delete_service(self, service, name):
         self._res, self._code = self.nso.delete_service(service, name)
 
+    def create_services(self, services, chunk_size=50):
+        """ Create services in chunks, each chunk is one NSO transaction.
+            services is a list of lists, each inner list holds the NSO
+            services needed for one requested service (e.g. idipa + l2ptp).
+            If a chunk is rejected, its services are retried one at a time
+            to determine which of them failed.
+            Returns a list of (service, code, response) tuples
+        """
+        results = list()
+        for i in range(0, len(services), chunk_size):
+            chunk = services[i:i + chunk_size]
+            if self._dry_run:
+                results.extend([(s[-1], 0, combine(s)) for s in chunk])
+                continue
+            res, code = self._create_chunk(chunk)
+            if _ok(code) or len(chunk) == 1:
+                results.extend([(s[-1], code, res) for s in chunk])
+                continue
+            for s in chunk:
+                res, code = self._create_chunk([s])
+                results.append((s[-1], code, res))
+        return results
+
+    def _create_chunk(self, chunk):
+        try:
+            return self.nso.create_services([x for s in chunk for x in s])
+        except Exception as e:
+            return {"error": str(e)}, None
+
     def print_result(self, txt=None, verbose=False):
         if self._res == None:
             return
@@ -201,6 +241,58 @@ def create(ctx, inventory, epa, epz, service, name, dry_run):
     net_cmd.create_service(s)
     net_cmd.print_result(f"Created service {service}: {s.name}", True)
 
+@net.command(name='create-batch')
+@click.option('--inventory', default=None, help='Inventory file', required=True)
+@click.option('--manifest', default=None, help='Manifest file listing the services to create', required=True)
+@click.option('--chunk-size', default=50, type=int, help='Number of services per NSO transaction')
+@click.option('--dry-run', is_flag=True, help='Perform a dry run without configuring devices')
+@click.option('-v', '--verbose', is_flag=True)
+@click.pass_context
+def create_batch(ctx, inventory, manifest, chunk_size, dry_run, verbose):
+    """ Create the network services listed in a manifest
+    """
+    try:
+        inv = Inventory(inventory)
+        entries = Manifest(manifest).entries
+    except Exception as e:
+        print (f"Error in create-batch: {e}")
+        return
+    if chunk_size < 1:
+        print (f"Invalid chunk size: {chunk_size}")
+        return
+
+    services = list()
+    names = set()
+    failed = 0
+    for idx, e in enumerate(entries):
+        service = e.get("service")
+        try:
+            cls = getattr(NSOServices, service, None)
+            if not cls:
+                raise Exception(f"Unknown service {service}")
+            a = inv.resolve_resource(e.get("epa"))
+            z = inv.resolve_resource(e.get("epz")) if service != "l3rt" else None
+            s = cls(name=e.get("name"), epa=a, epz=z)
+            if (service, s.name) in names:
+                raise Exception(f"Duplicate service name {s.name}")
+            names.add((service, s.name))
+        except Exception as ex:
+            failed += 1
+            print (f"{service: <10} | {str(e.get('name')): <30} | entry {idx}: {ex}")
+            continue
+        group = [idipa(service, s.name), s] if service in IDIPA_SERVICES else [s]
+        services.append(group)
+
+    net_cmd = NetCommand(dry_run)
+    for s, code, res in net_cmd.create_services(services, chunk_size):
+        status = "OK" if dry_run or _ok(code) else "FAILED"
+        if status != "OK":
+            failed += 1
+        print (f"{s.service_str: <10} | {s.name: <30} | {status} ({code})")
+        if verbose or status != "OK":
+            print (json.dumps(res, sort_keys=True, indent=4))
+    print (f"Created {len(entries) - failed} of {len(entries)} services, {failed} failed")
+
 @net.command()
 @click.option('--service', default=None, help='Service', required=True)
 @click.option('--name', default=None, help='Service name to delete', required=True)
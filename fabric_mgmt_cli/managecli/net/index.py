@@ -0,0 +1,139 @@
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+from .util import CText
+
+
+cout = CText()
+
+GUID_PATTERN = re.compile(r"[0-9a-f]{8}-(?:[0-9a-f]{4}-){3}[0-9a-f]{12}")
+
+# NSO service packages provisioning each Control Framework sliver type
+SLIVER_TYPE_SERVICES = {
+    "l2ptp": ["l2ptp"],
+    "l2sts": ["l2sts"],
+    "l2bridge": ["l2bridge"],
+    "fabnetv4": ["l3rt"],
+    "fabnetv6": ["l3rt"],
+    "fabnetv4ext": ["l3rt"],
+    "fabnetv6ext": ["l3rt"],
+    "l3vpn": ["l3vpn"],
+    "portmirror": ["port-mirror"],
+}
+
+# Auxiliary services created alongside other services under the same name
+AUXILIARY_SERVICES = ["idipa"]
+
+
+def extract_guid(name):
+    """ Return the reservation GUID embedded in a service name, or the name itself """
+    match = GUID_PATTERN.search(name)
+    if match:
+        return match.group(0)
+    return name
+
+
+def services_for_types(sliver_types):
+    """ Map a comma separated list of sliver types to the NSO service packages
+        which provision them; types not provisioned via NSO are ignored.
+        Returns None if none of the types map to a service package
+    """
+    if not sliver_types:
+        return None
+    ret = list()
+    for t in sliver_types.split(","):
+        t = t.strip().lower()
+        if not t:
+            continue
+        for s in SLIVER_TYPE_SERVICES.get(t, []):
+            if s not in ret:
+                ret.append(s)
+    return ret if ret else None
+
+
+class ServiceEntry():
+    """ A single NSO service instance """
+    __slots__ = ("guid", "name", "service_type", "data")
+
+    def __init__(self, guid, name, service_type, data):
+        self.guid = guid
+        self.name = name
+        self.service_type = service_type
+        self.data = data
+
+    def __repr__(self):
+        return f"ServiceEntry({self.service_type}, {self.name})"
+
+
+class ServiceIndex():
+    """ NSO services indexed by reservation GUID and by service type """
+    def __init__(self):
+        self.by_guid = dict()
+        self.by_type = dict()
+
+    def __len__(self):
+        return len(self.by_guid)
+
+    def __contains__(self, guid):
+        return guid in self.by_guid
+
+    def get(self, guid):
+        return self.by_guid.get(guid)
+
+    def add(self, service_id, data):
+        """ Add a service; service_id is the RESTCONF list name e.g. l2ptp:l2ptp """
+        name = str(data["name"])
+        service_type = service_id.split(":")[0]
+        if service_type in AUXILIARY_SERVICES:
+            return
+        entry = ServiceEntry(extract_guid(name), name, service_type, data)
+        self.by_guid[entry.guid] = entry
+        self.by_type.setdefault(service_type, dict())[entry.guid] = entry
+
+    def load(self, res):
+        """ Index a RESTCONF services response; accepts both the full
+            tailf-ncs:services tree and a single service list
+        """
+        if not res:
+            return self
+        for k, v in res.items():
+            if isinstance(v, dict):
+                for sid, entries in v.items():
+                    self._load_list(sid, entries)
+            else:
+                self._load_list(k, v)
+        return self
+
+    def _load_list(self, service_id, entries):
+        if not isinstance(entries, list):
+            return
+        for d in entries:
+            if isinstance(d, dict) and "name" in d:
+                self.add(service_id, d)
+
+
+def build_index(nso, services=None, concurrency=4):
+    """ Fetch services from NSO and build the index. If a list of service
+        packages is given, each package is fetched concurrently, otherwise
+        the whole services tree is fetched at once.
+        Returns None if NSO could not be queried.
+    """
+    index = ServiceIndex()
+    if not services:
+        res, code = nso.services(None, None)
+        if code is None or code >= 300:
+            cout.error(f"Error occurred while getting services: {code}")
+            return None
+        return index.load(res)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(services)))) as executor:
+        responses = list(executor.map(lambda s: (s, nso.services(s, None)), services))
+    for s, (res, code) in responses:
+        if code == 404:
+            # No instances of this service
+            continue
+        if code is None or code >= 300:
+            cout.error(f"Error occurred while getting {s} services: {code}")
+            return None
+        index.load(res)
+    return index
@@ -1,73 +1,111 @@
 import json
+import threading
 import requests
+from requests.adapters import HTTPAdapter
 
 import urllib3
+from urllib3.util.retry import Retry
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+from .services import combine
 from .util import CText
 
 
 cout = CText()
 
 class NSOClient():
-    def __init__(self, url, user, pwd):
+    """
+    RESTCONF client for NSO.
+
+    Requests are sent through a pooled keep-alive session so that sequential and
+    concurrent calls reuse connections. Connection failures are retried with
+    exponential backoff for every request; read failures and 5xx responses
+    only for RETRY_METHODS, as a PATCH, POST or DELETE may already have been
+    applied by NSO.
+    """
+    DEFAULT_POOL_SIZE = 10
+    DEFAULT_CONNECT_TIMEOUT = 10
+    DEFAULT_READ_TIMEOUT = 120
+    DEFAULT_RETRIES = 3
+    DEFAULT_BACKOFF = 0.5
+    RETRY_STATUS = (500, 502, 503, 504)
+    RETRY_METHODS = frozenset(["GET", "HEAD"])
+
+    def __init__(self, url, user, pwd, verify=False, pool_size=None,
+                 connect_timeout=None, read_timeout=None, retries=None, backoff=None):
         self._user = user
         self._pwd = pwd
         self._url = url
-
-    def _get(self, ep):
-        hdr = {"Accept": "application/yang-data+json"}
+        self._verify = bool(verify)
+        self._pool_size = pool_size or self.DEFAULT_POOL_SIZE
+        self._timeout = (connect_timeout or self.DEFAULT_CONNECT_TIMEOUT,
+                         read_timeout or self.DEFAULT_READ_TIMEOUT)
+        self._retries = retries if retries is not None else self.DEFAULT_RETRIES
+        self._backoff = backoff if backoff is not None else self.DEFAULT_BACKOFF
+        self._session = None
+        self._lock = threading.Lock()
+
+    @property
+    def session(self):
+        with self._lock:
+            if self._session is None:
+                self._session = self._new_session()
+            return self._session
+
+    def _new_session(self):
+        retry = Retry(total=self._retries, connect=self._retries, read=self._retries,
+                      status=self._retries, backoff_factor=self._backoff,
+                      status_forcelist=self.RETRY_STATUS,
+                      allowed_methods=self.RETRY_METHODS,
+                      raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=self._pool_size,
+                              pool_maxsize=self._pool_size, max_retries=retry)
+        session = requests.Session()
+        session.auth = (self._user, self._pwd)
+        session.verify = self._verify
+        session.headers.update({"Accept": "application/yang-data+json"})
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def close(self):
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _request(self, method, ep, data=None):
+        hdr = None
+        if method != "GET":
+            hdr = {"Content-type": "application/yang-data+json"}
         url = f"{self._url}/{ep}"
         try:
-            ret = requests.get(url, auth=(self._user, self._pwd), headers=hdr, verify=False)
+            ret = self.session.request(method, url, headers=hdr, data=data,
+                                       timeout=self._timeout)
             if not ret.text:
                 return (dict(), ret.status_code)
             return (ret.json(), ret.status_code)
         except Exception as e:
-            cout.error(f"GET: {e}")
+            cout.error(f"{method}: {e}")
             raise e
 
+    def _get(self, ep):
+        return self._request("GET", ep)
+
     def _patch(self, ep, data=None):
-        hdr = {"Accept": "application/yang-data+json",
-               "Content-type": "application/yang-data+json"}
-        url = f"{self._url}/{ep}"
-        try:
-            ret = requests.patch(url, auth=(self._user, self._pwd), headers=hdr,
-                                 data=data, verify=False)
-            if not ret.text:
-                return (dict(), ret.status_code)
-            return (ret.json(), ret.status_code)
-        except Exception as e:
-            cout.error(f"PATCH: {e}")
-            raise e
+        return self._request("PATCH", ep, data)
 
     def _post(self, ep, data=None):
-        hdr = {"Accept": "application/yang-data+json",
-               "Content-type": "application/yang-data+json"}
-        url = f"{self._url}/{ep}"
-        try:
-            ret = requests.post(url, auth=(self._user, self._pwd), headers=hdr,
-                                data=data, verify=False)
-            if not ret.text:
-                return (dict(), ret.status_code)
-            return (ret.json(), ret.status_code)
-        except Exception as e:
-            cout.error(f"POST: {e}")
-            raise e
+        return self._request("POST", ep, data)
 
     def _delete(self, ep, data=None):
-        hdr = {"Accept": "application/yang-data+json",
-               "Content-type": "application/yang-data+json"}
-        url = f"{self._url}/{ep}"
-        try:
-            ret = requests.delete(url, auth=(self._user, self._pwd), headers=hdr,
-                                  data=data, verify=False)
-            if not ret.text:
-                return (dict(), ret.status_code)
-            return (ret.json(), ret.status_code)
-        except Exception as e:
-            cout.error(f"DELETE: {e}")
-            raise e
+        return self._request("DELETE", ep, data)
 
     def devices(self):
         base = "tailf-ncs:devices/device"
@@ -97,6 +135,12 @@ class NSOClient():
         data = json.dumps(s.json())
         return self._patch(ep, data)
 
+    def create_services(self, services):
+        """ Create several services in a single NSO transaction """
+        ep = "tailf-ncs:services"
+        data = json.dumps(combine(services))
+        return self._patch(ep, data)
+
     def delete_service(self, service, name=None):
         ep = "tailf-ncs:services"
         if service:
@@ -30,3 +30,28 @@ class Inventory:
             ret["ero"] = self.paths.get(path)
         return ret
 
+
+
+class Manifest:
+    """ List of services to provision in a batch, e.g.
+        services:
+          - service: l2ptp
+            name: ptp-1
+            epa: renc-w1-ptp
+            epz: renc-w2-ptp
+    """
+    def __init__(self, yfile):
+        self.entries = list()
+        with open(yfile, "r") as mf:
+            try:
+                data = yaml.safe_load(mf)
+            except Exception as e:
+                raise Exception(f"Could not load manifest file: {yfile}: {e}")
+        if isinstance(data, dict):
+            data = data.get("services", None)
+        if not isinstance(data, list):
+            raise Exception(f"Manifest {yfile} does not contain a list of services")
+        for idx, e in enumerate(data):
+            if not isinstance(e, dict) or not e.get("service") or not e.get("epa"):
+                raise Exception(f"Invalid manifest entry {idx}: service and epa are required")
+            self.entries.append(e)
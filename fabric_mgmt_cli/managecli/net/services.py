@@ -4,6 +4,16 @@ from time import time_ns
 
 IDIPA_SERVICES=["l2ptp", "l2sts"]
 
+def combine(services):
+    """ Merge the JSON of several services into a single tailf-ncs:services
+        body so they can be provisioned in one NSO transaction
+    """
+    combined = dict()
+    for s in services:
+        for sid, entries in s.json()["tailf-ncs:services"].items():
+            combined.setdefault(sid, list()).extend(entries)
+    return {"tailf-ncs:services": combined}
+
 class Endpoint():
     def __init__(self, ep):
         if not ep:
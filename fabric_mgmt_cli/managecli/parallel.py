@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Iterable, List
+
+
+DEFAULT_CONCURRENCY = 10
+
+
+class TaskResult:
+    """
+    Outcome of a single task dispatched via run_concurrently
+    """
+    def __init__(self, *, key: Any, result: Any = None, error: Exception = None, elapsed: float = 0.0):
+        self.key = key
+        self.result = result
+        self.error = error
+        self.elapsed = elapsed
+
+    def succeeded(self) -> bool:
+        return self.error is None
+
+    def __str__(self):
+        return f"key: {self.key} result: {self.result} error: {self.error} elapsed: {self.elapsed:.2f}s"
+
+
+def split_names(names: str) -> List[str]:
+    """
+    Split a comma separated list of names, dropping blanks and duplicates while preserving order
+    @param names comma separated names
+    @return list of names
+    """
+    result = []
+    if names is None:
+        return result
+    for n in names.split(","):
+        n = n.strip()
+        if n != "" and n not in result:
+            result.append(n)
+    return result
+
+
+def run_concurrently(*, items: Iterable[Any], task: Callable[[Any], Any], concurrency: int = DEFAULT_CONCURRENCY,
+                     on_complete: Callable[[TaskResult, int, int], None] = None) -> List[TaskResult]:
+    """
+    Invoke task for every item using a bounded thread pool
+    @param items items to process; each item is passed to the task and used as the result key
+    @param task callable invoked with a single item
+    @param concurrency maximum number of tasks in flight
+    @param on_complete optional callback invoked from the calling thread as each task completes,
+                       with the result, number of completed tasks and total number of tasks
+    @return list of task results in the same order as items
+    """
+    items = list(items)
+    total = len(items)
+    results = [None] * total
+    if total == 0:
+        return []
+
+    def timed(item):
+        begin = time.time()
+        try:
+            return TaskResult(key=item, result=task(item), elapsed=time.time() - begin)
+        except Exception as e:
+            return TaskResult(key=item, error=e, elapsed=time.time() - begin)
+
+    workers = max(1, min(int(concurrency), total))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="managecli-worker") as executor:
+        futures = {executor.submit(timed, item): idx for idx, item in enumerate(items)}
+        completed = 0
+        for future in as_completed(futures):
+            idx = futures[future]
+            results[idx] = future.result()
+            completed += 1
+            if on_complete is not None:
+                on_complete(results[idx], completed, total)
+    return results
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+"""
+Lightweight timing instrumentation. Spans are recorded only when profiling has been enabled
+(fabric-mgmt-cli --profile), otherwise span() returns a shared no-op context manager.
+"""
+import functools
+import json
+import sys
+import threading
+import time
+from typing import Any, List
+
+
+class Span:
+    __slots__ = ['name', 'start', 'elapsed', 'thread', 'attrs']
+
+    def __init__(self, *, name: str, start: float, elapsed: float, thread: str, attrs: dict):
+        self.name = name
+        self.start = start
+        self.elapsed = elapsed
+        self.thread = thread
+        self.attrs = attrs
+
+    def to_dict(self) -> dict:
+        return {'name': self.name, 'start': round(self.start, 6), 'elapsed_ms': round(self.elapsed * 1000, 3),
+                'thread': self.thread, 'attrs': self.attrs}
+
+
+class _NoSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+class _ActiveSpan:
+    __slots__ = ['profiler', 'name', 'attrs', 'begin']
+
+    def __init__(self, *, profiler, name: str, attrs: dict):
+        self.profiler = profiler
+        self.name = name
+        self.attrs = attrs
+        self.begin = None
+
+    def __enter__(self):
+        self.begin = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        elapsed = time.perf_counter() - self.begin
+        if exc_type is not None:
+            self.attrs['error'] = exc_type.__name__
+        self.profiler.record(span=Span(name=self.name, start=self.begin - self.profiler.origin, elapsed=elapsed,
+                                       thread=threading.current_thread().name, attrs=self.attrs))
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+class Profiler:
+    """
+    Collects timing spans across threads and reports them aggregated by span name
+    """
+    def __init__(self):
+        self.enabled = False
+        self.spans = []
+        self.lock = threading.Lock()
+        self.origin = time.perf_counter()
+        self.began_at = time.time()
+
+    def enable(self):
+        self.enabled = True
+        self.spans = []
+        self.origin = time.perf_counter()
+        self.began_at = time.time()
+
+    def disable(self):
+        self.enabled = False
+
+    def span(self, name: str, **attrs):
+        """
+        Time a block of code
+        @param name span name, e.g. actor.get_reservations
+        @param attrs attributes recorded with the span
+        """
+        if not self.enabled:
+            return _NO_SPAN
+        return _ActiveSpan(profiler=self, name=name, attrs=attrs)
+
+    def record(self, *, span: Span):
+        with self.lock:
+            self.spans.append(span)
+
+    def summary(self) -> List[dict]:
+        """
+        Aggregate spans by name in the order in which each name was first seen
+        @return list of count, total, mean and max per span name
+        """
+        with self.lock:
+            spans = sorted(self.spans, key=lambda s: s.start)
+        result = {}
+        for s in spans:
+            entry = result.setdefault(s.name, {'name': s.name, 'count': 0, 'total_ms': 0.0, 'max_ms': 0.0})
+            entry['count'] += 1
+            entry['total_ms'] += s.elapsed * 1000
+            entry['max_ms'] = max(entry['max_ms'], s.elapsed * 1000)
+        for entry in result.values():
+            entry['mean_ms'] = entry['total_ms'] / entry['count']
+            for k in ['total_ms', 'max_ms', 'mean_ms']:
+                entry[k] = round(entry[k], 3)
+        return list(result.values())
+
+    def report(self, *, out=None):
+        """
+        Print the timing breakdown; spans nest, so the time of a span includes the spans within it
+        @param out output stream, defaults to stderr so that command output remains machine readable
+        """
+        out = out if out is not None else sys.stderr
+        wall = (time.perf_counter() - self.origin) * 1000
+        out.write(f"\n{'Span':<40} {'Count':>7} {'Total(ms)':>11} {'Mean(ms)':>10} {'Max(ms)':>10}\n")
+        for e in self.summary():
+            out.write(f"{e['name']:<40} {e['count']:>7} {e['total_ms']:>11.1f} {e['mean_ms']:>10.1f} "
+                      f"{e['max_ms']:>10.1f}\n")
+        out.write(f"{'wall':<40} {'':>7} {wall:>11.1f}\n")
+        out.flush()
+
+    def to_dict(self, *, command: str = None) -> dict:
+        with self.lock:
+            spans = [s.to_dict() for s in sorted(self.spans, key=lambda s: s.start)]
+        return {'command': command, 'timestamp': self.began_at,
+                'wall_ms': round((time.perf_counter() - self.origin) * 1000, 3),
+                'summary': self.summary(), 'spans': spans}
+
+    def export(self, *, path: str, command: str = None):
+        """
+        Append the profile of this run as a single JSON line so that latencies can be trended across runs
+        @param path file to append to
+        @param command command line being profiled
+        """
+        with open(path, 'a') as f:
+            f.write(json.dumps(self.to_dict(command=command)) + '\n')
+
+
+class InstrumentedProxy:
+    """
+    Wraps an object, recording a span for every method call
+    """
+    IGNORED = {'prepare', 'get_last_error', 'get_guid', 'get_name', 'clone', 'clear_last'}
+
+    def __init__(self, *, target: Any, prefix: str, profiler: Profiler, **attrs):
+        self._target = target
+        self._prefix = prefix
+        self._profiler = profiler
+        self._attrs = attrs
+
+    def __getattr__(self, name: str):
+        value = getattr(self._target, name)
+        if not callable(value) or name in self.IGNORED:
+            return value
+
+        @functools.wraps(value)
+        def timed(*args, **kwargs):
+            with self._profiler.span(f"{self._prefix}.{name}", **self._attrs):
+                return value(*args, **kwargs)
+        return timed
+
+
+PROFILER = Profiler()
+
+
+def span(name: str, **attrs):
+    """
+    Time a block of code using the process wide profiler
+    """
+    return PROFILER.span(name, **attrs)
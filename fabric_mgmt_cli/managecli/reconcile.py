@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import json
+import os
+import tempfile
+from collections import Counter
+from typing import Any, Callable, Dict, List, Tuple
+
+
+class SliverAudit:
+    """
+    Reconciled view of a single sliver across all the sources
+    """
+    __slots__ = ['sliver_id', 'states', 'objects']
+
+    def __init__(self, *, sliver_id: str, states: Tuple[str or None, ...], objects: Tuple[Any, ...]):
+        self.sliver_id = sliver_id
+        self.states = states
+        self.objects = objects
+
+    def first(self) -> Any:
+        """
+        @return the sliver as reported by the first source that has it
+        """
+        for o in self.objects:
+            if o is not None:
+                return o
+        return None
+
+
+class ReconcileResult:
+    """
+    Outcome of reconciling slivers across several sources
+    """
+    def __init__(self, *, sources: List[str]):
+        self.sources = sources
+        self.total = 0
+        self.in_all = 0
+        self.only_in = {s: 0 for s in sources}
+        self.counts = Counter()
+        self.inconsistent = []
+
+    def is_consistent(self) -> bool:
+        return len(self.inconsistent) == 0
+
+    def to_dict(self, *, describe: Callable[[SliverAudit], dict] = None) -> dict:
+        """
+        Machine readable representation
+        @param describe optional callable returning additional fields for an inconsistent sliver
+        @return dictionary
+        """
+        inconsistent = []
+        for a in self.inconsistent:
+            entry = {'sliver_id': a.sliver_id,
+                     'states': {s: a.states[i] for i, s in enumerate(self.sources)}}
+            if describe is not None:
+                entry.update(describe(a))
+            inconsistent.append(entry)
+        return {'sources': self.sources,
+                'total': self.total,
+                'in_all': self.in_all,
+                'only_in': self.only_in,
+                'states': [{'states': {s: key[i] for i, s in enumerate(self.sources)}, 'count': count}
+                           for key, count in self.counts.most_common()],
+                'inconsistent': inconsistent}
+
+
+class AuditHistory:
+    """
+    Inconsistencies reported by the previous audit, persisted locally so that subsequent audits only report
+    newly appeared or resolved inconsistencies.
+    File content: {<audit key>: {<sliver id>: <inconsistent sliver as returned by ReconcileResult.to_dict>}}
+    """
+    def __init__(self, *, path: str = None):
+        """
+        @param path file holding the previous results, defaults to ~/.fabric_mgmt_cli/audit_history.json
+        """
+        if path is None:
+            path = os.path.join(os.path.expanduser("~"), ".fabric_mgmt_cli", "audit_history.json")
+        self.path = path
+        self.previous = {}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path) as f:
+                    self.previous = json.load(f)
+            except ValueError:
+                self.previous = {}
+
+    def exists(self, *, key: str) -> bool:
+        return key in self.previous
+
+    def update(self, *, key: str, inconsistent: List[dict]) -> Tuple[List[dict], List[dict]]:
+        """
+        Record the inconsistencies found by the latest audit
+        @param key audit key
+        @param inconsistent inconsistent slivers
+        @return newly appeared (or changed) inconsistencies, and resolved inconsistencies
+        """
+        previous = self.previous.get(key, {})
+        current = {x['sliver_id']: x for x in inconsistent}
+        appeared = [x for sid, x in current.items()
+                    if sid not in previous or previous[sid].get('states') != x.get('states')]
+        resolved = [x for sid, x in previous.items() if sid not in current]
+        self.previous[key] = current
+        return appeared, resolved
+
+    def save(self):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(self.previous, f)
+        os.replace(tmp, self.path)
+
+
+def reconcile(*, sources: Dict[str, Dict[str, Any]], state_of: Callable[[str, Any], str],
+              is_consistent: Callable[[Tuple[str or None, ...]], bool]) -> ReconcileResult:
+    """
+    Reconcile slivers reported by several sources in a single linear pass over the union of all the sources
+    @param sources source name to dictionary of sliver id to sliver
+    @param state_of callable returning the state label of a sliver for the given source
+    @param is_consistent callable invoked with the tuple of state labels (in source order, None when the source does
+                         not have the sliver), returns True if the combination is consistent
+    @return result
+    """
+    names = list(sources.keys())
+    n = len(names)
+    result = ReconcileResult(sources=names)
+
+    index = {}
+    for i, name in enumerate(names):
+        for sid, obj in sources[name].items():
+            entry = index.get(sid)
+            if entry is None:
+                entry = index[sid] = [None] * n
+            entry[i] = obj
+
+    result.total = len(index)
+    for sid, objs in index.items():
+        states = tuple(state_of(names[i], o) if o is not None else None for i, o in enumerate(objs))
+        result.counts[states] += 1
+        present = [i for i, o in enumerate(objs) if o is not None]
+        if len(present) == n:
+            result.in_all += 1
+        elif len(present) == 1:
+            result.only_in[names[present[0]]] += 1
+        if not is_consistent(states):
+            result.inconsistent.append(SliverAudit(sliver_id=sid, states=states, objects=tuple(objs)))
+    return result
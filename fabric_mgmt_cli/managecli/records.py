@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+from typing import List, Tuple
+
+
+class ReservationRecord:
+    """
+    Compact stand-in for ReservationMng carrying only the scalar fields of a reservation.
+    Built directly from the response dictionary, so the pickled sliver, properties and
+    lease details of the reservation are never decoded.
+    """
+    __slots__ = ('reservation_id', 'slice_id', 'start', 'end', 'requested_end', 'closed_at', 'rtype', 'units',
+                 'state', 'pending_state', 'notices')
+
+    def __init__(self, **kwargs):
+        for name in self.__slots__:
+            setattr(self, name, kwargs.get(name))
+
+    @staticmethod
+    def from_dict(value: dict):
+        """
+        Create a record from a reservation as received in a management response
+        @param value reservation dictionary
+        @return record
+        """
+        return ReservationRecord(**{name: value.get(name) for name in ReservationRecord.__slots__})
+
+    def get_reservation_id(self) -> str:
+        return self.reservation_id
+
+    def get_slice_id(self) -> str:
+        return self.slice_id
+
+    def get_start(self) -> int:
+        return self.start
+
+    def get_end(self) -> int:
+        return self.end
+
+    def get_state(self) -> int:
+        return self.state
+
+    def get_pending_state(self) -> int:
+        return self.pending_state
+
+    def get_notices(self) -> str:
+        return self.notices
+
+    def get_sliver(self):
+        return None
+
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state: tuple):
+        for name, value in zip(self.__slots__, state):
+            setattr(self, name, value)
+
+    def __str__(self):
+        return f"rid: {self.reservation_id} slice_id: {self.slice_id} state: {self.state}"
+
+
+RESERVATIONS = 'reservations'
+
+
+def strip_reservations(*, value: dict) -> Tuple[dict, List[ReservationRecord] or None]:
+    """
+    Convert the reservations of a management response into records, leaving the rest of the response as is
+    @param value response dictionary
+    @return response dictionary without the reservations and the reservation records
+    """
+    reservations = value.get(RESERVATIONS)
+    if reservations is None:
+        return value, None
+    value = dict(value)
+    value[RESERVATIONS] = None
+    records = [ReservationRecord.from_dict(r) for r in reservations]
+    return value, records if len(records) > 0 else None
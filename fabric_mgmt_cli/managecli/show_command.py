@@ -26,7 +26,8 @@
 import json
 import re
 import traceback
-from typing import Tuple, List
+from contextlib import nullcontext
+from typing import Any, Tuple, List, Iterable, Set
 
 from fabric_cf.actor.core.apis.abc_delegation import DelegationState
 from fabric_cf.actor.core.common.constants import Constants
@@ -39,6 +40,7 @@ from fabric_cf.actor.core.util.utils import sliver_to_str
 from fabric_mb.message_bus.messages.delegation_avro import DelegationAvro
 from fabric_mb.message_bus.messages.lease_reservation_avro import LeaseReservationAvro
 from fabric_mb.message_bus.messages.reservation_mng import ReservationMng
+from fabric_mb.message_bus.messages.result_avro import ResultAvro
 from fabric_mb.message_bus.messages.site_avro import SiteAvro
 from fabric_mb.message_bus.messages.slice_avro import SliceAvro
 from fim.graph.abc_property_graph import ABCPropertyGraph
@@ -47,14 +49,18 @@ from fim.slivers.network_node import NodeSliver
 from fim.slivers.network_service import NetworkServiceSliver
 
 from fabric_mgmt_cli.managecli.command import Command
+from fabric_mgmt_cli.managecli.parallel import run_concurrently, split_names, DEFAULT_CONCURRENCY
+from fabric_mgmt_cli.managecli.profiling import span
 
 
 class ShowCommand(Command):
     def get_slices(self, *, actor_name: str, callback_topic: str, slice_id: str, slice_name: str, id_token: str,
-                   email: str, states: str, format: str):
+                   email: str, states: str, format: str, offset: int = None, limit: int = None):
         try:
-            slices, error = self.do_get_slices(actor_name=actor_name, callback_topic=callback_topic, slice_id=slice_id,
-                                               slice_name=slice_name, id_token=id_token, email=email, states=states)
+            slices, error = self.do_get_slices(actor_name=actor_name, callback_topic=callback_topic,
+                                               slice_id=slice_id, slice_name=slice_name, id_token=id_token,
+                                               email=email, states=states)
+            slices = self.__window(items=slices, offset=offset, limit=limit)
             if slices is not None and len(slices) > 0:
                 self.__print_slices(slices=slices, format=format)
             else:
@@ -66,11 +72,17 @@ class ShowCommand(Command):
 
     def get_reservations(self, *, actor_name: str, callback_topic: str, slice_id: str, rid: str,
                          states: str, id_token: str, email: str, site: str, type: str, format: str, fields: str,
-                         include_ansible: bool, include_vm_create: str = None, host: str, ip_subnet: str):
+                         include_ansible: bool, include_vm_create: str = None, host: str, ip_subnet: str,
+                         offset: int = None, limit: int = None):
         try:
+            # Slivers are only decoded when they are printed
+            lean = format != 'text' and fields is not None and 'sliver' not in self.__field_list(fields=fields)
+
             reservations, error = self.do_get_reservations(actor_name=actor_name, callback_topic=callback_topic,
-                                                           slice_id=slice_id, rid=rid, states=states, id_token=id_token,
-                                                           email=email, site=site, type=type, host=host, ip_subnet=ip_subnet)
+                                                           slice_id=slice_id, rid=rid, states=states,
+                                                           id_token=id_token, email=email, site=site, type=type,
+                                                           host=host, ip_subnet=ip_subnet, lean=lean)
+            reservations = self.__window(items=reservations, offset=offset, limit=limit)
             if reservations is not None and len(reservations) > 0:
                 self.__print_reservations(reservations=reservations, format=format, fields=fields,
                                           include_ansible=include_ansible, include_vm_create=include_vm_create)
@@ -96,8 +108,8 @@ class ShowCommand(Command):
             print("Exception occurred while processing get_delegations {}".format(e))
 
     def do_get_slices(self, *, actor_name: str, callback_topic: str, slice_id: str = None, slice_name: str = None,
-                      id_token: str = None, email: str = None, states: str = None, projectid: str = None) -> Tuple[
-        List[SliceAvro] or None, Error]:
+                      id_token: str = None, email: str = None, states: str = None,
+                      projectid: str = None) -> Tuple[List[SliceAvro] or None, Error]:
         actor = self.get_actor(actor_name=actor_name)
 
         if actor is None:
@@ -114,8 +126,19 @@ class ShowCommand(Command):
                     x = x.strip()
                     slice_states.append(SliceState.translate(state_name=x).value)
 
+            filters = {'slice_id': slice_id, 'slice_name': slice_name, 'email': email, 'states': slice_states,
+                       'projectid': projectid}
+            use_cache = self.cache is not None
+            if use_cache:
+                result = self.cache.lookup(kind='slices', actor_name=actor_name, filters=filters,
+                                           matchers=self.__slice_matchers())
+                if result is not None:
+                    return result, self.__cached_status()
+
             result = actor.get_slices(slice_id=sid, slice_name=slice_name, email=email, states=slice_states,
                                       project=projectid)
+            if use_cache and result is not None:
+                self.cache.store(kind='slices', actor_name=actor_name, filters=filters, result=result)
             return result, actor.get_last_error()
         except Exception:
             ex_str = traceback.format_exc()
@@ -124,7 +147,8 @@ class ShowCommand(Command):
 
     def do_get_reservations(self, *, actor_name: str, callback_topic: str, slice_id: str = None, rid: str = None,
                             states: str = None, id_token: str = None, email: str = None, site: str = None,
-                            type: str = None, host: str = None, ip_subnet: str = None) -> Tuple[List[ReservationMng] or None, Error]:
+                            type: str = None, host: str = None, ip_subnet: str = None,
+                            lean: bool = False) -> Tuple[List[ReservationMng] or None, Error]:
         actor = self.get_actor(actor_name=actor_name)
 
         if actor is None:
@@ -141,13 +165,76 @@ class ShowCommand(Command):
                         reservation_states = []
                     x = x.strip()
                     reservation_states.append(ReservationStates.translate(state_name=x).value)
-            return actor.get_reservations(slice_id=sid, rid=reservation_id, states=reservation_states, email=email,
-                                          site=site, type=type, host=host, ip_subnet=ip_subnet), actor.get_last_error()
+            filters = {'slice_id': slice_id, 'rid': rid, 'states': reservation_states, 'email': email,
+                       'site': site, 'type': type, 'host': host, 'ip_subnet': ip_subnet}
+            use_cache = self.cache is not None
+            if use_cache:
+                result = self.cache.lookup(kind='reservations', actor_name=actor_name, filters=filters,
+                                           matchers=self.__reservation_matchers())
+                if result is not None:
+                    return result, self.__cached_status()
+
+            # Lean results are ReservationRecords without slivers; they are not saved to the cache
+            with self.lean_reservations() if lean else nullcontext():
+                result = actor.get_reservations(slice_id=sid, rid=reservation_id, states=reservation_states,
+                                                email=email, site=site, type=type, host=host, ip_subnet=ip_subnet)
+            if use_cache and not lean and result is not None:
+                self.cache.store(kind='reservations', actor_name=actor_name, filters=filters, result=result)
+            return result, actor.get_last_error()
         except Exception as e:
             ex_str = traceback.format_exc()
             self.logger.error(ex_str)
         return None, actor.get_last_error()
 
+    @staticmethod
+    def __window(*, items: List[Any] or None, offset: int = None, limit: int = None) -> List[Any] or None:
+        """
+        Select the requested window of the results; KafkaActor does not send offset and limit to the actor,
+        so the complete result set is fetched and sliced here
+        @param items results
+        @param offset number of results to skip
+        @param limit maximum number of results
+        @return results in the window
+        """
+        if items is None or (offset is None and limit is None):
+            return items
+        start = offset if offset is not None else 0
+        return items[start:start + limit if limit is not None else None]
+
+    @staticmethod
+    def __cached_status() -> Error:
+        return Error(status=ResultAvro(), e=None)
+
+    @staticmethod
+    def __slice_matchers() -> dict:
+        """
+        Slice filters which can be evaluated locally against a cached snapshot
+        """
+        return {'slice_id': lambda s, v: s.get_slice_id() == v,
+                'slice_name': lambda s, v: s.get_slice_name() == v,
+                'states': lambda s, v: s.get_state() in v,
+                'projectid': lambda s, v: s.get_project_id() == v}
+
+    @staticmethod
+    def __reservation_matchers() -> dict:
+        """
+        Reservation filters which can be evaluated locally against a cached snapshot
+        """
+        def site(r: ReservationMng, value: str) -> bool:
+            sliver = r.get_sliver()
+            return sliver is not None and hasattr(sliver, 'get_site') and sliver.get_site() == value
+
+        def host(r: ReservationMng, value: str) -> bool:
+            sliver = r.get_sliver()
+            return isinstance(sliver, NodeSliver) and sliver.label_allocations is not None and \
+                sliver.label_allocations.instance_parent == value
+
+        return {'slice_id': lambda r, v: r.slice_id == v,
+                'rid': lambda r, v: r.reservation_id == v,
+                'states': lambda r, v: r.state in v,
+                'site': site,
+                'host': host}
+
     def do_get_delegations(self, *, actor_name: str, callback_topic: str, slice_id: str = None, did: str = None,
                            states: str = None, id_token: str = None) -> Tuple[List[DelegationAvro] or None, Error]:
         actor = self.get_actor(actor_name=actor_name)
@@ -175,60 +262,68 @@ class ShowCommand(Command):
         return None, actor.get_last_error()
 
     @staticmethod
-    def __print_reservations_json(*, reservations: List[ReservationMng], fields: str):
-        res_list = []
-        if fields is not None:
-            field_list = fields.split(",")
-        else:
-            field_list = None
-        for reservation in reservations:
-            res_dict = {
-                'sliver_id': reservation.reservation_id,
-                'slice_id': reservation.slice_id
-            }
-            if reservation.rtype is not None and (field_list is None or 'type' in field_list):
-                res_dict['type'] = reservation.rtype
+    def __reservation_to_dict(*, reservation: ReservationMng, field_list: Set[str] = None) -> dict:
+        res_dict = {
+            'sliver_id': reservation.reservation_id,
+            'slice_id': reservation.slice_id
+        }
+        if reservation.rtype is not None and (field_list is None or 'type' in field_list):
+            res_dict['type'] = reservation.rtype
 
-            if reservation.rtype is not None and (field_list is None or 'notices' in field_list):
-                res_dict['notices'] = reservation.notices
+        if reservation.rtype is not None and (field_list is None or 'notices' in field_list):
+            res_dict['notices'] = reservation.notices
 
-            if reservation.start is not None and (field_list is None or 'start' in field_list):
-                res_dict['start'] = ShowCommand.time_string(milliseconds=reservation.start)
+        if reservation.start is not None and (field_list is None or 'start' in field_list):
+            res_dict['start'] = ShowCommand.time_string(milliseconds=reservation.start)
 
-            if reservation.end is not None and (field_list is None or 'end' in field_list):
-                res_dict['end'] = ShowCommand.time_string(milliseconds=reservation.end)
+        if reservation.end is not None and (field_list is None or 'end' in field_list):
+            res_dict['end'] = ShowCommand.time_string(milliseconds=reservation.end)
 
-            if reservation.requested_end is not None and (field_list is None or 'requested_end' in field_list):
-                res_dict['requested_end'] = ShowCommand.time_string(milliseconds=reservation.requested_end)
+        if reservation.requested_end is not None and (field_list is None or 'requested_end' in field_list):
+            res_dict['requested_end'] = ShowCommand.time_string(milliseconds=reservation.requested_end)
 
-            if reservation.closed_at is not None and (field_list is None or 'closed_at' in field_list):
-                res_dict['closed_at'] = ShowCommand.time_string(milliseconds=reservation.closed_at)
+        if reservation.closed_at is not None and (field_list is None or 'closed_at' in field_list):
+            res_dict['closed_at'] = ShowCommand.time_string(milliseconds=reservation.closed_at)
 
-            if reservation.units is not None and (field_list is None or 'units' in field_list):
-                res_dict['units'] = reservation.units
+        if reservation.units is not None and (field_list is None or 'units' in field_list):
+            res_dict['units'] = reservation.units
 
-            if reservation.state is not None and (field_list is None or 'state' in field_list):
-                res_dict['state'] = reservation.state
+        if reservation.state is not None and (field_list is None or 'state' in field_list):
+            res_dict['state'] = reservation.state
 
-            if reservation.pending_state is not None and (field_list is None or 'pending_state' in field_list):
-                res_dict['pending_state'] = reservation.pending_state
+        if reservation.pending_state is not None and (field_list is None or 'pending_state' in field_list):
+            res_dict['pending_state'] = reservation.pending_state
 
+        if field_list is None or 'sliver' in field_list:
             sliver = reservation.get_sliver()
-            if sliver is not None and (field_list is None or 'sliver' in field_list):
-                res_dict['sliver'] = ABCPropertyGraph.sliver_to_dict(sliver)
+            if sliver is not None:
+                with span("format.sliver_to_dict"):
+                    res_dict['sliver'] = ABCPropertyGraph.sliver_to_dict(sliver)
+
+        return res_dict
 
-            res_list.append(res_dict)
+    @staticmethod
+    def __field_list(*, fields: str) -> Set[str] or None:
+        if fields is None:
+            return None
+        return {f.strip() for f in fields.split(",")}
+
+    @staticmethod
+    def __print_reservations_json(*, reservations: Iterable[ReservationMng], fields: str, format: str = 'json'):
+        field_list = ShowCommand.__field_list(fields=fields)
 
-        print(json.dumps(res_list, indent=4))
+        records = (ShowCommand.__reservation_to_dict(reservation=r, field_list=field_list) for r in reservations)
+        ShowCommand.print_json_stream(records=records, format=format)
 
-    def __print_reservations(self, reservations: List[ReservationMng], format: str, fields: str,
+    def __print_reservations(self, reservations: Iterable[ReservationMng], format: str, fields: str,
                              include_ansible: bool = False, include_vm_create: str = None):
         if format == 'text':
-            for r in reservations:
-                self.__print_reservation(reservation=r, include_ansible=include_ansible,
-                                         include_vm_create=include_vm_create)
+            with span("output.text"):
+                for r in reservations:
+                    self.__print_reservation(reservation=r, include_ansible=include_ansible,
+                                             include_vm_create=include_vm_create)
         else:
-            self.__print_reservations_json(reservations=reservations, fields=fields)
+            self.__print_reservations_json(reservations=reservations, fields=fields, format=format)
 
     @staticmethod
     def __print_reservation(*, reservation: ReservationMng, include_ansible: bool, include_vm_create: str = None):
@@ -416,32 +511,33 @@ class ShowCommand(Command):
         print("")
 
     @staticmethod
-    def __print_slice_json(*, slices: List[SliceAvro]):
+    def __slice_to_dict(*, slice_object: SliceAvro) -> dict:
+        return {'name': slice_object.get_slice_name(),
+                'slice_id': slice_object.get_slice_id(),
+                'project_id': slice_object.get_project_id(),
+                'project_name': slice_object.get_project_name(),
+                'graph_id': slice_object.get_graph_id(),
+                'owner': slice_object.get_owner().get_email(),
+                'state': str(SliceState(slice_object.get_state())),
+                'lease_start_time': str(slice_object.get_lease_start()),
+                'lease_end_time': str(slice_object.get_lease_end())
+                }
+
+    @staticmethod
+    def __print_slice_json(*, slices: Iterable[SliceAvro], format: str = 'json'):
         """
         Prints Slice Object
         """
-        slc_list = []
-        for slice_object in slices:
-            slc_dict = {'name': slice_object.get_slice_name(),
-                        'slice_id': slice_object.get_slice_id(),
-                        'project_id': slice_object.get_project_id(),
-                        'project_name': slice_object.get_project_name(),
-                        'graph_id': slice_object.get_graph_id(),
-                        'owner': slice_object.get_owner().get_email(),
-                        'state': str(SliceState(slice_object.get_state())),
-                        'lease_start_time': str(slice_object.get_lease_start()),
-                        'lease_end_time': str(slice_object.get_lease_end())
-                        }
-            slc_list.append(slc_dict)
-
-        print(json.dumps(slc_list, indent=4))
-
-    def __print_slices(self, slices: List[SliceAvro], format: str):
+        records = (ShowCommand.__slice_to_dict(slice_object=s) for s in slices)
+        ShowCommand.print_json_stream(records=records, format=format)
+
+    def __print_slices(self, slices: Iterable[SliceAvro], format: str):
         if format == 'text':
-            for s in slices:
-                self.__print_slice(slice_object=s)
+            with span("output.text"):
+                for s in slices:
+                    self.__print_slice(slice_object=s)
         else:
-            self.__print_slice_json(slices=slices)
+            self.__print_slice_json(slices=slices, format=format)
 
     @staticmethod
     def __print_delegation(*, dlg_object: DelegationAvro):
@@ -513,20 +609,63 @@ class ShowCommand(Command):
             self.logger.error(ex_str)
             print("Exception occurred while processing get_delegations {}".format(e))
 
+    def get_sites_bulk(self, *, actor_names: str, callback_topic: str, sites: str, format: str,
+                       concurrency: int = DEFAULT_CONCURRENCY):
+        """
+        Query Maintenance Status from several actors concurrently and print an aggregated report
+        @param actor_names comma separated list of actor names
+        @param callback_topic callback topic
+        @param sites comma separated list of sites
+        @param format output format text or json
+        @param concurrency maximum number of actors queried in parallel
+        """
+        def query(actor_name: str):
+            return self.do_get_sites(actor_name=actor_name, callback_topic=callback_topic, sites=sites)
+
+        results = run_concurrently(items=split_names(actor_names), task=query, concurrency=concurrency)
+
+        maint_info = {}
+        for r in results:
+            if not r.succeeded():
+                self.logger.error(f"Exception occurred while fetching sites from {r.key}: {r.error}")
+                if format == 'text':
+                    print(f"Status of {r.key}: {r.error}")
+                else:
+                    maint_info[r.key] = {'error': str(r.error)}
+                continue
+
+            actor_sites, error = r.result
+            if actor_sites is not None and len(actor_sites) > 0:
+                if format == 'text':
+                    self.__print_sites(sites=actor_sites, format=format, actor_name=r.key)
+                else:
+                    maint_info[r.key] = self.__sites_to_list(sites=actor_sites)
+            elif format == 'text':
+                print(f"Status of {r.key}: {error.get_status()}")
+            else:
+                maint_info[r.key] = {'error': str(error.get_status())}
+
+        if format != 'text':
+            print(json.dumps(maint_info, indent=4))
+
+    @staticmethod
+    def __sites_to_list(*, sites: List[SiteAvro]) -> List[dict]:
+        site_list = []
+        for s in sites:
+            s_dict = {
+                'name': s.get_name(),
+                'maint_info': s.get_maint_info().to_json()
+            }
+            site_list.append(s_dict)
+        return site_list
+
     def __print_sites(self, *, sites: List[SiteAvro], format: str, actor_name: str):
         if format == 'text':
             print(f"Actor: {actor_name}")
             for s in sites:
                 print(s)
         else:
-            site_list = []
-            for s in sites:
-                s_dict = {
-                    'name': s.get_name(),
-                    'maint_info': s.get_maint_info().to_json()
-                }
-                site_list.append(s_dict)
-            maint_info = {actor_name: site_list}
+            maint_info = {actor_name: self.__sites_to_list(sites=sites)}
             print(json.dumps(maint_info, indent=4))
 
     @staticmethod
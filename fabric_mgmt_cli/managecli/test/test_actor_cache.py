@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import unittest
+
+from fabric_cf.actor.core.manage.kafka.kafka_broker import KafkaBroker
+
+from fabric_mgmt_cli.managecli.benchmark.actor_cache import make_config, make_processor
+
+
+class ActorCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.processor = make_processor(config=make_config(peers=6))
+        self.processor.load_actor_cache()
+
+    def test_actors_created_on_first_use(self):
+        self.assertEqual(len(self.processor.actor_cache), 0)
+        actor = self.processor.get_mgmt_actor(name="peer0-am")
+        self.assertIs(actor, self.processor.get_mgmt_actor(name="peer0-am"))
+        self.assertEqual(list(self.processor.actor_cache.keys()), ["peer0-am"])
+        self.assertEqual(actor.kafka_topic, "peer0-am-topic")
+        self.assertNotIsInstance(actor, KafkaBroker)
+        self.assertIsInstance(self.processor.get_mgmt_actor(name="peer1-am"), KafkaBroker)
+        self.assertIsInstance(self.processor.get_mgmt_actor(name="peer2-am"), KafkaBroker)
+        self.assertIsNone(self.processor.get_mgmt_actor(name="unknown"))
+
+    def test_actor_names(self):
+        self.assertEqual(len(self.processor.get_actor_names()), 6)
+        self.assertEqual(self.processor.get_actor_names(actor_type="broker"), ["peer1-am", "peer4-am"])
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import asyncio
+import threading
+import time
+import unittest
+from contextlib import contextmanager
+
+from fabric_mgmt_cli.managecli.async_client import AsyncManagementClient
+
+
+class FakeActor:
+    def __init__(self, *, delay: float, calls: list):
+        self.delay = delay
+        self.calls = calls
+
+    def prepare(self, *, callback_topic: str):
+        pass
+
+    def get_last_error(self):
+        return None
+
+    def remove_delegation(self, *, did: str) -> bool:
+        self.calls.append(did)
+        time.sleep(self.delay)
+        return True
+
+
+class FakeProcessor:
+    def __init__(self, *, delay: float):
+        self.delay = delay
+        self.calls = []
+        self.threads = set()
+
+    def get_mgmt_actor(self, *, name: str):
+        self.threads.add(threading.get_ident())
+        return FakeActor(delay=self.delay, calls=self.calls) if name == "broker" else None
+
+
+class FakeMessageProcessor:
+    def __init__(self):
+        self.tags = []
+        self.cancelled = []
+
+    @contextmanager
+    def track_requests(self, *, tag):
+        self.tags.append(tag)
+        yield
+
+    def cancel_requests(self, *, tag):
+        self.cancelled.append(tag)
+
+
+class AsyncManagementClientTest(unittest.TestCase):
+    def test_requests_are_outstanding_concurrently(self):
+        processor = FakeProcessor(delay=0.1)
+
+        async def run():
+            async with AsyncManagementClient(callback_topic="topic", processor=processor, concurrency=50) as client:
+                return await asyncio.gather(*[client.remove_delegation(actor_name="broker", did=str(i))
+                                              for i in range(50)])
+
+        begin = time.time()
+        results = asyncio.run(run())
+        self.assertLess(time.time() - begin, 1.0)
+        self.assertEqual(results, [(True, None)] * 50)
+        self.assertGreater(len(processor.threads), 1)
+
+    def test_unknown_actor(self):
+        async def run():
+            async with AsyncManagementClient(callback_topic="topic", processor=FakeProcessor(delay=0)) as client:
+                await client.remove_delegation(actor_name="missing", did="d1")
+
+        with self.assertRaises(Exception):
+            asyncio.run(run())
+
+    def test_timeout_and_cancel_queued_requests(self):
+        processor = FakeProcessor(delay=0.2)
+
+        async def run():
+            async with AsyncManagementClient(callback_topic="topic", processor=processor, concurrency=1) as client:
+                first = asyncio.ensure_future(client.remove_delegation(actor_name="broker", did="first"))
+                queued = asyncio.ensure_future(client.remove_delegation(actor_name="broker", did="queued"))
+                await asyncio.sleep(0.05)
+                queued.cancel()
+                with self.assertRaises(asyncio.TimeoutError):
+                    await client.remove_delegation(actor_name="broker", did="late", timeout=0.01)
+                return await first
+
+        self.assertEqual(asyncio.run(run()), (True, None))
+        time.sleep(0.3)
+        self.assertNotIn("queued", processor.calls)
+
+    def test_timeout_cancels_pending_requests(self):
+        processor = FakeProcessor(delay=0.2)
+        processor.message_processor = FakeMessageProcessor()
+
+        async def run():
+            async with AsyncManagementClient(callback_topic="topic", processor=processor) as client:
+                with self.assertRaises(asyncio.TimeoutError):
+                    await client.remove_delegation(actor_name="broker", did="slow", timeout=0.05)
+                return await client.remove_delegation(actor_name="broker", did="fast")
+
+        self.assertEqual(asyncio.run(run()), (True, None))
+        tracked = processor.message_processor.tags
+        self.assertEqual(len(tracked), 2)
+        self.assertEqual(processor.message_processor.cancelled, tracked[:1])
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from fabric_mgmt_cli.managecli.benchmark.fake_actor import FakeActorRegistry, SyntheticTestbed
+from fabric_mgmt_cli.managecli.benchmark.suite import ACTORS, BENCHMARKS, BenchCommand, load_baseline, \
+    run_benchmark
+
+
+class BenchmarkTest(unittest.TestCase):
+    def test_all_benchmarks_run(self):
+        for name in BENCHMARKS:
+            result = run_benchmark(name=name, scale=50)
+            self.assertEqual(result['scale'], 50)
+            self.assertGreater(result['actor_calls'], 0, name)
+
+    def test_fake_actor_serves_reservations(self):
+        registry = FakeActorRegistry(testbed=SyntheticTestbed(reservations=40), names=ACTORS)
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            BENCHMARKS['reservations_json_fields'](BenchCommand(registry=registry))
+        records = json.loads(out.getvalue())
+        self.assertEqual(len(records), 40)
+        self.assertEqual(set(records[0].keys()), {'sliver_id', 'slice_id', 'state'})
+
+    def test_load_baseline_keeps_latest(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "results.json")
+            with open(path, 'w') as f:
+                for elapsed in [10.0, 12.0]:
+                    f.write(json.dumps({'results': [{'name': 'audit', 'scale': 1000, 'elapsed_ms': elapsed}]}) + '\n')
+            self.assertEqual(load_baseline(path=path), {('audit', 1000): 12.0})
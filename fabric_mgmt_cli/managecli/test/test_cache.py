@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from fabric_mgmt_cli.managecli.benchmark.fake_actor import FakeActorRegistry, SyntheticTestbed
+from fabric_mgmt_cli.managecli.benchmark.suite import ACTORS, BenchCommand
+from fabric_mgmt_cli.managecli.cache import QueryCache
+
+MATCHERS = {'states': lambda r, v: r['state'] in v,
+            'site': lambda r, v: r['site'] == v}
+
+RESULT = [{'id': 1, 'state': 4, 'site': 'RENC'},
+          {'id': 2, 'state': 5, 'site': 'UKY'},
+          {'id': 3, 'state': 4, 'site': 'UKY'}]
+
+
+class QueryCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = QueryCache(path=self.tmp.name, ttl=60)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_exact_match(self):
+        self.assertIsNone(self.cache.lookup(kind='reservations', actor_name='am', filters={'email': 'a@b'},
+                                            matchers=MATCHERS))
+        self.cache.store(kind='reservations', actor_name='am', filters={'email': 'a@b', 'site': None}, result=RESULT)
+        self.assertEqual(self.cache.lookup(kind='reservations', actor_name='am', filters={'email': 'a@b'},
+                                           matchers=MATCHERS), RESULT)
+        self.assertIsNone(self.cache.lookup(kind='reservations', actor_name='broker', filters={'email': 'a@b'},
+                                            matchers=MATCHERS))
+        self.assertIsNone(self.cache.lookup(kind='slices', actor_name='am', filters={'email': 'a@b'},
+                                            matchers=MATCHERS))
+
+    def test_narrower_filters_answered_locally(self):
+        self.cache.store(kind='reservations', actor_name='am', filters={'states': [5, 4]}, result=RESULT)
+        result = self.cache.lookup(kind='reservations', actor_name='am', filters={'states': [4], 'site': 'UKY'},
+                                   matchers=MATCHERS)
+        self.assertEqual([r['id'] for r in result], [3])
+        # Broader than the snapshot or not evaluable locally
+        self.assertIsNone(self.cache.lookup(kind='reservations', actor_name='am', filters={'states': [4, 6]},
+                                            matchers=MATCHERS))
+        self.assertIsNone(self.cache.lookup(kind='reservations', actor_name='am', filters={},
+                                            matchers=MATCHERS))
+        self.assertIsNone(self.cache.lookup(kind='reservations', actor_name='am',
+                                            filters={'states': [4], 'email': 'a@b'}, matchers=MATCHERS))
+
+    def test_ttl_and_refresh(self):
+        self.cache.store(kind='slices', actor_name='am', filters={}, result=RESULT)
+        refresh = QueryCache(path=self.tmp.name, ttl=60, refresh=True)
+        self.assertIsNone(refresh.lookup(kind='slices', actor_name='am', filters={}, matchers=MATCHERS))
+        for f in os.listdir(self.tmp.name):
+            stale = time.time() - 120
+            os.utime(os.path.join(self.tmp.name, f), (stale, stale))
+        self.assertIsNone(self.cache.lookup(kind='slices', actor_name='am', filters={}, matchers=MATCHERS))
+        self.assertEqual(os.listdir(self.tmp.name), [])
+
+    def test_filters_index(self):
+        self.cache.store(kind='reservations', actor_name='am', filters={'states': [5, 4], 'site': None},
+                         result=RESULT)
+        index = [f for f in os.listdir(self.tmp.name) if f.endswith('.filters')]
+        self.assertEqual(len(index), 1)
+        with open(os.path.join(self.tmp.name, index[0])) as f:
+            self.assertEqual(json.load(f), {'states': [4, 5]})
+        # A snapshot which cannot be unpickled is a miss
+        with open(os.path.join(self.tmp.name, index[0].replace('.filters', '.snapshot')), 'wb') as f:
+            f.write(b'corrupt')
+        self.assertIsNone(self.cache.lookup(kind='reservations', actor_name='am', filters={'states': [4]},
+                                            matchers=MATCHERS))
+
+    def test_store_is_best_effort(self):
+        self.assertFalse(self.cache.store(kind='slices', actor_name='am', filters={}, result=[lambda: None]))
+        self.assertEqual(os.listdir(self.tmp.name), [])
+
+        registry = FakeActorRegistry(testbed=SyntheticTestbed(reservations=20), names=ACTORS)
+        command = BenchCommand(registry=registry)
+        command.cache = QueryCache(path=os.path.join(self.tmp.name, "gone"), ttl=60, logger=command.logger)
+        shutil.rmtree(command.cache.path)
+        slices, error = command.do_get_slices(actor_name="orchestrator", callback_topic="test")
+        self.assertEqual(len(slices), 2)
+
+    def test_create(self):
+        self.assertIsNone(QueryCache.create())
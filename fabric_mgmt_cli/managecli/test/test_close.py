@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import contextlib
+import io
+import unittest
+
+from fabric_mgmt_cli.managecli.benchmark.fake_actor import FakeActorRegistry, SyntheticTestbed
+from fabric_mgmt_cli.managecli.benchmark.suite import ACTORS, BenchCommand
+
+
+class CloseSliceTest(unittest.TestCase):
+    def test_close_by_project(self):
+        testbed = SyntheticTestbed(reservations=40, reservations_per_slice=2)
+        for i, s in enumerate(testbed.slices.values()):
+            s.project_id = "project-a" if i % 2 == 0 else "project-b"
+        command = BenchCommand(registry=FakeActorRegistry(testbed=testbed, names=ACTORS))
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            command.close_slice(actor_name="orchestrator", callback_topic="test", id_token=None,
+                                projectid="project-a")
+
+        closed = {s.project_id for s in testbed.slices.values() if testbed.is_removed(item_id=s.guid)}
+        open_slices = {s.project_id for s in testbed.slices.values() if not testbed.is_removed(item_id=s.guid)}
+        self.assertEqual(closed, {"project-a"})
+        self.assertEqual(open_slices, {"project-b"})
+        self.assertEqual(command.registry.get(name="orchestrator").calls["close_reservations"], 10)
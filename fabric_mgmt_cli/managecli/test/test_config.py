@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import os
+import shutil
+import stat
+import tempfile
+import unittest
+
+from fabric_mgmt_cli.managecli.config_processor import ConfigLoader, ConfigProcessor
+from fabric_mgmt_cli.managecli.configuration import RuntimeConfig
+
+CONFIG = os.path.join(os.path.dirname(__file__), 'config.yml')
+
+
+class ConfigLoaderTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'config.yml')
+        shutil.copy(CONFIG, self.path)
+        ConfigLoader.clear()
+
+    def tearDown(self):
+        ConfigLoader.clear()
+        self.tmp.cleanup()
+
+    def test_processors_share_parsed_config(self):
+        first = ConfigProcessor(path=self.path)
+        first.process()
+        second = ConfigProcessor(path=self.path)
+        second.process()
+        self.assertIs(first.config, second.config)
+        self.assertEqual(first.get_kafka_topic(), 'managecli-topic')
+        self.assertEqual(first.get_log_size(), 5000000)
+        self.assertEqual(first.get_auth().guid, 'managecli-guid')
+        self.assertEqual([(p.get_name(), p.get_type()) for p in first.get_peers()][-1], ('broker', 'broker'))
+
+    def test_modified_file_is_reparsed(self):
+        config = ConfigLoader.load(path=self.path)
+        with open(self.path, 'a') as f:
+            f.write("net:\n  - url: https://nso.example.net\n  - retries: 5\n")
+        reloaded = ConfigLoader.load(path=self.path)
+        self.assertIsNot(config, reloaded)
+        self.assertEqual(reloaded.get_net().get_url(), 'https://nso.example.net')
+        self.assertEqual(reloaded.get_net().get_retries(), 5)
+
+    def test_persisted_config(self):
+        ConfigLoader.load(path=self.path, persist=True)
+        persisted = self.path + ConfigLoader.PERSIST_SUFFIX
+        self.assertTrue(os.path.exists(persisted))
+        self.assertEqual(stat.S_IMODE(os.stat(persisted).st_mode), 0o600)
+
+        # A fresh process reads the persisted form instead of the YAML
+        ConfigLoader.clear()
+        with open(persisted) as f:
+            content = f.read()
+        with open(persisted, 'w') as f:
+            f.write(content.replace('managecli-topic', 'persisted-topic'))
+        config = ConfigLoader.load(path=self.path, persist=True)
+        self.assertEqual(config.get_runtime_config().get_kafka_topic(), 'persisted-topic')
+
+    def test_ephemeral_consumer_config(self):
+        processor = ConfigProcessor(path=self.path)
+        processor.process()
+        conf = processor.get_kafka_config_consumer()
+        self.assertEqual(processor.get_kafka_consumer_mode(), RuntimeConfig.CONSUMER_MODE_GROUP)
+        self.assertEqual(conf['group.id'], 'fabric_mgmt_cli-cf')
+
+        with open(self.path, 'a') as f:
+            f.write("runtime:\n  - kafka-group-id: fabric_mgmt_cli-cf\n  - kafka-consumer-mode: ephemeral\n")
+        processor.process()
+        self.assertEqual(processor.get_kafka_consumer_mode(), RuntimeConfig.CONSUMER_MODE_EPHEMERAL)
+        first = processor.get_kafka_config_consumer()
+        second = processor.get_kafka_config_consumer()
+        self.assertTrue(first['group.id'].startswith('fabric_mgmt_cli-cf-'))
+        self.assertNotEqual(first['group.id'], second['group.id'])
+        self.assertFalse(first['enable.auto.commit'])
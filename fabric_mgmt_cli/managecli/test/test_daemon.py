@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import io
+import logging
+import os
+import socket
+import stat
+import tempfile
+import threading
+import time
+import unittest
+from contextlib import redirect_stdout
+from typing import List
+from unittest import mock
+
+from fabric_mgmt_cli.managecli.daemon import DaemonClient, DaemonException, ManagementDaemon
+
+
+class EchoDaemon(ManagementDaemon):
+    """
+    Daemon echoing the request instead of running the CLI against Kafka
+    """
+    @staticmethod
+    def invoke(*, argv: List[str], writer) -> int:
+        print(f"cwd={os.getcwd()}")
+        print(f"argv={' '.join(argv)}")
+        print(f"token={os.getenv('FABRIC_ID_TOKEN')}")
+        return 3
+
+
+class DaemonTest(unittest.TestCase):
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = os.path.realpath(self.tmp.name)
+        self.config = os.path.join(self.root, "config.yml")
+        open(self.config, 'w').close()
+        self.work = os.path.join(self.root, "work")
+        os.makedirs(self.work)
+
+        self.socket_path = os.path.join(self.root, "daemon", "daemon.sock")
+        self.daemon = EchoDaemon(socket_path=self.socket_path, logger=logging.getLogger("daemon-test"))
+        self.daemon.config_path = self.config
+        self.daemon.bind()
+        self.thread = threading.Thread(target=self.daemon.serve, daemon=True)
+        self.thread.start()
+        self.client = DaemonClient(socket_path=self.socket_path)
+
+    def tearDown(self):
+        if self.thread.is_alive():
+            self.client.shutdown()
+            self.thread.join(5)
+        self.daemon.unbind()
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def forward(self, *, argv: List[str], env: dict) -> tuple:
+        out = io.StringIO()
+        with mock.patch.dict(os.environ, env), redirect_stdout(out):
+            return self.client.forward(argv=argv), out.getvalue()
+
+    def test_ping(self):
+        self.assertTrue(self.client.is_running())
+        self.assertFalse(DaemonClient(socket_path=os.path.join(self.root, "missing.sock")).is_running())
+
+    def test_socket_is_private(self):
+        self.assertEqual(stat.S_IMODE(os.stat(self.socket_path).st_mode) & 0o077, 0)
+        self.assertEqual(stat.S_IMODE(os.stat(os.path.dirname(self.socket_path)).st_mode), 0o700)
+
+    def test_shared_directory_rejected(self):
+        shared = os.path.join(self.root, "shared")
+        os.makedirs(shared)
+        os.chmod(shared, 0o755)
+        daemon = ManagementDaemon(socket_path=os.path.join(shared, "daemon.sock"))
+        self.assertRaises(DaemonException, daemon.bind)
+
+    def test_socket_mismatch_rejected(self):
+        with mock.patch.dict(os.environ, {'FABRIC_MGMT_CLI_DAEMON_SOCKET': self.socket_path}):
+            self.daemon.check_socket_path()
+            other = ManagementDaemon(socket_path=os.path.join(self.root, "other", "daemon.sock"))
+            self.assertRaises(DaemonException, other.check_socket_path)
+            self.assertRaises(DaemonException, other.start)
+        self.assertFalse(os.path.exists(os.path.join(self.root, "other")))
+
+    def test_stalled_client_dropped(self):
+        self.daemon.CONNECTION_TIMEOUT = 0.2
+        stalled = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stalled.connect(self.socket_path)
+        try:
+            begin = time.time()
+            self.assertTrue(self.client.is_running())
+            self.assertLess(time.time() - begin, 2)
+        finally:
+            stalled.close()
+
+    def test_forward_uses_client_cwd(self):
+        os.chdir(self.work)
+        exit_code, out = self.forward(argv=['maintenance', 'audit', '--statefile', 'state.json'],
+                                      env={'FABRIC_MGMT_CLI_CONFIG_PATH': '../config.yml',
+                                           'FABRIC_ID_TOKEN': 'token1'})
+        self.assertEqual(exit_code, 3)
+        self.assertEqual(out.splitlines(), [f"cwd={self.work}", "argv=maintenance audit --statefile state.json",
+                                            "token=token1"])
+        self.assertIsNone(os.getenv('FABRIC_ID_TOKEN'))
+
+    def test_fallback(self):
+        env = {'FABRIC_MGMT_CLI_CONFIG_PATH': self.config}
+        self.assertIsNone(self.forward(argv=['net', 'query'], env=env)[0])
+        self.assertIsNone(self.forward(argv=['slices', '--help'], env=env)[0])
+        self.assertIsNone(self.forward(argv=['slices', 'query', '--watch'], env=env)[0])
+        self.assertIsNone(self.forward(argv=['slices', 'query'], env={**env, 'FABRIC_MGMT_CLI_NO_DAEMON': '1'})[0])
+        self.assertIsNone(self.forward(argv=['slices', 'query'],
+                                       env={'FABRIC_MGMT_CLI_CONFIG_PATH': os.path.join(self.work, "other.yml")})[0])
+        with mock.patch.dict(os.environ):
+            os.environ.pop('FABRIC_MGMT_CLI_CONFIG_PATH', None)
+            self.assertIsNone(self.client.forward(argv=['slices', 'query']))
+        self.assertEqual(self.forward(argv=['slices', 'query'], env=env)[0], 3)
+
+    def test_shutdown(self):
+        self.assertTrue(self.client.shutdown())
+        self.thread.join(5)
+        self.assertFalse(self.thread.is_alive())
+        self.daemon.unbind()
+        self.assertFalse(os.path.exists(self.socket_path))
+        self.assertFalse(self.client.is_running())
+        self.assertIsNone(self.forward(argv=['slices', 'query'], env={'FABRIC_MGMT_CLI_CONFIG_PATH': self.config})[0])
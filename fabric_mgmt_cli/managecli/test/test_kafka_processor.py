@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import logging
+import threading
+import time
+import unittest
+
+from fabric_mgmt_cli.managecli.kafka_processor import MgmtMessageProcessor
+
+
+class FakeMessage:
+    def __init__(self, *, msg_id: str):
+        self.msg_id = msg_id
+
+    def get_message_id(self) -> str:
+        return self.msg_id
+
+
+def make_processor() -> MgmtMessageProcessor:
+    # Skip the Avro consumer set up, only the message bookkeeping is exercised
+    processor = MgmtMessageProcessor.__new__(MgmtMessageProcessor)
+    processor.logger = logging.getLogger("test")
+    processor.thread_lock = threading.Lock()
+    processor.messages = {}
+    processor.ephemeral = False
+    processor.projection = threading.local()
+    processor.lean_lock = threading.Lock()
+    processor.lean_messages = set()
+    processor.records = {}
+    processor.tagged = {}
+    processor.cancelled = set()
+    return processor
+
+
+class MgmtMessageProcessorTest(unittest.TestCase):
+    def test_cancel_requests(self):
+        processor = make_processor()
+        tag = object()
+        sent = threading.Event()
+        outcome = {}
+
+        def request():
+            with processor.track_requests(tag=tag):
+                wrapper = processor.add_message(message=FakeMessage(msg_id="m1"))
+                sent.set()
+                begin = time.time()
+                with wrapper.condition:
+                    wrapper.condition.wait(5)
+                outcome['done'] = wrapper.done
+                outcome['elapsed'] = time.time() - begin
+
+        thread = threading.Thread(target=request)
+        thread.start()
+        sent.wait(1)
+        processor.cancel_requests(tag=tag)
+        thread.join(2)
+
+        self.assertFalse(thread.is_alive())
+        self.assertFalse(outcome['done'])
+        self.assertLess(outcome['elapsed'], 1)
+        self.assertEqual(processor.messages, {})
+        self.assertEqual(processor.tagged, {})
+
+        # The late response is dropped without being reported as unknown
+        with self.assertNoLogs("test", level=logging.ERROR):
+            processor.handle_message(FakeMessage(msg_id="m1"))
+        self.assertEqual(processor.cancelled, set())
+
+    def test_untagged_requests_not_cancelled(self):
+        processor = make_processor()
+        tag = object()
+        with processor.track_requests(tag=tag):
+            pass
+        wrapper = processor.add_message(message=FakeMessage(msg_id="m1"))
+        processor.cancel_requests(tag=tag)
+
+        processor.handle_message(FakeMessage(msg_id="m1"))
+        self.assertTrue(wrapper.done)
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import unittest
+
+from fabric_mgmt_cli.managecli.net.index import ServiceIndex, extract_guid, services_for_types
+
+GUID = "0a1b2c3d-0000-1111-2222-333344445555"
+
+
+class ServiceIndexTest(unittest.TestCase):
+    def test_extract_guid(self):
+        self.assertEqual(extract_guid(f"vm-{GUID}"), GUID)
+        self.assertEqual(extract_guid("other"), "other")
+
+    def test_services_for_types(self):
+        self.assertEqual(services_for_types("L2PTP, FABNetv4,FABNetv6, VM"), ["l2ptp", "l3rt"])
+        self.assertIsNone(services_for_types("VM"))
+        self.assertIsNone(services_for_types(None))
+
+    def test_load(self):
+        tree = {"tailf-ncs:services": {"l2ptp:l2ptp": [{"name": f"ptp-{GUID}"}],
+                                       "idipa:idipa": [{"name": f"ptp-{GUID}"}],
+                                       "l3rt:l3rt": [{"name": "manual"}]}}
+        index = ServiceIndex().load(tree)
+        self.assertEqual(len(index), 2)
+        self.assertEqual(index.get(GUID).service_type, "l2ptp")
+        self.assertIn("manual", index.by_type["l3rt"])
+
+        index = ServiceIndex().load({"l2sts:l2sts": [{"name": f"sts-{GUID}"}]})
+        self.assertEqual(index.get(GUID).name, f"sts-{GUID}")
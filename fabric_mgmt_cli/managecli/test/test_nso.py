@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from urllib3.exceptions import ConnectTimeoutError, ReadTimeoutError
+
+from fabric_mgmt_cli.managecli.net.nso import NSOClient
+
+
+class UnavailableHandler(BaseHTTPRequestHandler):
+    def __reply(self):
+        self.server.requests.append(self.command)
+        self.send_response(503)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    do_GET = __reply
+    do_POST = __reply
+    do_PATCH = __reply
+
+    def log_message(self, *args):
+        pass
+
+
+class NSOClientTest(unittest.TestCase):
+    def test_session(self):
+        with NSOClient("https://nso/restconf", "user", "pwd", pool_size=4, retries=2) as client:
+            session = client.session
+            self.assertIs(client.session, session)
+            self.assertEqual(session.auth, ("user", "pwd"))
+            self.assertFalse(session.verify)
+            self.assertEqual(session.headers["Accept"], "application/yang-data+json")
+            adapter = session.get_adapter("https://nso/restconf")
+            self.assertEqual(adapter._pool_maxsize, 4)
+            self.assertEqual(adapter.max_retries.total, 2)
+        self.assertIsNone(client._session)
+
+    def test_retry_configuration(self):
+        retry = NSOClient("https://nso", "user", "pwd", backoff=0).session.get_adapter("https://nso").max_retries
+        self.assertTrue(retry.is_retry("GET", 503))
+        self.assertTrue(retry.is_retry("HEAD", 502))
+        for method in ["POST", "PATCH", "DELETE"]:
+            self.assertFalse(retry.is_retry(method, 503), method)
+            # Connect failures are retried, the request was never sent
+            self.assertIsNotNone(retry.increment(method=method, url="/", error=ConnectTimeoutError()))
+            self.assertRaises(ReadTimeoutError, retry.increment, method=method, url="/",
+                              error=ReadTimeoutError(None, "/", "timeout"))
+        self.assertIsNotNone(retry.increment(method="GET", url="/", error=ReadTimeoutError(None, "/", "timeout")))
+
+    def test_only_idempotent_requests_retried_on_status(self):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), UnavailableHandler)
+        server.requests = []
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            client = NSOClient(f"http://127.0.0.1:{server.server_port}", "user", "pwd", retries=2, backoff=0)
+            self.assertEqual(client._get("devices")[1], 503)
+            self.assertEqual(client._post("services", data="{}")[1], 503)
+            self.assertEqual(client._patch("services", data="{}")[1], 503)
+            self.assertEqual(server.requests, ["GET"] * 3 + ["POST", "PATCH"])
+            client.close()
+        finally:
+            server.shutdown()
+            server.server_close()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import contextlib
+import io
+import json
+import unittest
+
+from fabric_mgmt_cli.managecli.benchmark.fake_actor import FakeActorRegistry, SyntheticTestbed
+from fabric_mgmt_cli.managecli.benchmark.suite import ACTORS, BenchCommand
+
+
+class PagingTest(unittest.TestCase):
+    def setUp(self):
+        self.registry = FakeActorRegistry(testbed=SyntheticTestbed(reservations=23), names=ACTORS)
+        self.command = BenchCommand(registry=self.registry)
+
+    def reservations(self, *, offset: int = None, limit: int = None) -> list:
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            self.command.get_reservations(actor_name="renc-am", callback_topic="test", slice_id=None, rid=None,
+                                          states=None, id_token=None, email=None, site=None, type=None,
+                                          format='json', fields="sliver_id", include_ansible=False, host=None,
+                                          ip_subnet=None, offset=offset, limit=limit)
+        return [r['sliver_id'] for r in json.loads(out.getvalue())]
+
+    def test_window(self):
+        everything = self.reservations()
+        self.assertEqual(len(everything), 23)
+        self.assertEqual(self.reservations(offset=5, limit=3), everything[5:8])
+        self.assertEqual(self.reservations(offset=20), everything[20:])
+        self.assertEqual(self.reservations(limit=23), everything)
+        self.assertEqual(self.reservations(limit=50), everything)
+        # Every window is a single request for the complete result set
+        self.assertEqual(self.registry.get(name="renc-am").calls["get_reservations"], 5)
+
+    def test_empty_window(self):
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            self.command.get_slices(actor_name="orchestrator", callback_topic="test", slice_id=None,
+                                    slice_name=None, id_token=None, email=None, states=None, format='json',
+                                    offset=100, limit=10)
+        self.assertTrue(out.getvalue().startswith("Status:"))
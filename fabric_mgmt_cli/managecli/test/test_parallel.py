@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import threading
+import time
+import unittest
+
+from fabric_mgmt_cli.managecli.parallel import run_concurrently, split_names
+
+
+class ParallelTest(unittest.TestCase):
+    def test_split_names(self):
+        self.assertEqual(split_names(" oc, broker,,am1 ,broker"), ["oc", "broker", "am1"])
+        self.assertEqual(split_names(None), [])
+
+    def test_results_keep_input_order(self):
+        def task(x):
+            time.sleep(0.01 * (5 - x))
+            return x * x
+
+        results = run_concurrently(items=range(5), task=task, concurrency=5)
+        self.assertEqual([r.key for r in results], [0, 1, 2, 3, 4])
+        self.assertEqual([r.result for r in results], [0, 1, 4, 9, 16])
+
+    def test_errors_are_collected(self):
+        def task(x):
+            if x == 2:
+                raise Exception("failed")
+            return x
+
+        results = run_concurrently(items=[1, 2, 3], task=task, concurrency=2)
+        self.assertEqual([r.succeeded() for r in results], [True, False, True])
+        self.assertEqual(str(results[1].error), "failed")
+
+    def test_concurrency_is_bounded(self):
+        lock = threading.Lock()
+        state = {'running': 0, 'peak': 0}
+
+        def task(x):
+            with lock:
+                state['running'] += 1
+                state['peak'] = max(state['peak'], state['running'])
+            time.sleep(0.02)
+            with lock:
+                state['running'] -= 1
+
+        progress = []
+        run_concurrently(items=range(10), task=task, concurrency=3,
+                         on_complete=lambda r, done, total: progress.append((done, total)))
+        self.assertLessEqual(state['peak'], 3)
+        self.assertEqual(progress[-1], (10, 10))
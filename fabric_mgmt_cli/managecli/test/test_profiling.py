@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from fabric_mgmt_cli.managecli.profiling import Profiler, InstrumentedProxy
+
+
+class Actor:
+    def get_slices(self, *, slice_id: str = None):
+        return [slice_id]
+
+    def get_last_error(self):
+        return None
+
+
+class ProfilerTest(unittest.TestCase):
+    def test_disabled_records_nothing(self):
+        profiler = Profiler()
+        with profiler.span("kafka.start"):
+            pass
+        self.assertEqual(profiler.summary(), [])
+
+    def test_spans_aggregated_by_name(self):
+        profiler = Profiler()
+        profiler.enable()
+        for _ in range(3):
+            with profiler.span("actor.get_reservations", actor="am"):
+                pass
+        with self.assertRaises(ValueError):
+            with profiler.span("output.json"):
+                raise ValueError()
+        summary = profiler.summary()
+        self.assertEqual([(e['name'], e['count']) for e in summary], [("actor.get_reservations", 3),
+                                                                      ("output.json", 1)])
+        self.assertEqual(profiler.to_dict()['spans'][-1]['attrs'], {'error': 'ValueError'})
+
+        out = io.StringIO()
+        profiler.report(out=out)
+        self.assertIn("actor.get_reservations", out.getvalue())
+
+    def test_instrumented_proxy_and_export(self):
+        profiler = Profiler()
+        profiler.enable()
+        actor = InstrumentedProxy(target=Actor(), prefix="actor", profiler=profiler, actor="am")
+        self.assertEqual(actor.get_slices(slice_id="s1"), ["s1"])
+        self.assertIsNone(actor.get_last_error())
+        self.assertEqual([e['name'] for e in profiler.summary()], ["actor.get_slices"])
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "profile.json")
+            profiler.export(path=path, command="slices query")
+            profiler.export(path=path, command="slices query")
+            with open(path) as f:
+                runs = [json.loads(line) for line in f]
+        self.assertEqual(len(runs), 2)
+        self.assertEqual(runs[0]['spans'][0]['attrs'], {'actor': 'am'})
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import os
+import tempfile
+import time
+import unittest
+
+from fabric_mgmt_cli.managecli.reconcile import reconcile, AuditHistory
+
+ALLOWED = [{'Active'}, {'Ticketed'}, {'Active'}]
+
+
+def is_consistent(states):
+    return all(st in ALLOWED[i] for i, st in enumerate(states))
+
+
+class ReconcileTest(unittest.TestCase):
+    def test_slivers_on_smaller_sources_are_reported(self):
+        sources = {'oc': {'a': 'Active', 'b': 'Active', 'c': 'Active'},
+                   'broker': {'a': 'Ticketed', 'b': 'Ticketed', 'd': 'Ticketed'},
+                   'am': {'a': 'Active', 'e': 'Active'}}
+        result = reconcile(sources=sources, state_of=lambda source, x: x, is_consistent=is_consistent)
+        self.assertEqual(result.total, 5)
+        self.assertEqual(result.in_all, 1)
+        self.assertEqual(result.only_in, {'oc': 1, 'broker': 1, 'am': 1})
+        self.assertEqual(sorted(a.sliver_id for a in result.inconsistent), ['b', 'c', 'd', 'e'])
+        self.assertEqual(result.counts[('Active', 'Ticketed', 'Active')], 1)
+        self.assertEqual(result.counts[('Active', 'Ticketed', None)], 1)
+
+    def test_to_dict(self):
+        sources = {'oc': {'a': 'Active'}, 'am': {'a': 'Failed'}}
+        result = reconcile(sources=sources, state_of=lambda source, x: x,
+                           is_consistent=lambda states: states == ('Active', 'Active'))
+        d = result.to_dict(describe=lambda a: {'name': a.first()})
+        self.assertEqual(d['inconsistent'], [{'sliver_id': 'a', 'states': {'oc': 'Active', 'am': 'Failed'},
+                                              'name': 'Active'}])
+        self.assertEqual(d['states'], [{'states': {'oc': 'Active', 'am': 'Failed'}, 'count': 1}])
+
+    def test_scales_linearly(self):
+        n = 100000
+        sources = {'oc': {str(i): 'Active' for i in range(n)},
+                   'broker': {str(i): 'Ticketed' for i in range(n)},
+                   'am': {str(i): 'Active' for i in range(0, n, 2)}}
+        begin = time.time()
+        result = reconcile(sources=sources, state_of=lambda source, x: x, is_consistent=is_consistent)
+        self.assertEqual(len(result.inconsistent), n // 2)
+        self.assertLess(time.time() - begin, 10)
+
+    def test_history(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "history.json")
+            history = AuditHistory(path=path)
+            appeared, resolved = history.update(key='am', inconsistent=[{'sliver_id': 'a', 'states': {'am': 'Failed'}},
+                                                                        {'sliver_id': 'b', 'states': {'am': None}}])
+            self.assertEqual([x['sliver_id'] for x in appeared], ['a', 'b'])
+            self.assertEqual(resolved, [])
+            history.save()
+
+            history = AuditHistory(path=path)
+            appeared, resolved = history.update(key='am', inconsistent=[{'sliver_id': 'a', 'states': {'am': 'Failed'}},
+                                                                        {'sliver_id': 'c', 'states': {'am': None}}])
+            self.assertEqual([x['sliver_id'] for x in appeared], ['c'])
+            self.assertEqual([x['sliver_id'] for x in resolved], ['b'])
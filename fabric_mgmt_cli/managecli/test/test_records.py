@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import pickle
+import unittest
+
+from fabric_mb.message_bus.messages.result_reservation_avro import ResultReservationAvro
+
+from fabric_mgmt_cli.managecli.records import ReservationRecord, strip_reservations
+
+
+def response(*, reservations: list) -> dict:
+    return {'name': 'ResultReservation', 'message_id': 'msg1', 'status': {'code': 0},
+            'reservations': reservations}
+
+
+class ReservationRecordTest(unittest.TestCase):
+    RESERVATION = {'name': 'LeaseReservationAvro', 'reservation_id': 'r1', 'slice_id': 's1', 'rtype': 'VM',
+                   'notices': '', 'state': 4, 'pending_state': 11, 'start': 1000, 'end': 2000, 'units': 1,
+                   'authority': 'site1-am', 'sliver': b'not a pickle'}
+
+    def test_strip_reservations(self):
+        value, records = strip_reservations(value=response(reservations=[self.RESERVATION]))
+        self.assertEqual(len(records), 1)
+        record = records[0]
+        self.assertEqual((record.get_reservation_id(), record.get_slice_id(), record.get_state()), ('r1', 's1', 4))
+        self.assertEqual((record.rtype, record.units, record.end), ('VM', 1, 2000))
+        self.assertIsNone(record.get_sliver())
+        self.assertFalse(hasattr(record, '__dict__'))
+
+        # The remainder of the response decodes without touching the sliver
+        message = ResultReservationAvro()
+        message.from_dict(value)
+        self.assertEqual(message.status.get_code(), 0)
+        self.assertIsNone(message.reservations)
+
+        self.assertEqual(strip_reservations(value=response(reservations=[]))[1], None)
+
+    def test_record_pickles(self):
+        record = ReservationRecord.from_dict(self.RESERVATION)
+        copy = pickle.loads(pickle.dumps(record))
+        self.assertEqual([getattr(copy, n) for n in ReservationRecord.__slots__],
+                         [getattr(record, n) for n in ReservationRecord.__slots__])
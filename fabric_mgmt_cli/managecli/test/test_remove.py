@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import contextlib
+import io
+import time
+import unittest
+
+from fabric_cf.actor.core.kernel.reservation_states import ReservationStates
+
+from fabric_mgmt_cli.managecli.benchmark.fake_actor import FakeActorRegistry, SyntheticTestbed
+from fabric_mgmt_cli.managecli.benchmark.suite import ACTORS, BenchCommand
+
+
+class RemoveReservationsTest(unittest.TestCase):
+    def test_remove_by_states(self):
+        testbed = SyntheticTestbed(reservations=60, reservations_per_slice=2)
+        command = BenchCommand(registry=FakeActorRegistry(testbed=testbed, names=ACTORS, latency=0.05))
+        wanted = {ReservationStates.Closed.value, ReservationStates.Failed.value}
+        expected = {rid for rid, r in testbed.reservations.items() if r.state in wanted}
+        self.assertGreater(len(expected), 1)
+
+        begin = time.time()
+        with contextlib.redirect_stdout(io.StringIO()):
+            removed, failed = command._remove_reservations_by_states("orchestrator", "test", None,
+                                                                    "closed,failed", concurrency=len(expected))
+        elapsed = time.time() - begin
+
+        self.assertEqual(set(removed), expected)
+        self.assertEqual(failed, [])
+        self.assertEqual(testbed.removed, expected)
+        # Removals are outstanding concurrently instead of paying the latency once per reservation
+        self.assertLess(elapsed, 0.05 * len(expected))
+
+    def test_remove_timeout(self):
+        testbed = SyntheticTestbed(reservations=20, reservations_per_slice=2)
+        command = BenchCommand(registry=FakeActorRegistry(testbed=testbed, names=ACTORS, latency=0.2))
+
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            removed, failed = command._remove_reservations_by_states("orchestrator", "test", None,
+                                                                    "closed,failed", timeout=0.01)
+
+        self.assertEqual(removed, [])
+        self.assertGreater(len(failed), 0)
+        self.assertIn("Timed out removing reservation", output.getvalue())
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import contextlib
+import io
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from fabric_cf.actor.core.common.constants import Constants
+from fabric_cf.actor.core.kernel.reservation_states import ReservationStates
+from fabric_cf.actor.core.kernel.slice_state_machine import SliceState
+
+from fabric_mgmt_cli.managecli.benchmark.fake_actor import FakeActorRegistry, SyntheticTestbed
+from fabric_mgmt_cli.managecli.benchmark.suite import ACTORS, BenchCommand
+
+
+class RenewTest(unittest.TestCase):
+    ACTIVE = [SliceState.StableOK.value]
+    RENEWABLE = [ReservationStates.Active.value, ReservationStates.Ticketed.value]
+
+    def setUp(self):
+        self.testbed = SyntheticTestbed(reservations=400, reservations_per_slice=4)
+        self.registry = FakeActorRegistry(testbed=self.testbed, names=ACTORS)
+        self.command = BenchCommand(registry=self.registry)
+        self.end_time = (datetime.now(timezone.utc) + timedelta(days=7)).strftime(Constants.LEASE_TIME_FORMAT)
+
+    def renew(self, **kwargs) -> dict:
+        with contextlib.redirect_stdout(io.StringIO()):
+            return self.command.do_renew_slices_bulk(actor_name="orchestrator", callback_topic="test",
+                                                     end_time=self.end_time, **kwargs)
+
+    def expected(self, *, projectid: str = None) -> set:
+        with_renewable = {r.slice_id for r in self.testbed.reservations.values() if r.state in self.RENEWABLE}
+        return {s.guid for s in self.testbed.slices.values()
+                if s.state in self.ACTIVE and s.guid in with_renewable and
+                (projectid is None or s.project_id == projectid)}
+
+    def test_renews_active_slices_by_default(self):
+        result = self.renew()
+        self.assertEqual(set(result.keys()), self.expected())
+        self.assertTrue(all(len(errors) == 0 for errors in result.values()))
+        self.assertEqual(self.registry.get(name="orchestrator").calls["update_slice"], len(result))
+
+    def test_filters_project_on_client(self):
+        result = self.renew(projectid="project-3")
+        self.assertGreater(len(result), 0)
+        self.assertEqual(set(result.keys()), self.expected(projectid="project-3"))
+
+    def test_skips_slices_without_renewable_reservations(self):
+        for r in self.testbed.reservations.values():
+            r.state = ReservationStates.Closed.value
+        self.assertEqual(self.renew(states="StableOK,Closing,Dead"), {})
+        self.assertNotIn("update_slice", self.registry.get(name="orchestrator").calls)
+
+    def test_end_time_capped(self):
+        self.end_time = (datetime.now(timezone.utc) + timedelta(days=365)).strftime(Constants.LEASE_TIME_FORMAT)
+        result = self.renew()
+        self.assertGreater(len(result), 0)
+        lease_end = self.testbed.slices[next(iter(result))].get_lease_end()
+        self.assertLessEqual(lease_end, datetime.now(timezone.utc) + BenchCommand.MAX_LEASE_DURATION)
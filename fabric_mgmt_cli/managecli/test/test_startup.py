@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import unittest
+
+from fabric_mgmt_cli.managecli.benchmark.startup import measure, parse_importtime
+
+
+class StartupTest(unittest.TestCase):
+    def test_parse_importtime(self):
+        stderr = "import time: self [us] | cumulative | imported package\n" \
+                 "import time:       100 |        100 |   yaml.error\n" \
+                 "import time:       500 |       1500 | yaml\n" \
+                 "import time:       250 |        250 | json\n"
+        self.assertEqual(parse_importtime(stderr), 1.75)
+
+    def test_help_does_not_load_kafka(self):
+        for args in [["--help"], ["net", "--help"], ["maintenance", "--help"]]:
+            result = measure(args=args)
+            self.assertFalse(result['kafka_loaded'], f"{args} imports Kafka modules")
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import base64
+import json
+import os
+import stat
+import tempfile
+import threading
+import time
+import unittest
+
+from fabric_mgmt_cli.managecli.token_cache import TokenCache
+
+
+def make_token(*, exp: float) -> str:
+    def encode(d: dict) -> str:
+        return base64.urlsafe_b64encode(json.dumps(d).encode('utf-8')).decode('utf-8').rstrip('=')
+    return f"{encode({'alg': 'none'})}.{encode({'exp': int(exp)})}.sig"
+
+
+class TokenCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = TokenCache(path=self.tmp.name, margin=60)
+        self.calls = []
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def refresh(self, token: str, exp: float = None) -> dict:
+        self.calls.append(token)
+        exp = exp if exp is not None else time.time() + 3600
+        return {'id_token': make_token(exp=exp), 'refresh_token': f"rotated-{len(self.calls)}"}
+
+    def test_token_reused_until_expiry(self):
+        first = self.cache.get(credmgr_host="cm", refresh_token="rt", refresh=self.refresh)
+        second = self.cache.get(credmgr_host="cm", refresh_token="rt", refresh=self.refresh)
+        self.assertEqual(first, second)
+        self.assertEqual(self.calls, ["rt"])
+        self.assertEqual(TokenCache.decode_expiry(token=first) // 10, int(time.time() + 3600) // 10)
+
+        files = [f for f in os.listdir(self.tmp.name) if f.endswith('.json')]
+        self.assertEqual(len(files), 1)
+        self.assertEqual(stat.S_IMODE(os.stat(os.path.join(self.tmp.name, files[0])).st_mode), 0o600)
+
+        # Different host or refresh token are cached separately
+        self.cache.get(credmgr_host="other", refresh_token="rt", refresh=self.refresh)
+        self.assertEqual(len(self.calls), 2)
+
+    def test_expiring_token_refreshed_with_rotated_token(self):
+        self.cache.get(credmgr_host="cm", refresh_token="rt",
+                       refresh=lambda t: self.refresh(t, exp=time.time() + 30))
+        self.cache.get(credmgr_host="cm", refresh_token="rt", refresh=self.refresh)
+        self.assertEqual(self.calls, ["rt", "rotated-1"])
+
+    def test_concurrent_callers_refresh_once(self):
+        def slow_refresh(token: str) -> dict:
+            time.sleep(0.1)
+            return self.refresh(token)
+
+        caches = [TokenCache(path=self.tmp.name) for _ in range(4)]
+        threads = [threading.Thread(target=c.get, kwargs={'credmgr_host': "cm", 'refresh_token': "rt",
+                                                          'refresh': slow_refresh}) for c in caches]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(self.calls, ["rt"])
+
+    def test_token_returned_when_store_fails(self):
+        path = os.path.join(self.tmp.name, "tokens")
+        cache = TokenCache(path=path)
+
+        def refresh(token: str) -> dict:
+            # The cache directory disappears while the token is refreshed, so it cannot be saved
+            os.rename(path, f"{path}.moved")
+            return self.refresh(token)
+
+        token = cache.get(credmgr_host="cm", refresh_token="rt", refresh=refresh)
+        self.assertIsNotNone(TokenCache.decode_expiry(token=token))
+        self.assertEqual(self.calls, ["rt"])
+        self.assertEqual([f for f in os.listdir(f"{path}.moved") if f.endswith('.json')], [])
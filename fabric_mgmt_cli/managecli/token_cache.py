@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import base64
+import hashlib
+import json
+import os
+import tempfile
+import time
+import traceback
+from typing import Callable
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+DEFAULT_REFRESH_MARGIN = 60
+
+
+class TokenCache:
+    """
+    On-disk cache of identity tokens obtained from the credential manager.
+
+    Entries are keyed by the credential manager host and a fingerprint of the refresh token passed by the user and
+    hold the id token along with the latest refresh token returned by the credential manager, so that rotated
+    refresh tokens keep working across invocations. The expiry is decoded from the id token itself; the credential
+    manager is only contacted once the token is within the refresh margin of expiring. Refreshes are serialized
+    across processes with a lock file. Saving tokens is best-effort; a token which cannot be saved is still returned.
+    """
+    DISABLE_ENV = 'FABRIC_MGMT_CLI_TOKEN_CACHE'
+
+    def __init__(self, *, path: str = None, margin: int = DEFAULT_REFRESH_MARGIN, logger=None):
+        """
+        @param path cache directory, defaults to ~/.fabric_mgmt_cli/tokens
+        @param margin time in seconds before expiry at which a token is refreshed
+        @param logger logger
+        """
+        if path is None:
+            path = os.path.join(os.path.expanduser("~"), ".fabric_mgmt_cli", "tokens")
+        self.path = path
+        self.margin = margin
+        self.logger = logger
+        os.makedirs(self.path, mode=0o700, exist_ok=True)
+
+    @staticmethod
+    def create(*, logger=None):
+        """
+        Create the cache unless disabled via the FABRIC_MGMT_CLI_TOKEN_CACHE environment variable
+        @param logger logger
+        @return cache or None if caching is disabled or the cache directory cannot be created
+        """
+        if os.getenv(TokenCache.DISABLE_ENV, '').lower() in ['0', 'false', 'no']:
+            return None
+        try:
+            return TokenCache(logger=logger)
+        except OSError:
+            return None
+
+    @staticmethod
+    def decode_expiry(*, token: str) -> int or None:
+        """
+        Decode the expiry of a JWT without verifying it
+        @param token JWT
+        @return expiry in seconds since the epoch or None if the token cannot be decoded
+        """
+        try:
+            payload = token.split('.')[1]
+            payload += '=' * (-len(payload) % 4)
+            return int(json.loads(base64.urlsafe_b64decode(payload))['exp'])
+        except Exception:
+            return None
+
+    def __key(self, *, credmgr_host: str, refresh_token: str) -> str:
+        fingerprint = hashlib.sha256(refresh_token.encode('utf-8')).hexdigest()
+        return hashlib.sha256(f"{credmgr_host}:{fingerprint}".encode('utf-8')).hexdigest()[:32]
+
+    def __load(self, *, file_name: str) -> dict or None:
+        try:
+            with open(file_name) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def __store(self, *, file_name: str, entry: dict):
+        fd, tmp = tempfile.mkstemp(dir=self.path, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(entry, f)
+            os.replace(tmp, file_name)
+        except Exception:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+
+    def __fresh(self, *, entry: dict or None) -> bool:
+        if entry is None or entry.get('id_token') is None:
+            return False
+        expiry = self.decode_expiry(token=entry['id_token'])
+        return expiry is not None and expiry - self.margin > time.time()
+
+    def get(self, *, credmgr_host: str, refresh_token: str, refresh: Callable[[str], dict]) -> str:
+        """
+        Get an identity token, refreshing it only if there is no cached token or it is about to expire
+        @param credmgr_host credential manager host
+        @param refresh_token refresh token
+        @param refresh function invoked with a refresh token, returning the tokens from the credential manager
+        @return identity token
+        """
+        key = self.__key(credmgr_host=credmgr_host, refresh_token=refresh_token)
+        file_name = os.path.join(self.path, f"{key}.json")
+        entry = self.__load(file_name=file_name)
+        if self.__fresh(entry=entry):
+            return entry['id_token']
+
+        with open(os.path.join(self.path, f"{key}.lock"), 'a') as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                # Another process may have refreshed the token while waiting for the lock
+                entry = self.__load(file_name=file_name)
+                if self.__fresh(entry=entry):
+                    return entry['id_token']
+
+                tokens = None
+                latest = entry.get('refresh_token') if entry is not None else None
+                if latest is not None and latest != refresh_token:
+                    try:
+                        tokens = refresh(latest)
+                    except Exception:
+                        tokens = None
+                if tokens is None:
+                    tokens = refresh(refresh_token)
+
+                id_token = tokens.get('id_token', None)
+                if id_token is not None:
+                    try:
+                        self.__store(file_name=file_name, entry={'id_token': id_token,
+                                                                 'refresh_token': tokens.get('refresh_token',
+                                                                                             refresh_token)})
+                    except Exception as e:
+                        if self.logger is not None:
+                            self.logger.error(f"Failed to save the identity token to the cache: {e}")
+                            self.logger.error(traceback.format_exc())
+                return id_token
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_UN)